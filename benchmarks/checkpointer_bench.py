@@ -0,0 +1,146 @@
+"""
+Checkpointer Setup Benchmark
+Mission တိုင်း Saver ဖွင့် + Graph Compile (Old) vs Long-lived Saver + Cached Graph (New)
+
+Mission တစ်ခုရဲ့ Setup Overhead = Saver/Graph ရယူချိန် + ပထမဆုံး Checkpoint Read (aget_state)
+Cold = DB File ကို OS Page Cache ထဲကနေ ဖယ်ပြီးမှ တိုင်း (posix_fadvise DONTNEED, Linux only)
+
+Usage:
+    python -m benchmarks.checkpointer_bench                         # Temp DB ကို Seed လုပ်ပြီး တိုင်းမယ်
+    python -m benchmarks.checkpointer_bench --db workspace/checkpoints.sqlite --runs 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from src.core.workflow import workflow
+from src.memory.checkpointer import open_checkpointer, close_checkpointer
+
+
+def drop_page_cache(path: str) -> bool:
+    """DB + WAL File ရဲ့ OS Page Cache ကို ဖယ်မယ် (Cold Start အတုယူဖို့)"""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for suffix in ("", "-wal"):
+        if not os.path.exists(path + suffix):
+            continue
+        fd = os.open(path + suffix, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+async def seed(path: str, threads: int, checkpoints: int, payload_kb: int) -> list:
+    """Mission Thread တွေ အတုထည့်မယ် (Code Content အရွယ်အစား Payload နဲ့)"""
+    saver = await open_checkpointer(path)
+    thread_ids = []
+    try:
+        for _ in range(threads):
+            thread_id = f"mission-{uuid.uuid4().hex[:12]}"
+            config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+            for step in range(checkpoints):
+                checkpoint = empty_checkpoint()
+                checkpoint["channel_values"] = {"code_content": os.urandom(payload_kb * 512).hex(), "logs": [f"step {step}"]}
+                config = await saver.aput(config, checkpoint, {"source": "loop", "step": step}, {})
+            thread_ids.append(thread_id)
+    finally:
+        await close_checkpointer(saver)
+    return thread_ids
+
+
+async def bench_old(path: str, thread_ids: list, runs: int, cold: bool) -> list:
+    samples = []
+    for _ in range(runs):
+        if cold:
+            drop_page_cache(path)
+        config = {"configurable": {"thread_id": random.choice(thread_ids)}}
+        started = time.perf_counter()
+        async with AsyncSqliteSaver.from_conn_string(path) as checkpointer:
+            app = workflow.compile(checkpointer=checkpointer)
+            await app.aget_state(config)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+async def bench_new(path: str, thread_ids: list, runs: int, cold: bool) -> tuple:
+    started = time.perf_counter()
+    checkpointer = await open_checkpointer(path)
+    app = workflow.compile(checkpointer=checkpointer)
+    startup_ms = (time.perf_counter() - started) * 1000
+    samples = []
+    try:
+        for _ in range(runs):
+            if cold:
+                drop_page_cache(path)
+            config = {"configurable": {"thread_id": random.choice(thread_ids)}}
+            started = time.perf_counter()
+            await app.aget_state(config)
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        await close_checkpointer(checkpointer)
+    return samples, startup_ms
+
+
+def summarize(samples: list) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms   total {sum(ordered):9.1f} ms"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-mission checkpointer setup overhead")
+    parser.add_argument("--db", help="Existing checkpoints.sqlite (copied to a temp dir first)")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=50)
+    parser.add_argument("--checkpoints", type=int, default=20, help="Checkpoints per seeded thread")
+    parser.add_argument("--payload-kb", type=int, default=32, help="Seeded code_content size per checkpoint")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="ckpt_bench_")
+    path = os.path.join(workdir, "checkpoints.sqlite")
+    try:
+        if args.db:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(args.db + suffix):
+                    shutil.copy(args.db + suffix, path + suffix)
+            saver = await open_checkpointer(path)
+            async with saver.conn.execute("SELECT DISTINCT thread_id FROM checkpoints") as cur:
+                thread_ids = [row[0] for row in await cur.fetchall()]
+            await close_checkpointer(saver)
+        else:
+            thread_ids = await seed(path, args.threads, args.checkpoints, args.payload_kb)
+        if not thread_ids:
+            print("No threads in checkpoint DB.")
+            return
+
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"📦 DB: {size_mb:.1f}MB, {len(thread_ids)} threads, {args.runs} missions per scenario")
+        cold_supported = drop_page_cache(path)
+        if not cold_supported:
+            print("⚠️ posix_fadvise not available: cold runs measure warm cache.")
+
+        print("\n--- Per-mission setup overhead ---")
+        for cold in (False, True):
+            label = "cold" if cold else "warm"
+            old = await bench_old(path, thread_ids, args.runs, cold)
+            new, startup_ms = await bench_new(path, thread_ids, args.runs, cold)
+            print(f"Old (open + compile per mission), {label}: {summarize(old)}")
+            print(f"New (long-lived saver),          {label}: {summarize(new)}")
+            print(f"    one-time startup {startup_ms:.2f} ms, "
+                  f"speedup x{statistics.median(old) / max(statistics.median(new), 1e-6):.1f}\n")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""
+Intent Router Benchmark
+Local Fast-path Classifier vs Gemini Router (logged decisions)
+- Fast-path accuracy: Live မှာ Fast-path ဆုံးဖြတ်ပြီးသားကို LLM နဲ့ Shadow စစ်ထားတဲ့ Row တွေ (source=shadow) ကနေပဲ
+- Router Row တွေ / Seed Samples: လက်ရှိ Threshold ကို ပြန် Replay လုပ်ကြည့်တဲ့ ခန့်မှန်းချက်
+
+Usage:
+    python -m benchmarks.intent_bench                       # workspace/intent_log.jsonl
+    python -m benchmarks.intent_bench --log path/to/log.jsonl
+    python -m benchmarks.intent_bench --seed                # built-in labelled samples only
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from src.core.intent import intent_classifier
+from config.settings import settings
+
+# Log မရှိသေးရင် သုံးဖို့ Labelled Samples (Router Prompt ရဲ့ Rules အတိုင်း)
+SEED_SAMPLES = [
+    ("hi", "CHAT"),
+    ("hello jarvis", "CHAT"),
+    ("thanks!", "CHAT"),
+    ("who are you?", "CHAT"),
+    ("explain how docker networks work", "CHAT"),
+    ("how are you today", "CHAT"),
+    ("stop snake-game-v1", "DEPLOY"),
+    ("run hello_jarvis_v1", "DEPLOY"),
+    ("kill the bitcoin container", "DEPLOY"),
+    ("restart folder-purger", "DEPLOY"),
+    ("delete container todo-api", "DEPLOY"),
+    ("create a fastapi todo app with sqlite", "ARCHITECT"),
+    ("build a telegram bot that posts bitcoin price every hour", "ARCHITECT"),
+    ("write a python script that cleans old log files", "ARCHITECT"),
+    ("make a streamlit dashboard for my expenses", "ARCHITECT"),
+    ("snake game with pygame", "ARCHITECT"),
+    ("add login to the todo api", "ARCHITECT"),
+    ("create a script that deletes empty folders", "ARCHITECT"),
+]
+
+
+def load_samples(path: str):
+    samples = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            samples.append((entry["mission"], entry["llm_label"], entry.get("llm_ms"),
+                            entry.get("source", "router"), entry.get("local_label")))
+    return samples
+
+
+def run(samples):
+    threshold = settings.INTENT_FAST_PATH_THRESHOLD
+    llm_latencies = [ms for _, _, ms, _, _ in samples if ms]
+    default_llm_ms = statistics.median(llm_latencies) if llm_latencies else None
+
+    total = len(samples)
+    agree_all = 0
+    fast, fast_agree = 0, 0
+    shadow, shadow_agree = 0, 0
+    saved_ms = 0.0
+    local_us = []
+    disagreements = []
+
+    for mission, llm_label, llm_ms, source, logged_label in samples:
+        started = time.perf_counter()
+        label, confidence = intent_classifier.classify(mission)
+        local_us.append((time.perf_counter() - started) * 1e6)
+
+        if label == llm_label:
+            agree_all += 1
+        if source == "shadow":
+            # Live Fast-path ဆုံးဖြတ်ချက် (Log တုန်းက Local Label) ↔ LLM
+            shadow += 1
+            shadow_agree += int((logged_label or label) == llm_label)
+        if confidence >= threshold:
+            fast += 1
+            saved_ms += llm_ms or default_llm_ms or 0.0
+            if label == llm_label:
+                fast_agree += 1
+            else:
+                disagreements.append((mission, llm_label, label, confidence))
+
+    print("🚦 Intent Router Benchmark")
+    print(f"   Samples:                  {total}")
+    print(f"   Threshold:                {threshold}")
+    print(f"   Overall agreement:        {agree_all}/{total} ({100 * agree_all / max(total, 1):.1f}%)")
+    print(f"   Fast-path coverage:       {fast}/{total} ({100 * fast / max(total, 1):.1f}%)")
+    if shadow:
+        print(f"   Fast-path accuracy:       {shadow_agree}/{shadow} ({100 * shadow_agree / shadow:.1f}%) (shadow-sampled live decisions)")
+    else:
+        print("   Fast-path accuracy:       n/a (no shadow-sampled rows; set INTENT_SHADOW_RATE)")
+    print(f"   Threshold replay agree:   {fast_agree}/{fast} ({100 * fast_agree / max(fast, 1):.1f}%) (re-classified samples, not live accuracy)")
+    print(f"   Local latency (median):   {statistics.median(local_us):.1f} µs")
+    print(f"   Local latency (max):      {max(local_us):.1f} µs")
+    if default_llm_ms is not None:
+        print(f"   LLM latency (median):     {default_llm_ms:.0f} ms")
+        print(f"   LLM time saved:           {saved_ms / 1000:.1f} s total, {saved_ms / max(total, 1):.0f} ms/message")
+    else:
+        print("   LLM time saved:           n/a (no logged LLM latency)")
+
+    if disagreements:
+        print("\n⚠️ Fast-path disagreements (local would override the LLM):")
+        for mission, llm_label, label, confidence in disagreements:
+            print(f"   - '{mission[:60]}' LLM={llm_label} local={label} ({confidence:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local intent classifier vs LLM router")
+    parser.add_argument("--log", default=settings.INTENT_LOG_PATH, help="JSONL of logged router decisions")
+    parser.add_argument("--seed", action="store_true", help="Use the built-in labelled samples")
+    args = parser.parse_args()
+
+    if args.seed or not os.path.exists(args.log):
+        if not args.seed:
+            print(f"ℹ️ {args.log} not found. Using built-in samples.\n")
+        samples = [(mission, label, None, "seed", None) for mission, label in SEED_SAMPLES]
+    else:
+        samples = load_samples(args.log)
+
+    if not samples:
+        print("⚠️ No samples to benchmark.")
+        return
+    run(samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,730 @@
+"""
+Offline Mission Benchmark
+Real `workflow` Graph (Brain → Mission Executor → Checkpointer → Agents) ကို Quota မကုန်ဘဲ End-to-End Run မယ်
+- Fake LLM: Agent Tag (router / architect / coder / debugger / tester / deployer) အလိုက် Scripted Response
+            Latency + Jitter + Error Injection (Seed နဲ့ Deterministic)
+- Fake Docker: docker_mgr Surface (start_container / client.containers.get / logs / reload ...) ကို In-memory နဲ့ အတုလုပ်မယ်
+- Offline Venv: Tester ရဲ့ Shared Venv ကို လက်ရှိ Python နဲ့ ချိတ်ပြီး pip install ကို No-op လုပ်မယ် (Network မလို)
+
+Report: Mission Wall Time / Node အလိုက် အချိန် / Checkpoint Bytes Written / Peak RSS
+
+Usage:
+    python -m benchmarks.mission_bench                                  # Scenario အားလုံး တစ်ခါစီ
+    python -m benchmarks.mission_bench --scenario fastapi_multi --runs 5
+    python -m benchmarks.mission_bench --latency-ms 1500 --jitter-ms 500 --error-rate 0.2
+    python -m benchmarks.mission_bench --concurrent --json bench.json   # Scenario အားလုံး တပြိုင်နက်
+    python -m benchmarks.mission_bench --cassette workspace/cassettes/mission-xxx.jsonl --replay-latency 0
+                                                                        # Production Mission ကို Cassette နဲ့ Replay
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+
+# --- Canned Missions ---
+FIB_MAIN = '''def fib(n):
+    a, b = 0, 1
+    for _ in range(n):
+        yield a
+        a, b = b, a + b
+
+
+if __name__ == "__main__":
+    print(" ".join(str(x) for x in fib(20)))
+'''
+
+TODO_MODELS = '''from pydantic import BaseModel
+
+
+class Todo(BaseModel):
+    id: int
+    title: str
+    done: bool = False
+'''
+
+TODO_STORAGE = '''from models import Todo
+
+
+class TodoStore:
+    def __init__(self):
+        self.items = {}
+
+    def add(self, title: str) -> Todo:
+        todo = Todo(id=len(self.items) + 1, title=title)
+        self.items[todo.id] = todo
+        return todo
+
+    def all(self) -> list:
+        return list(self.items.values())
+
+
+store = TodoStore()
+'''
+
+TODO_MAIN = '''from fastapi import FastAPI
+from models import Todo
+from storage import store
+
+app = FastAPI(title="Todo API")
+
+
+@app.get("/todos")
+def list_todos() -> list[Todo]:
+    return store.all()
+
+
+@app.post("/todos")
+def create_todo(title: str) -> Todo:
+    return store.add(title)
+'''
+
+CSV_CONVERT_BROKEN = '''import csv
+import json
+
+
+def convert(path)
+    with open(path, newline="") as f:
+        return json.dumps(list(csv.DictReader(f)), indent=2)
+'''
+
+CSV_CONVERT = '''import csv
+import json
+
+
+def convert(path):
+    with open(path, newline="") as f:
+        return json.dumps(list(csv.DictReader(f)), indent=2)
+'''
+
+CSV_MAIN_BROKEN = '''import os
+import tempfile
+from convert import convert
+
+SAMPLE = "name,age\\nAung,30\\nSu,25\\n"
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "sample.csv")
+    with open(path, "w") as f:
+        f.write(SAMPLE)
+    print(convert(sample_path))
+'''
+
+CSV_MAIN_PATCH = '''<<<<<<< SEARCH
+    print(convert(sample_path))
+=======
+    print(convert(path))
+>>>>>>> REPLACE
+'''
+
+SCENARIOS = {
+    "single_file": {
+        "mission": "write a python script that prints the first 20 fibonacci numbers",
+        "subdomain": "fib-script-v1",
+        "plan": [{"file": "fib_script/main.py", "description": "Fibonacci printer", "depends_on": []}],
+        "drafts": {"fib_script/main.py": [FIB_MAIN]},
+        "patches": {},
+    },
+    "fastapi_multi": {
+        "mission": "create a fastapi todo api with models, storage and routes",
+        "subdomain": "todo-api-v1",
+        "plan": [
+            {"file": "todo_api/models.py", "description": "Pydantic models", "depends_on": []},
+            {"file": "todo_api/storage.py", "description": "In-memory store", "depends_on": ["todo_api/models.py"]},
+            {"file": "todo_api/requirements.txt", "description": "Dependencies", "depends_on": []},
+            {"file": "todo_api/main.py", "description": "FastAPI routes",
+             "depends_on": ["todo_api/models.py", "todo_api/storage.py"]},
+        ],
+        "drafts": {
+            "todo_api/models.py": [TODO_MODELS],
+            "todo_api/storage.py": [TODO_STORAGE],
+            "todo_api/requirements.txt": ["fastapi\nuvicorn\n"],
+            "todo_api/main.py": [TODO_MAIN],
+        },
+        "patches": {},
+    },
+    # Syntax Error (Debugger ပြင်) + Runtime Error (Tester → Tech Lead → Coder Patch ပြင်)
+    "failing_then_fixed": {
+        "mission": "build a python cli that converts a csv file to json",
+        "subdomain": "csv2json-v1",
+        "plan": [
+            {"file": "csv2json/convert.py", "description": "CSV to JSON converter", "depends_on": []},
+            {"file": "csv2json/main.py", "description": "CLI entry point", "depends_on": ["csv2json/convert.py"]},
+        ],
+        "drafts": {
+            "csv2json/convert.py": [CSV_CONVERT_BROKEN],
+            "csv2json/main.py": [CSV_MAIN_BROKEN],
+        },
+        "fixed": {"csv2json/convert.py": CSV_CONVERT},
+        "patches": {"csv2json/main.py": CSV_MAIN_PATCH},
+    },
+}
+
+
+def prompt_text(contents) -> str:
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, list):
+        return "\n".join(m.get("content", "") if isinstance(m, dict) else str(m) for m in contents)
+    return str(contents)
+
+
+class ScriptedResponder:
+    """Scenario တစ်ခုအတွက် Agent Tag → Response (File တစ်ခုချင်းစီ Draft အစဉ်လိုက်)"""
+
+    def __init__(self, scenario: dict):
+        self.scenario = scenario
+        self.drafts_used = Counter()
+
+    def respond(self, agent: str, prompt: str) -> str:
+        s = self.scenario
+        if agent == "router":
+            return "ARCHITECT"
+        if agent == "chat":
+            return "မင်္ဂလာပါ! ဘာကူညီပေးရမလဲ?"
+        if agent == "architect":
+            return json.dumps({"plan": s["plan"], "subdomain": s["subdomain"]})
+        if agent == "coder":
+            match = re.search(r"File: (\S+)", prompt)
+            filename = match.group(1) if match else ""
+            if "SEARCH/REPLACE" in prompt and filename in s["patches"]:
+                return s["patches"][filename]
+            drafts = s["drafts"].get(filename, ["pass\n"])
+            index = min(self.drafts_used[filename], len(drafts) - 1)
+            self.drafts_used[filename] += 1
+            return f"```python\n{drafts[index]}```\n"
+        if agent == "debugger":
+            # Broken Code ကို Prompt ထဲကနေ ပြန်ရှာပြီး ပြင်ပြီးသား Version ပြန်ပေးမယ်
+            for filename, drafts in s["drafts"].items():
+                if any(d.strip() in prompt for d in drafts):
+                    return f"```python\n{s.get('fixed', {}).get(filename, drafts[-1])}```\n"
+            return "```python\npass\n```"
+        if agent == "tester":
+            return "Use the variable that was actually defined (`path`) instead of `sample_path`."
+        if agent == "deployer":
+            return "python main.py"
+        return ""
+
+
+class FakeLLM:
+    """
+    llm_engine.generate / generate_stream / embed အစား (Network မခေါ်)
+    - Latency: gauss(latency_ms, jitter_ms), Stream ဆိုရင် First Chunk အထိ + Chunk တစ်ခုချင်း
+    - Error Injection: error_agents ထဲက Agent တွေကို error_rate နဲ့ 503 ပစ်မယ် (Retry Path တွေ စမ်းဖို့)
+    """
+
+    CHUNK_CHARS = 64
+
+    def __init__(self, tracer, payload_size, latency_ms: float, jitter_ms: float,
+                 error_rate: float, error_agents: set, seed: int):
+        self.tracer = tracer
+        self.payload_size = payload_size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_agents = error_agents
+        self.rng = random.Random(seed)
+        self.responders = {}     # mission_id -> ScriptedResponder
+        self.default_scenario = None    # bind() မလုပ်ထားတဲ့ Mission (Telegram Load Test လို) အတွက်
+        self.calls = Counter()
+        self.errors = Counter()
+
+    def bind(self, mission_id: str, scenario: dict):
+        self.responders[mission_id] = ScriptedResponder(scenario)
+
+    def _responder(self) -> ScriptedResponder:
+        from src.core.missions import current_mission_id
+        mission_id = current_mission_id.get()
+        if mission_id not in self.responders and self.default_scenario is not None:
+            self.bind(mission_id, self.default_scenario)
+        return self.responders[mission_id]
+
+    async def _latency(self, scale: float = 1.0):
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) * scale
+        await asyncio.sleep(delay / 1000)
+
+    def _maybe_fail(self, agent: str):
+        if (not self.error_agents or agent in self.error_agents) and self.rng.random() < self.error_rate:
+            self.errors[agent] += 1
+            raise Exception(f"503 UNAVAILABLE (injected by mission_bench for {agent})")
+
+    async def generate(self, contents, model: str = None, config=None, provider: str = "gemini",
+                       agent: str = "default", cache: bool = None, **kwargs) -> str:
+        self.calls[agent] += 1
+        with self.tracer.span(f"llm:{agent}", "llm", provider="fake", model=model,
+                              prompt_chars=self.payload_size(contents)) as span:
+            await self._latency()
+            self._maybe_fail(agent)
+            text = self._responder().respond(agent, prompt_text(contents))
+            span.set(response_chars=len(text))
+            return text
+
+    async def generate_stream(self, contents, model: str = None, config=None, agent: str = "default"):
+        self.calls[agent] += 1
+        with self.tracer.span(f"llm_stream:{agent}", "llm", provider="fake", model=model,
+                              prompt_chars=self.payload_size(contents)) as span:
+            await self._latency(0.5)     # First Token
+            self._maybe_fail(agent)
+            text = self._responder().respond(agent, prompt_text(contents))
+            chunks = [text[i:i + self.CHUNK_CHARS] for i in range(0, len(text), self.CHUNK_CHARS)]
+            for chunk in chunks:
+                await self._latency(0.5 / max(len(chunks), 1))
+                yield chunk
+            span.set(response_chars=len(text))
+
+    async def embed(self, contents, model: str = None) -> list:
+        self.calls["embed"] += 1
+        await self._latency(0.2)
+        items = contents if isinstance(contents, list) else [contents]
+        return [[0.0] * 8 for _ in items]
+
+    def embed_sync(self, contents, model: str = None) -> list:
+        self.calls["embed"] += 1
+        items = contents if isinstance(contents, list) else [contents]
+        return [[0.0] * 8 for _ in items]
+
+
+# --- Fake Docker (docker_mgr Surface) ---
+class NotFound(Exception):
+    pass
+
+
+class FakeContainer:
+    WEB_MARKERS = {"uvicorn": "INFO:     Uvicorn running on http://0.0.0.0:{port}",
+                   "streamlit": "You can now view your Streamlit app in your browser. http server {port}"}
+
+    def __init__(self, name: str, image: str, port: int):
+        self.name = name
+        self.image = image
+        self.port = port
+        self.status = "running"
+        self.attrs = {"NetworkSettings": {"Networks": {"ironman_net": {}}}}
+        self.output = []
+        self.files = 0
+
+    @property
+    def is_web(self) -> bool:
+        return any("Uvicorn" in line or "Streamlit" in line for line in self.output)
+
+    def exec_run(self, cmd: str, detach: bool = False, **kwargs):
+        if "pip install" in cmd:
+            self.output.append("Successfully installed requirements (fake)")
+        marker = next((m for key, m in self.WEB_MARKERS.items() if key in cmd), None)
+        if marker:
+            self.output.append(marker.format(port=self.port))
+        elif "python" in cmd and "pkill" not in cmd:
+            self.output.append(f"[{self.name}] script started")
+        return SimpleNamespace(exit_code=0, output=b"")
+
+    def put_archive(self, path: str, data) -> bool:
+        self.files += 1
+        return True
+
+    def logs(self, **kwargs) -> bytes:
+        return "\n".join(self.output).encode("utf-8")
+
+    def reload(self):
+        pass
+
+    def stop(self, **kwargs):
+        self.status = "exited"
+
+    def remove(self, force: bool = False):
+        self.status = "removed"
+        self._registry.pop(self.name, None)
+
+
+class FakeContainers:
+    def __init__(self):
+        self.items = {}
+
+    def get(self, name: str) -> FakeContainer:
+        if name not in self.items:
+            raise NotFound(f"No such container: {name}")
+        return self.items[name]
+
+    def list(self, **kwargs) -> list:
+        return [c for c in self.items.values() if c.status == "running"]
+
+    def run(self, image: str, name: str, environment: dict = None, **kwargs) -> FakeContainer:
+        port = int((environment or {}).get("PORT", 8000))
+        container = FakeContainer(name, image, port)
+        container._registry = self.items
+        self.items[name] = container
+        return container
+
+    def prune(self, **kwargs):
+        for name in [n for n, c in self.items.items() if c.status != "running"]:
+            del self.items[name]
+
+
+class FakeDockerManager:
+    """DockerManager နဲ့ Method / Return String တူတူ (Deployer ရဲ့ "Deployed" စစ်တာ မပျက်အောင်)"""
+
+    def __init__(self, tracer, start_latency_ms: float):
+        self.tracer = tracer
+        self.start_latency_ms = start_latency_ms
+        self.client = SimpleNamespace(containers=FakeContainers(), images=SimpleNamespace(prune=lambda **kw: None))
+        self.network_name = "ironman_net"
+        self.started = 0
+
+    def prune_resources(self):
+        self.client.containers.prune()
+
+    def start_container(self, image: str, name: str, port: int, command: str = None, env: dict = None, code_path: str = None):
+        with self.tracer.span("docker.start_container", "docker", name=name, image=image, fake=True):
+            time.sleep(self.start_latency_ms / 1000)     # Docker SDK လိုပဲ Blocking
+            try:
+                self.client.containers.get(name).remove(force=True)
+            except NotFound:
+                pass
+            container = self.client.containers.run(image=image, name=name, environment=env or {"PORT": str(port)})
+            if code_path and os.path.exists(code_path):
+                container.put_archive("/app", b"")
+            if command:
+                container.exec_run(f"bash -c '{command}'", detach=True)
+            self.started += 1
+            return f"✅ Container Deployed: {name}\n🌍 URL: http://{name}.thukha.online"
+
+    def list_containers(self):
+        return self.client.containers.list()
+
+    def stop_container(self, name):
+        try:
+            container = self.client.containers.get(name)
+            container.stop()
+            container.remove()
+            return f"🛑 Stopped {name}"
+        except Exception as e:
+            return f"⚠️ Error stopping {name}: {e}"
+
+    def http_get(self, url: str, timeout: float = None):
+        """Deployer Health Check (requests.get) အစား: Web Container ဆိုရင် 200"""
+        host = re.sub(r"^https?://", "", url).split(":")[0].split("/")[0]
+        try:
+            container = self.client.containers.get(host)
+        except NotFound:
+            raise ConnectionError(f"Failed to resolve {host}")
+        if container.status != "running" or not container.is_web:
+            raise ConnectionError(f"Connection refused: {url}")
+        return SimpleNamespace(status_code=200, text="ok")
+
+
+class ScaledAsyncio:
+    """Deployer ရဲ့ asyncio.sleep (Settle 5s / Health Retry) ကို scale နဲ့ ချုံ့မယ် (to_thread / CancelledError စတာတွေ မပြောင်း)"""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(seconds * self.scale)
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+
+# --- Environment ---
+def prepare_env(root: str, extra: dict = None):
+    """src Import မလုပ်ခင် Settings Env တွေကို Temp Root ထဲ ညွှန်မယ် (Production DB / Workspace မထိ)"""
+    workspace = os.path.join(root, "workspace")
+    os.makedirs(workspace, exist_ok=True)
+    os.chdir(root)      # "workspace/..." Relative Path (Checkpoint DB / Logs / Traces) တွေ Temp ထဲရောက်မယ်
+    os.environ.update({
+        "WORKSPACE_DIR": workspace,
+        "TELEGRAM_TOKEN": "",
+        "GITHUB_TOKEN": "",
+        "MISSION_RESUME": "false",
+        "LLM_CACHE_ENABLED": "false",
+        "GIT_CONFIG_GLOBAL": os.path.join(root, "gitconfig"),   # GitTools က --global ကို ပြင်လို့
+        **(extra or {}),
+    })
+    os.environ.setdefault("GOOGLE_API_KEYS", "offline-bench-key")
+    os.environ.setdefault("OPENROUTER_API_KEY", "offline-bench-key")
+    subprocess.run(["git", "init", "-q", workspace], check=False)
+    return workspace
+
+
+def prepare_offline_venv(venv_dir: str):
+    """Tester Venv: bin/python → လက်ရှိ Interpreter, bin/pip → No-op (Dependency တွေ Bench Env မှာ ရှိပြီးသား)"""
+    bin_dir = os.path.join(venv_dir, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    # Symlink မသုံးဘဲ exec Wrapper (Symlink ဆိုရင် pyvenv.cfg မတွေ့လို့ Bench Venv ရဲ့ site-packages ပျောက်မယ်)
+    scripts = {
+        "python": f'#!/bin/sh\nexec "{sys.executable}" "$@"\n',
+        "pip": "#!/bin/sh\necho 'offline pip: skipped' \"$@\"\n",
+    }
+    for name, body in scripts.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(body)
+        os.chmod(path, 0o755)
+
+
+def load_cassette_missions(path: str) -> list:
+    """Cassette ခေါင်း ("mission" Entry) ထဲက Mission စာသား → (name, scenario)"""
+    missions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line) if line.strip() else {}
+            if entry.get("type") == "mission":
+                missions.append((f"cassette:{entry['mission_id']}", {"mission": entry["mission"], "plan": []}))
+    return missions
+
+
+def install_fakes(fake_llm, fake_docker: FakeDockerManager, workspace: str, sleep_scale: float):
+    from src.core.llm import llm_engine
+    from src.runtime import docker_mgr as docker_module
+    from src.agents import deployer as deployer_module
+    from src.tools import git_tools
+
+    if fake_llm is not None:    # Cassette Replay ဆိုရင် LLMEngine ကိုယ်တိုင် Replay လုပ်မယ်
+        for name in ("generate", "generate_stream", "embed", "embed_sync"):
+            setattr(llm_engine, name, getattr(fake_llm, name))
+    docker_module.docker_mgr = fake_docker
+    deployer_module.docker_mgr = fake_docker
+    deployer_module.requests = SimpleNamespace(get=fake_docker.http_get)
+    deployer_module.asyncio = ScaledAsyncio(sleep_scale)
+    git_tools.work_dir = workspace
+    git_tools.token = None
+
+
+# --- Measurement ---
+def dir_bytes(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+class RssSampler:
+    """Mission Run နေတုန်း Process + Child (Test Subprocess) RSS ကို Sample ယူပြီး Peak မှတ်မယ်"""
+
+    def __init__(self, interval: float = 0.02):
+        import psutil
+        self.proc = psutil.Process()
+        self.interval = interval
+        self.peak = 0
+        self._task = None
+
+    def _sample(self):
+        rss = self.proc.memory_info().rss
+        for child in self.proc.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except Exception:
+                pass
+        self.peak = max(self.peak, rss)
+
+    async def _loop(self):
+        while True:
+            self._sample()
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self):
+        self._sample()
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+        self._sample()
+
+
+async def checkpoint_bytes(conn, thread_id: str) -> dict:
+    async with conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(LENGTH(checkpoint) + LENGTH(metadata)), 0) FROM checkpoints WHERE thread_id = ?",
+        (thread_id,),
+    ) as cur:
+        count, ckpt = await cur.fetchone()
+    async with conn.execute(
+        "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes WHERE thread_id = ?", (thread_id,)
+    ) as cur:
+        (writes,) = await cur.fetchone()
+    return {"checkpoints": count, "checkpoint_bytes": ckpt, "write_bytes": writes}
+
+
+def node_times(tracer, mission_id: str) -> dict:
+    trace = tracer.traces.get(mission_id)
+    times = defaultdict(lambda: {"calls": 0, "ms": 0.0})
+    for span in trace.spans if trace else []:
+        if span.cat == "node":
+            times[span.name]["calls"] += 1
+            times[span.name]["ms"] += span.duration * 1000
+    return {k: {"calls": v["calls"], "ms": round(v["ms"], 1)} for k, v in times.items()}
+
+
+# --- Runner ---
+async def run_batch(brain, fake_llm, tracer, batch: list, workspace: str) -> list:
+    """Scenario တွေကို တပြိုင်နက် Submit (Sequential Mode မှာ တစ်ခုချင်း) ပြီး Mission တစ်ခုချင်းစီ တိုင်းမယ်"""
+    for _, scenario in batch:
+        for task in scenario["plan"]:
+            shutil.rmtree(os.path.join(workspace, os.path.dirname(task["file"])), ignore_errors=True)
+
+    blobs_before = dir_bytes(os.path.abspath("workspace/blobs"))
+    missions = []
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        for name, scenario in batch:
+            mission = await brain.submit(scenario["mission"], user_id=f"bench-{name}")
+            if fake_llm is not None:
+                fake_llm.bind(mission.id, scenario)
+            missions.append((name, mission))
+        results = await asyncio.gather(*(m.future for _, m in missions))
+        batch_wall = time.perf_counter() - started
+
+    rows = []
+    for (name, mission), result in zip(missions, results):
+        summary = tracer.summary(mission.id) or {}
+        rows.append({
+            "scenario": name,
+            "mission_id": mission.id,
+            "ok": mission.status == "done" and "Critical" not in (result or "") and "💥" not in (result or ""),
+            "wall_ms": round(((mission.finished_at or time.time()) - mission.created_at) * 1000, 1),
+            "batch_wall_ms": round(batch_wall * 1000, 1),
+            "nodes": node_times(tracer, mission.id),
+            "time_by_category_ms": summary.get("time_by_category_ms", {}),
+            "critical_path": [n["node"] for n in summary.get("critical_path", [])],
+            **await checkpoint_bytes(brain.checkpointer.conn, mission.id),
+            "peak_rss_mb": round(rss.peak / (1024 * 1024), 1),
+        })
+    blob_delta = dir_bytes(os.path.abspath("workspace/blobs")) - blobs_before
+    for row in rows:
+        row["blob_bytes_batch"] = blob_delta
+    return rows
+
+
+async def bench(args) -> list:
+    root = tempfile.mkdtemp(prefix="mission_bench_")
+    replay_env = {}
+    if args.cassette:
+        replay_env = {
+            "LLM_CASSETTE_MODE": "replay",
+            "LLM_CASSETTE_REPLAY_PATH": args.cassette,
+            "LLM_CASSETTE_LATENCY_SCALE": str(args.replay_latency),
+        }
+    workspace = prepare_env(root, replay_env)
+    print(f"📂 Bench Root: {root}")
+
+    # Settings Env ပြင်ပြီးမှ src ကို Import (Module Import Time မှာ Settings ဖတ်လို့)
+    from src.core.tracing import tracer, payload_size
+    from src.core.workflow import tester
+    from src.core.llm import llm_engine
+    from src.core.cassette import LLMCassette
+    from src.core.memo import node_memo
+    from src.brain import SeniorEngineerBrain
+
+    fake_llm = None
+    if args.cassette:
+        scenarios = load_cassette_missions(args.cassette)
+    else:
+        error_agents = {a.strip() for a in args.error_agents.split(",") if a.strip()}
+        fake_llm = FakeLLM(tracer, payload_size, args.latency_ms, args.jitter_ms, args.error_rate, error_agents, args.seed)
+        scenarios = [(name, SCENARIOS[name]) for name in (args.scenario or list(SCENARIOS))]
+    fake_docker = FakeDockerManager(tracer, args.docker_ms)
+    install_fakes(fake_llm, fake_docker, workspace, args.sleep_scale)
+    prepare_offline_venv(tester.venv_dir)
+
+    brain = SeniorEngineerBrain()
+    await brain.start()
+    rows = []
+    try:
+        for run in range(args.runs):
+            if args.cassette:
+                llm_engine.cassette = LLMCassette()     # Run တိုင်း Cassette ကို အစကနေ ပြန်ဖွင့်
+            if not args.keep_memo:
+                node_memo.clear()     # Run အချင်းချင်း Memo မမျှအောင် (Mission တစ်ခုအတွင်း Fix Loop Hit တွေပဲ တိုင်းမယ်)
+            batches = [scenarios] if args.concurrent else [[item] for item in scenarios]
+            for batch in batches:
+                for row in await run_batch(brain, fake_llm, tracer, batch, workspace):
+                    row["run"] = run + 1
+                    rows.append(row)
+    finally:
+        await brain.close()
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if fake_llm is not None:
+        print(f"\n🤖 Fake LLM calls: {dict(fake_llm.calls)} | injected errors: {dict(fake_llm.errors)}")
+    else:
+        print(f"\n📼 Cassette: {llm_engine.cassette.stats()}")
+    print(f"🐳 Fake containers started: {fake_docker.started}")
+    print(f"♻️ Node memo: {node_memo.stats()['namespaces']}")
+    return rows
+
+
+def report(rows: list):
+    print("\n🏁 Mission Benchmark")
+    print(f"   {'scenario':<30} {'ok':<4} {'wall ms':>10} {'ckpts':>6} {'ckpt KB':>9} {'writes KB':>10} {'peak RSS MB':>12}")
+    for r in rows:
+        print(f"   {r['scenario'][:30]:<30} {'✅' if r['ok'] else '❌':<3} {r['wall_ms']:>10.0f} {r['checkpoints']:>6} "
+              f"{r['checkpoint_bytes'] / 1024:>9.1f} {r['write_bytes'] / 1024:>10.1f} {r['peak_rss_mb']:>12.1f}")
+
+    by_scenario = defaultdict(list)
+    for r in rows:
+        by_scenario[r["scenario"]].append(r)
+    for name, items in by_scenario.items():
+        walls = [r["wall_ms"] for r in items]
+        print(f"\n📊 {name}: runs={len(items)} ok={sum(r['ok'] for r in items)} "
+              f"wall median={statistics.median(walls):.0f} ms min={min(walls):.0f} max={max(walls):.0f}")
+        nodes = defaultdict(list)
+        for r in items:
+            for node, t in r["nodes"].items():
+                nodes[node].append(t)
+        for node, ts in sorted(nodes.items(), key=lambda kv: -sum(t["ms"] for t in kv[1])):
+            print(f"   {node:<18} calls/run={sum(t['calls'] for t in ts) / len(items):>4.1f} "
+                  f"ms/run={sum(t['ms'] for t in ts) / len(items):>9.1f}")
+        cats = defaultdict(float)
+        for r in items:
+            for cat, ms in r["time_by_category_ms"].items():
+                cats[cat] += ms / len(items)
+        if cats:
+            print("   by category: " + ", ".join(f"{c}={ms:.0f}ms" for c, ms in sorted(cats.items(), key=lambda kv: -kv[1])))
+        print(f"   critical path: {' → '.join(items[-1]['critical_path'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end mission benchmark (fake LLM + fake Docker)")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Repeatable (default: all)")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--concurrent", action="store_true", help="Submit the selected scenarios together per run")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean fake LLM latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected 503 per LLM call")
+    parser.add_argument("--error-agents", default="coder", help="Comma-separated agent tags ('' = all agents)")
+    parser.add_argument("--docker-ms", type=float, default=300.0, help="Fake container start latency")
+    parser.add_argument("--keep-memo", action="store_true", help="Share the node memo across runs (warm fix loop)")
+    parser.add_argument("--sleep-scale", type=float, default=0.01, help="Scale for the deployer's settle / health-check waits")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cassette", help="Replay a recorded mission cassette (.jsonl) instead of the fake LLM")
+    parser.add_argument("--replay-latency", type=float, default=1.0, help="Cassette latency scale (1 = recorded, 0 = none)")
+    parser.add_argument("--json", help="Write raw results to this path")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp bench root")
+    args = parser.parse_args()
+    # bench() က Temp Root ထဲ chdir လုပ်လို့ Path တွေကို အရင် Absolute ပြောင်းမယ်
+    if args.json:
+        args.json = os.path.abspath(args.json)
+    if args.cassette:
+        args.cassette = os.path.abspath(args.cassette)
+
+    rows = asyncio.run(bench(args))
+    report(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
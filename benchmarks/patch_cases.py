@@ -0,0 +1,84 @@
+"""
+Patch Engine Regression Cases (Offline, LLM မလို)
+SEARCH/REPLACE Block တွေကို src.core.patching နဲ့ Apply ပြီး မျှော်မှန်းထားတဲ့ Code နဲ့ တိုက်စစ်မယ်။
+တစ်ခုမှားရင် Exit Code 1
+
+Usage:
+    python -m benchmarks.patch_cases
+"""
+import sys
+
+from src.core.patching import PatchError, apply_block
+
+CASES = [
+    {
+        "name": "exact match is whole-line (no substring rewrite)",
+        "code": "max = 10\nx = 1\n",
+        "search": "x = 1",
+        "replace": "x = 2",
+        "expect": "max = 10\nx = 2\n",
+    },
+    {
+        "name": "ambiguous SEARCH is rejected",
+        "code": "x = 1\nprint(x)\nx = 1\n",
+        "search": "x = 1",
+        "replace": "x = 2",
+        "expect": PatchError,
+    },
+    {
+        "name": "ambiguous whitespace-insensitive SEARCH is rejected",
+        "code": "def a():\n    return 1\n\ndef b():\n        return 1\n",
+        "search": "  return 1",
+        "replace": "  return 2",
+        "expect": PatchError,
+    },
+    {
+        "name": "nested REPLACE keeps relative indentation (deeper file indent)",
+        "code": "class A:\n    def run(self):\n        x = 1\n        return x\n",
+        "search": "x = 1\nreturn x",
+        "replace": "if x:\n    x = 2\n    for i in range(3):\n        x += i\nreturn x",
+        "expect": "class A:\n    def run(self):\n        if x:\n            x = 2\n            for i in range(3):\n                x += i\n        return x\n",
+    },
+    {
+        "name": "nested REPLACE dedents every line by the same delta",
+        "code": "def run():\n    x = 1\n    return x\n",
+        "search": "        x = 1\n        return x",
+        "replace": "        if x:\n            x = 2\n    # outdented comment\n        return x",
+        "expect": "def run():\n    if x:\n        x = 2\n# outdented comment\n    return x\n",
+    },
+    {
+        "name": "tab-indented file gets tab-indented REPLACE",
+        "code": "def run():\n\tx = 1\n\treturn x\n",
+        "search": "    x = 1",
+        "replace": "    if x:\n        x = 2",
+        "expect": "def run():\n\tif x:\n\t\tx = 2\n\treturn x\n",
+    },
+    {
+        "name": "empty SEARCH appends",
+        "code": "a = 1\n",
+        "search": "",
+        "replace": "b = 2",
+        "expect": "a = 1\nb = 2\n",
+    },
+]
+
+
+def run() -> int:
+    failures = 0
+    for case in CASES:
+        try:
+            result = apply_block(case["code"], case["search"], case["replace"])
+        except PatchError as e:
+            result = e
+        expect = case["expect"]
+        ok = isinstance(result, expect) if isinstance(expect, type) else result == expect
+        print(f"{'✅' if ok else '❌'} {case['name']}")
+        if not ok:
+            failures += 1
+            print(f"   expected: {expect!r}\n   got:      {result!r}")
+    print(f"\n🧩 Patch cases: {len(CASES) - failures}/{len(CASES)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,275 @@
+"""
+Telegram Update Load Test (Offline)
+Simulated Update တွေကို PTB update_queue ထဲ (Webhook Route လိုပဲ) တစ်ပြိုင်နက် ထည့်ပြီး
+Sequential (Handler က Mission ပြီးတဲ့အထိ စောင့်တဲ့ ပုံစံဟောင်း) နဲ့ Concurrent (ChatDispatcher) ကို နှိုင်းယှဉ်မယ်။
+- Bot API: In-process aiohttp Server အတု (sendMessage ကို Chat / Quote အလိုက် မှတ်မယ်)
+- LLM / Docker: mission_bench ရဲ့ Fake တွေ
+- တိုင်းမယ့်အရာ: Throughput, Ack Latency, Reply Latency, Chat တစ်ခုချင်းစီရဲ့ Reply အစဉ်မှန်/မမှန်, Busy ငြင်းတာ
+
+Usage:
+    python -m benchmarks.telegram_load                              # sequential vs concurrent, 24 msgs / 4 chats
+    python -m benchmarks.telegram_load --mode concurrent --messages 100 --chats 10 --workers 4
+    python -m benchmarks.telegram_load --text "hello" --text "stop fib-script-v1" --latency-ms 500
+"""
+import argparse
+import asyncio
+import json
+import shutil
+import socket
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.mission_bench import (
+    SCENARIOS, FakeLLM, FakeDockerManager, install_fakes, prepare_env, prepare_offline_venv,
+)
+
+USER_ID = 4242
+TOKEN = "123456:load-test"
+
+
+class FakeBotAPI:
+    """sendMessage တွေကို (ts, chat_id, text, quoted message_id) အဖြစ် မှတ်မယ်၊ ကျန်တဲ့ Method တွေ ok"""
+
+    def __init__(self):
+        self.sent = []
+        self.message_ids = 10**6
+        self.runner = None
+        self.port = None
+
+    @staticmethod
+    def _field(data: dict, name: str):
+        value = data.get(name)
+        if isinstance(value, str) and value[:1] in "{[":
+            return json.loads(value)
+        return value
+
+    async def handle(self, request):
+        from aiohttp import web
+        method = request.match_info["method"]
+        if request.content_type == "application/json":
+            data = await request.json()
+        else:
+            data = dict(await request.post())
+        if method == "getMe":
+            return web.json_response({"ok": True, "result": {
+                "id": 1, "is_bot": True, "first_name": "Jarvis", "username": "jarvis_load_bot",
+            }})
+        if method == "sendMessage":
+            chat_id = int(data["chat_id"])
+            quote = self._field(data, "reply_parameters") or {}
+            self.sent.append((time.perf_counter(), chat_id, data.get("text", ""), quote.get("message_id")))
+            self.message_ids += 1
+            return web.json_response({"ok": True, "result": {
+                "message_id": self.message_ids, "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"}, "text": data.get("text", ""),
+            }})
+        return web.json_response({"ok": True, "result": True})
+
+    async def start(self):
+        from aiohttp import web
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        await web.TCPSite(self.runner, "127.0.0.1", self.port).start()
+        return f"http://127.0.0.1:{self.port}/bot"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+def make_update(update_id: int, chat_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "group", "title": f"load-{chat_id}"},
+            "from": {"id": USER_ID, "is_bot": False, "first_name": "Load"},
+            "text": text,
+        },
+    }
+
+
+def build_sequential_app(main, base_url: str):
+    """ပုံစံဟောင်း: Update တစ်ခုချင်း Process + Handler ထဲမှာ think_and_reply ကို အဆုံးထိစောင့်"""
+    from telegram.ext import ApplicationBuilder, MessageHandler, filters
+
+    async def handler(update, context):
+        response = await main.app_state["brain"].think_and_reply(update.message.text, user_id=str(update.effective_user.id))
+        for x in range(0, len(response), 4000):
+            await update.message.reply_text(response[x:x+4000], do_quote=True)
+
+    application = ApplicationBuilder().token(TOKEN).updater(None).base_url(base_url).build()
+    application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handler))
+    return application
+
+
+async def run_mode(mode: str, main, bot_api: FakeBotAPI, base_url: str, args) -> dict:
+    from telegram import Update
+
+    if mode == "sequential":
+        application = build_sequential_app(main, base_url)
+    else:
+        application = main.build_telegram_app(TOKEN, webhook=True, base_url=base_url)
+    await application.initialize()
+    await application.start()
+
+    first_sent = len(bot_api.sent)
+    texts = args.text or ["hello"]
+    enqueued = {}       # message_id -> (ts, chat_id)
+    base_id = int(time.time() * 1000) % 10**9
+    started = time.perf_counter()
+    for i in range(args.messages):
+        chat_id = -(1000 + i % args.chats)
+        update = make_update(base_id + i, chat_id, f"{texts[i % len(texts)]} #{i}")
+        enqueued[base_id + i] = (time.perf_counter(), chat_id)
+        await application.update_queue.put(Update.de_json(update, application.bot))
+        if args.interval_ms:
+            await asyncio.sleep(args.interval_ms / 1000)
+
+    def is_ack(text: str) -> bool:
+        return text.startswith("⏳") or text.startswith("🚀")
+
+    def replies():
+        # Group Chat မှာ PTB က Ack / Busy ကိုလည်း Quote လုပ်လို့ Text နဲ့ ခွဲမယ်
+        return [
+            s for s in bot_api.sent[first_sent:]
+            if s[3] in enqueued and not is_ack(s[2]) and not s[2].startswith("🚦")
+        ]
+
+    def busy():
+        return [s for s in bot_api.sent[first_sent:] if s[2].startswith("🚦")]
+
+    deadline = time.perf_counter() + args.timeout
+    while len(replies()) + len(busy()) < args.messages and time.perf_counter() < deadline:
+        await asyncio.sleep(0.02)
+    wall = time.perf_counter() - started
+
+    await application.stop()
+    await application.shutdown()
+
+    sent = bot_api.sent[first_sent:]
+    reply_ms = [(ts - enqueued[mid][0]) * 1000 for ts, _, _, mid in replies()]
+
+    # Ack: Chat တစ်ခုချင်းစီမှာ k-th Ack ↔ k-th Message (Ack တွေ Chat အလိုက် အစဉ်လိုက်ထွက်လို့)
+    by_chat_enqueue = defaultdict(list)
+    for mid, (ts, chat_id) in sorted(enqueued.items()):
+        by_chat_enqueue[chat_id].append(ts)
+    by_chat_ack = defaultdict(list)
+    for ts, chat_id, text, mid in sent:
+        if is_ack(text):
+            by_chat_ack[chat_id].append(ts)
+    ack_ms = [
+        (ack - enq) * 1000
+        for chat_id, acks in by_chat_ack.items()
+        for ack, enq in zip(acks, by_chat_enqueue[chat_id])
+    ]
+
+    # Ordering: Chat တစ်ခုထဲက Reply တွေရဲ့ Quote message_id တွေ တက်စဉ်ဖြစ်ရမယ်
+    violations = 0
+    last = {}
+    for _, chat_id, _, mid in replies():
+        if mid is not None and mid < last.get(chat_id, -1):
+            violations += 1
+        last[chat_id] = max(mid, last.get(chat_id, -1))
+
+    def pct(values, q):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+    return {
+        "mode": mode,
+        "messages": args.messages,
+        "chats": args.chats,
+        "replied": len(replies()),
+        "busy": len(busy()),
+        "wall_s": round(wall, 2),
+        "throughput": round(len(replies()) / wall, 2) if wall else 0.0,
+        "ack_p50_ms": round(statistics.median(ack_ms), 1) if ack_ms else None,
+        "ack_p95_ms": round(pct(ack_ms, 0.95), 1) if ack_ms else None,
+        "reply_p50_ms": round(statistics.median(reply_ms), 1) if reply_ms else None,
+        "reply_p95_ms": round(pct(reply_ms, 0.95), 1) if reply_ms else None,
+        "order_violations": violations,
+    }
+
+
+async def load(args) -> list:
+    root = tempfile.mkdtemp(prefix="telegram_load_")
+    workspace = prepare_env(root, {
+        "ALLOWED_USER_ID": str(USER_ID),
+        "MISSION_WORKERS": str(args.workers),
+        "TELEGRAM_MAX_IN_FLIGHT": str(args.max_in_flight),
+    })
+
+    # Settings Env ပြင်ပြီးမှ src ကို Import
+    from src.core.tracing import tracer, payload_size
+    from src.core.workflow import tester
+    from src import main
+
+    fake_llm = FakeLLM(tracer, payload_size, args.latency_ms, args.jitter_ms, 0.0, set(), args.seed)
+    fake_llm.default_scenario = SCENARIOS["single_file"]
+    install_fakes(fake_llm, FakeDockerManager(tracer, args.docker_ms), workspace, args.sleep_scale)
+    prepare_offline_venv(tester.venv_dir)
+
+    bot_api = FakeBotAPI()
+    base_url = await bot_api.start()
+    brain = main.SeniorEngineerBrain()
+    await brain.start()
+    main.app_state["brain"] = brain
+    rows = []
+    try:
+        modes = ["sequential", "concurrent"] if args.mode == "both" else [args.mode]
+        for mode in modes:
+            print(f"\n🚚 {mode}: {args.messages} messages across {args.chats} chats ...")
+            rows.append(await run_mode(mode, main, bot_api, base_url, args))
+    finally:
+        await main.chat_dispatcher.close()
+        await brain.close()
+        await bot_api.stop()
+        shutil.rmtree(root, ignore_errors=True)
+    return rows
+
+
+def report(rows: list):
+    print("\n🏁 Telegram Load Test")
+    print(f"   {'mode':<11} {'sent':>5} {'replied':>8} {'busy':>5} {'wall s':>7} {'msg/s':>7} "
+          f"{'ack p50':>8} {'ack p95':>8} {'reply p50':>10} {'reply p95':>10} {'order':>6}")
+    for r in rows:
+        def fmt(v, width):
+            return f"{v:>{width}.1f}" if v is not None else f"{'-':>{width}}"
+        print(f"   {r['mode']:<11} {r['messages']:>5} {r['replied']:>8} {r['busy']:>5} {r['wall_s']:>7.2f} "
+              f"{r['throughput']:>7.2f} {fmt(r['ack_p50_ms'], 8)} {fmt(r['ack_p95_ms'], 8)} "
+              f"{fmt(r['reply_p50_ms'], 10)} {fmt(r['reply_p95_ms'], 10)} {r['order_violations']:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Telegram update load test (fake Bot API + fake LLM)")
+    parser.add_argument("--mode", choices=["both", "sequential", "concurrent"], default="both")
+    parser.add_argument("--messages", type=int, default=24)
+    parser.add_argument("--chats", type=int, default=4)
+    parser.add_argument("--text", action="append", help="Message text mix (repeatable, default: hello)")
+    parser.add_argument("--interval-ms", type=float, default=0.0, help="Gap between simulated updates (0 = burst)")
+    parser.add_argument("--workers", type=int, default=4, help="MISSION_WORKERS")
+    parser.add_argument("--max-in-flight", type=int, default=64, help="TELEGRAM_MAX_IN_FLIGHT")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Mean fake LLM latency")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--docker-ms", type=float, default=100.0)
+    parser.add_argument("--sleep-scale", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    rows = asyncio.run(load(args))
+    report(rows)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Telegram Webhook Replay Harness
+Recorded Update (TELEGRAM_UPDATE_LOG JSONL) တွေ (သို့) Text နဲ့ ဆောက်ထားတဲ့ Synthetic Update တွေကို
+Webhook Route ဆီ Secret Header နဲ့ Post ပြီး Message → Ack (HTTP 200) Latency ကို တိုင်းမယ်။
+Server ကို TELEGRAM_MODE=webhook နဲ့ Run ထားရမယ် (TELEGRAM_WEBHOOK_URL မပေးရင် Telegram မှာ Register မလုပ်ဘဲ Local သက်သက်)
+
+Usage:
+    python -m benchmarks.telegram_webhook_replay --text "hello" --text "stop todo-api"
+    python -m benchmarks.telegram_webhook_replay --updates workspace/telegram_updates.jsonl --repeat 5 --concurrency 4
+    python -m benchmarks.telegram_webhook_replay --text "hi" --secret wrong     # 403 ဖြစ်ရမယ်
+"""
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import os
+import statistics
+import time
+from collections import Counter
+
+import aiohttp
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def text_update(text: str, user_id: int) -> dict:
+    """Telegram Bot API Update (Private Chat Text Message) အတု"""
+    entities = []
+    if text.startswith("/"):
+        entities.append({"type": "bot_command", "offset": 0, "length": len(text.split()[0])})
+    return {
+        "update_id": 0,
+        "message": {
+            "message_id": 0,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private", "first_name": "Harness"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Harness"},
+            "text": text,
+            **({"entities": entities} if entities else {}),
+        },
+    }
+
+
+def load_updates(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def post(session, url: str, secret: str, update: dict) -> tuple:
+    started = time.perf_counter()
+    try:
+        async with session.post(url, json=update, headers={SECRET_HEADER: secret}) as response:
+            await response.read()
+            status = response.status
+    except aiohttp.ClientError as e:
+        status = type(e).__name__
+    return status, (time.perf_counter() - started) * 1000
+
+
+async def replay(args) -> list:
+    updates = load_updates(args.updates) if args.updates else []
+    updates += [text_update(text, args.user_id) for text in args.text or []]
+    if not updates:
+        raise SystemExit("Nothing to send (use --updates and/or --text)")
+
+    # update_id / message_id တွေကို အသစ်ပြန်တပ်မယ် (Repeat လုပ်ရင် Update တစ်ခုချင်းစီ သီးသန့်ဖြစ်အောင်)
+    ids = itertools.count(int(time.time()) * 1000)
+    batch = []
+    for _ in range(args.repeat):
+        for update in updates:
+            update = copy.deepcopy(update)
+            update["update_id"] = next(ids)
+            if "message" in update:
+                update["message"]["message_id"] = update["update_id"] % 2**31
+                update["message"]["date"] = int(time.time())
+            batch.append(update)
+
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def send(session, update):
+        async with limit:
+            result = await post(session, args.url, args.secret, update)
+        if args.delay_ms:
+            await asyncio.sleep(args.delay_ms / 1000)
+        return result
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=args.timeout)) as session:
+        return await asyncio.gather(*(send(session, u) for u in batch))
+
+
+def report(results: list):
+    codes = Counter(status for status, _ in results)
+    acks = sorted(ms for status, ms in results if status == 200)
+    print(f"\n📨 Webhook Replay: sent={len(results)} status={dict(codes)}")
+    if acks:
+        p95 = acks[min(len(acks) - 1, int(len(acks) * 0.95))]
+        print(f"   ack latency ms: p50={statistics.median(acks):.1f} p95={p95:.1f} max={acks[-1]:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post recorded / synthetic Telegram updates to the webhook route")
+    parser.add_argument("--url", default=f"http://localhost:{os.getenv('PORT', 8000)}/telegram/webhook")
+    parser.add_argument("--secret", default=os.getenv("TELEGRAM_WEBHOOK_SECRET", ""))
+    parser.add_argument("--updates", help="JSONL of raw updates (TELEGRAM_UPDATE_LOG)")
+    parser.add_argument("--text", action="append", help="Synthetic text message (repeatable)")
+    parser.add_argument("--user-id", type=int, default=int(os.getenv("ALLOWED_USER_ID", 0)))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Pause after each post")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    report(asyncio.run(replay(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -28,9 +28,134 @@ class Settings:
     
     # Super Brain (The Last Resort)
     MODEL_SUPER = "gemini-3-flash-preview"
+
+    # Backup (Coder က 503/429 ဆက်တိုက်ခံရရင် ပြောင်းသုံးမယ်)
+    MODEL_BACKUP = "gemini-2.5-flash"
+
+    # Embeddings (VectorDB)
+    MODEL_EMBEDDING = "text-embedding-004"
     
+    # --- Workspace ---
+    # Agent တွေ Code ရေး / Test / Deploy လုပ်မယ့် Folder (Container ထဲမှာ /app/workspace)
+    WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "/app/workspace")
+
     # --- System Limits ---
     MAX_RETRIES = 3
     RETRY_DELAY = 5 # seconds
 
+    # --- Mission Executor ---
+    # Mission (Telegram/API Message) တွေကို တပြိုင်နက် ဘယ်နှခု Run မလဲ
+    MISSION_WORKERS = int(os.getenv("MISSION_WORKERS", 2))
+    # CHAT / DEPLOY (Control) Message တွေအတွက် သီးသန့် Worker (Code Generation Mission နောက်မှာ တန်းမစီရအောင်)
+    MISSION_FAST_LANE = os.getenv("MISSION_FAST_LANE", "true").lower() == "true"
+    MISSION_FAST_WORKERS = int(os.getenv("MISSION_FAST_WORKERS", 1))
+    # Lane ရွေးရုံပဲမို့ Router Fast-path ထက် Threshold နိမ့်တယ် (မှားရင် Slot နေရာပဲ ပြောင်းမယ်၊ Answer မပြောင်းဘူး)
+    MISSION_FAST_LANE_THRESHOLD = float(os.getenv("MISSION_FAST_LANE_THRESHOLD", 0.6))
+    # Container Restart ပြီးရင် မပြီးလိုက်တဲ့ Mission တွေကို Checkpoint ကနေ ဆက် Run မယ်
+    MISSION_RESUME = os.getenv("MISSION_RESUME", "true").lower() == "true"
+    # ဒီထက်ကြာနေတဲ့ Unfinished Mission တွေကို Resume မလုပ်ဘဲ failed လို့ မှတ်မယ် (Crash Loop မဖြစ်အောင်)
+    MISSION_RESUME_MAX_AGE_HOURS = float(os.getenv("MISSION_RESUME_MAX_AGE_HOURS", 24))
+
+    # AgentState.logs ထဲမှာ နောက်ဆုံး Log ဘယ်နှခု ထားမလဲ (ကျန်တာ Mission Log File ထဲ Spill)
+    STATE_LOGS_LIMIT = int(os.getenv("STATE_LOGS_LIMIT", 50))
+    MISSION_LOG_DIR = os.getenv("MISSION_LOG_DIR", "workspace/mission_logs")
+    # Checkpoint Retention Pass မှာ ဒီထက်ဟောင်းတဲ့ / ဒီအရေအတွက်ထက်ပိုတဲ့ (အဟောင်းဆုံးက စ) Mission Log တွေ ဖျက်မယ်
+    MISSION_LOG_MAX_AGE_HOURS = float(os.getenv("MISSION_LOG_MAX_AGE_HOURS", 72))
+    MISSION_LOG_KEEP = int(os.getenv("MISSION_LOG_KEEP", 500))
+    # Node / LLM / Docker / Subprocess Span တွေကို Chrome Trace JSON အဖြစ် Mission တိုင်း ထုတ်မယ်
+    TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACE_DIR = os.getenv("TRACE_DIR", "workspace/traces")
+    # Checkpoint Retention Pass မှာ Trace JSON တွေကိုလည်း Age + Count နဲ့ ထိန်းမယ်
+    TRACE_MAX_AGE_HOURS = float(os.getenv("TRACE_MAX_AGE_HOURS", 72))
+    TRACE_KEEP = int(os.getenv("TRACE_KEEP", 200))
+
+    # --- Parallel Task Execution ---
+    # Plan ထဲက Task တွေကို တပြိုင်နက် ဘယ်နှခု Coder → Debugger ပြေးခွင့်ပြုမလဲ
+    MAX_PARALLEL_TASKS = int(os.getenv("MAX_PARALLEL_TASKS", 3))
+
+    # --- Coder Streaming ---
+    # Token Stream ကို ဖတ်ရင်း File ထဲ တိုက်ရိုက်ရေးမယ် (Closing Fence တွေ့တာနဲ့ ရပ်မယ်)
+    CODER_STREAMING = os.getenv("CODER_STREAMING", "true").lower() == "true"
+    CODER_STREAM_PROGRESS_LINES = int(os.getenv("CODER_STREAM_PROGRESS_LINES", 50))
+
+    # --- Coder Patch Mode (Fix Iterations) ---
+    # Error ပြင်တဲ့အခါ ဖိုင်တစ်ခုလုံးအစား SEARCH/REPLACE Block တွေပဲ တောင်းမယ်
+    CODER_PATCH_MODE = os.getenv("CODER_PATCH_MODE", "true").lower() == "true"
+
+    # --- Node Memoization (Fix Loop) ---
+    # File / requirements.txt / Command Hash မပြောင်းရင် compile / pip install / Test Run ကို ကျော်မယ် (Pass ခဲ့တာတွေပဲ)
+    NODE_MEMO_ENABLED = os.getenv("NODE_MEMO_ENABLED", "true").lower() == "true"
+    NODE_MEMO_MAX_ENTRIES = int(os.getenv("NODE_MEMO_MAX_ENTRIES", 1000))
+
+    # --- Telegram Notifier (Background Send Queue) ---
+    # Mission တစ်ခုရဲ့ Status တွေကို Progress Message တစ်ခုထဲ Edit နဲ့ စုပြမယ် (နောက်ဆုံး N ကြောင်း)
+    NOTIFIER_LIVE_LINES = int(os.getenv("NOTIFIER_LIVE_LINES", 15))
+    NOTIFIER_CHAT_INTERVAL = float(os.getenv("NOTIFIER_CHAT_INTERVAL", 1.0))    # Chat တစ်ခုကို ပို့/Edit ကြားချိန် (s)
+    NOTIFIER_GLOBAL_RATE = float(os.getenv("NOTIFIER_GLOBAL_RATE", 25))         # Bot တစ်ခုလုံး Request / second
+    NOTIFIER_MAX_PENDING = int(os.getenv("NOTIFIER_MAX_PENDING", 200))          # ပြည့်ရင် အဟောင်းဆုံးကို ဖယ်မယ်
+
+    # --- LLM Gateway ---
+    # Provider တစ်ခုချင်းစီကို တပြိုင်နက် ခေါ်ခွင့်ရှိတဲ့ Request အရေအတွက်
+    LLM_MAX_CONCURRENCY_GEMINI = int(os.getenv("LLM_MAX_CONCURRENCY_GEMINI", 8))
+    LLM_MAX_CONCURRENCY_OPENROUTER = int(os.getenv("LLM_MAX_CONCURRENCY_OPENROUTER", 4))
+
+    # --- Key Scheduler (Per Google Key) ---
+    KEY_RPM_LIMIT = int(os.getenv("KEY_RPM_LIMIT", 10))              # Requests / minute
+    KEY_TPM_LIMIT = int(os.getenv("KEY_TPM_LIMIT", 250000))          # Tokens / minute
+    KEY_COOLDOWN_SECONDS = float(os.getenv("KEY_COOLDOWN_SECONDS", 30))  # 429 ခံရရင် အခြေခံနားချိန်
+    KEY_MAX_COOLDOWN_SECONDS = float(os.getenv("KEY_MAX_COOLDOWN_SECONDS", 300))
+
+    # --- LLM Response Cache (Low-temperature calls) ---
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "workspace/llm_cache.sqlite")
+    # Cache သုံးခွင့်ပြုထားတဲ့ Agent တွေ (router, tester, architect, coder ...)
+    # Debugger က Fix မစစ်ခင် ခေါ်လို့ အမြဲ Bypass (Fail တဲ့ Fix ကို ပြန်မသုံးအောင်)
+    LLM_CACHE_AGENTS = [a.strip() for a in os.getenv("LLM_CACHE_AGENTS", "router,tester").split(",") if a.strip()]
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 5000))
+    LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", 100))
+
+    # --- LLM Cassettes (Record / Replay) ---
+    # off | record (Outbound LLM Call တိုင်းကို Mission အလိုက် JSONL မှတ်) | replay (Network မခေါ်ဘဲ ပြန်ပေး)
+    LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()
+    LLM_CASSETTE_DIR = os.getenv("LLM_CASSETTE_DIR", "workspace/cassettes")
+    # Replay Source: Cassette File တစ်ခု (သို့) Folder တစ်ခုလုံး (မပေးရင် LLM_CASSETTE_DIR)
+    LLM_CASSETTE_REPLAY_PATH = os.getenv("LLM_CASSETTE_REPLAY_PATH", "")
+    # 1.0 = Record တုန်းက Latency အတိုင်း, 0 = ချက်ချင်း
+    LLM_CASSETTE_LATENCY_SCALE = float(os.getenv("LLM_CASSETTE_LATENCY_SCALE", 1.0))
+    # true ဆိုရင် Prompt Hash အတိအကျ ကိုက်မှ ပြန်ပေးမယ် (false = Agent တူတဲ့ နောက် Recording ကို အစဉ်လိုက်)
+    LLM_CASSETTE_STRICT = os.getenv("LLM_CASSETTE_STRICT", "false").lower() == "true"
+
+    # --- Intent Router (Local Fast-path) ---
+    INTENT_FAST_PATH = os.getenv("INTENT_FAST_PATH", "true").lower() == "true"
+    INTENT_FAST_PATH_THRESHOLD = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", 0.75))
+    INTENT_LOG_PATH = os.getenv("INTENT_LOG_PATH", "workspace/intent_log.jsonl")
+    # Fast-path ဆုံးဖြတ်ချက်တွေရဲ့ ဒီအချိုးကို LLM Router နဲ့ နောက်ကွယ်ကနေ ထပ်စစ်ပြီး Log မယ် (Fast-path Accuracy တိုင်းဖို့)
+    INTENT_SHADOW_RATE = float(os.getenv("INTENT_SHADOW_RATE", 0.05))
+    # Router ဆုံးဖြတ်နေတုန်း Architect Plan ကို ကြိုတွက်မယ် (Opt-in: CHAT/DEPLOY ဆိုရင် LLM Call တစ်ခု အလကားဖြစ်မယ်)
+    SPECULATIVE_ARCHITECT = os.getenv("SPECULATIVE_ARCHITECT", "false").lower() == "true"
+
+    # --- Checkpoint Retention (LangGraph SQLite Memory) ---
+    CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "workspace/checkpoints.sqlite")
+    # Thread တစ်ခုချင်းစီမှာ နောက်ဆုံး Checkpoint ဘယ်နှခု ထားမလဲ (Resume အတွက် နောက်ဆုံးတစ်ခုပဲ လိုတယ်)
+    CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", 20))
+    # ပြီးဆုံးသွားတဲ့ Mission Thread တွေကို ဘယ်လောက်ကြာရင် ဖျက်မလဲ
+    CHECKPOINT_THREAD_TTL_HOURS = float(os.getenv("CHECKPOINT_THREAD_TTL_HOURS", 72))
+    # ဒီ Size ကျော်ရင် TTL မစောင့်တော့ဘဲ ပြီးပြီးသား Thread အားလုံးကို ရှင်းမယ် (Unfinished Thread တွေကို မထိ)
+    CHECKPOINT_MAX_MB = int(os.getenv("CHECKPOINT_MAX_MB", 500))
+    CHECKPOINT_COMPACT_INTERVAL = int(os.getenv("CHECKPOINT_COMPACT_INTERVAL", 600)) # seconds
+    # Incremental VACUUM တစ်ခါမှာ ပြန်ပေးမယ့် Page အရေအတွက် (Lock ကြာမသွားအောင်)
+    CHECKPOINT_VACUUM_PAGES = int(os.getenv("CHECKPOINT_VACUUM_PAGES", 5000))
+    # Long-lived Connection ရဲ့ SQLite Page Cache / mmap (RAM 2GB VPS အတွက် သေးသေးပဲ)
+    CHECKPOINT_CACHE_MB = int(os.getenv("CHECKPOINT_CACHE_MB", 16))
+    CHECKPOINT_MMAP_MB = int(os.getenv("CHECKPOINT_MMAP_MB", 64))
+    # Checkpoint Blob တွေကို zlib နဲ့ ချုံ့ပြီး သိမ်းမယ်
+    CHECKPOINT_COMPRESS = os.getenv("CHECKPOINT_COMPRESS", "true").lower() == "true"
+    CHECKPOINT_COMPRESS_MIN_BYTES = int(os.getenv("CHECKPOINT_COMPRESS_MIN_BYTES", 512))
+
+    # --- Blob Store (ကြီးတဲ့ State Field တွေကို Checkpoint အပြင်မှာ သိမ်းမယ်) ---
+    BLOB_DIR = os.getenv("BLOB_DIR", "workspace/blobs")
+    # code_content / error_logs က ဒီထက်ရှည်ရင် blob://sha256 Reference ပဲ State ထဲထားမယ်
+    BLOB_THRESHOLD_BYTES = int(os.getenv("BLOB_THRESHOLD_BYTES", 1024))
+
 settings = Settings()
\ No newline at end of file
@@ -3,6 +3,7 @@ from src.core.state import AgentState
 from src.core.llm import llm_engine
 from config.settings import settings
 from src.tools.files import file_tools
+from src.core.plan_graph import normalize_plan, break_cycles
 # 👇 Gemini Config သုံးဖို့ Import ထည့်ပါတယ်
 from google.genai.types import GenerateContentConfig
 
@@ -29,36 +30,36 @@ class ArchitectAgent:
         1. Analyze the mission: "{mission}"
         2. Create a specific PROJECT FOLDER NAME (e.g., 'snake_game', 'vpn_manager').
         3. Break down the mission into file tasks.
+        4. For each file, list in "depends_on" the plan files it imports or needs to exist first.
         
         CRITICAL RULE: 
         - ALL files must be inside the project folder. 
         - Example: DO NOT write 'app.py'. WRITE 'snake_game/app.py'.
+        - "depends_on" must only reference files in this plan and must NOT form cycles.
+        - Leaf modules (no imports from the project) have "depends_on": [].
         
         Output JSON format ONLY:
         {{
             "plan": [
-                {{"file": "project_name/main.py", "description": "Main entry point..."}}
+                {{"file": "project_name/utils.py", "description": "Helpers...", "depends_on": []}},
+                {{"file": "project_name/main.py", "description": "Main entry point...", "depends_on": ["project_name/utils.py"]}}
             ],
             "subdomain": "project-name-v1"
         }}
         """
 
         try:
-            # 🔥 FIX: OpenRouter ကို ဖြုတ်ပြီး Google Client (Gemini) ကို သုံးပါမယ်
-            client = llm_engine.get_gemini_client()
-            
-            # Gemini API Call (JSON Mode)
-            response = client.models.generate_content(
+            # 🔥 FIX: OpenRouter ကို ဖြုတ်ပြီး Google Client (Gemini) ကို သုံးပါမယ် (Async Gateway)
+            content = await llm_engine.generate(
+                system_msg, # Architect မှာ User Message ခွဲစရာမလိုလို့ System Prompt တစ်ခုတည်း ပေါင်းပို့လိုက်တာ ပိုငြိမ်ပါတယ်
                 model=model_name,
-                contents=system_msg, # Architect မှာ User Message ခွဲစရာမလိုလို့ System Prompt တစ်ခုတည်း ပေါင်းပို့လိုက်တာ ပိုငြိမ်ပါတယ်
                 config=GenerateContentConfig(
                     response_mime_type="application/json", # JSON အတင်းထွက်ခိုင်းမယ်
                     temperature=0.2
-                )
+                ),
+                agent="architect"
             )
             
-            # Gemini Response ကို ယူမယ်
-            content = response.text
             data = json.loads(content)
             
             plan = data.get("plan", [])
@@ -66,6 +67,12 @@ class ArchitectAgent:
             for task in plan:
                 task['status'] = 'pending'
             
+            # 🔗 Plan DAG: depends_on ကို သန့်စင်ပြီး Cycle ရှိရင် ဖြတ်မယ်
+            normalize_plan(plan)
+            removed_edges = break_cycles(plan)
+            if removed_edges:
+                print(f"⚠️ Architect: Dependency cycle detected. Dropped edges: {removed_edges}")
+            
             subdomain = data.get("subdomain", "")
             
             return {
@@ -73,7 +80,7 @@ class ArchitectAgent:
                 "subdomain": subdomain,
                 "cleanup_needed": cleanup_needed,
                 "created_files": [],
-                "logs": [f"🏗️ Architect: Plan created with {len(plan)} tasks."]
+                "logs": [f"🏗️ Architect: Plan created with {len(plan)} tasks ({sum(len(t['depends_on']) for t in plan)} dependencies)."]
             }
         except Exception as e:
             print(f"❌ Architect Error: {e}")
@@ -1,11 +1,11 @@
 import asyncio
 import socket
-import time
-from google import genai
-from google.genai.types import GenerateContentConfig
+from contextlib import aclosing
 from src.core.state import AgentState
-from src.core.llm import llm_engine
+from src.core.llm import llm_engine, no_tools_config
 from src.core.notifier import notifier
+from src.core.codeblock import CodeFenceStream, extract_code_block
+from src.core.patching import parse_search_replace, apply_search_replace, PatchError
 from config.settings import settings
 from src.tools.files import file_tools
 
@@ -26,7 +26,8 @@ class CoderAgent:
         existing_code = file_tools.read_file(task['file'])
         structure = file_tools.get_project_structure()
         
-        if "Error" in existing_code: existing_code = ""
+        # read_file က "❌ File not found." / "❌ Read Error" ပြန်ရင်ပဲ ရှင်းမယ် (Code ထဲက "ValueError" စတာတွေ မဖျက်မိအောင်)
+        if existing_code.startswith("❌"): existing_code = ""
 
         print(f"⚡ Coder ({settings.MODEL_CODER_NAME}): Started coding {task['file']}...")
 
@@ -36,91 +37,140 @@ class CoderAgent:
         File: {task['file']}
         Context: {structure}
         Current Code: {existing_code}
-        Errors: {state.get('error_logs', 'None')}
+        Errors: {task.get('fix_hint') or state.get('error_logs') or 'None'}
         Requirement: Write the COMPLETE code inside ```python ... ``` (or relevant language) block.
         """
         
+        # 🩹 Fix Iteration: ဖိုင်တစ်ခုလုံး ပြန်မရေးဘဲ Patch နဲ့ပဲ ပြင်မယ် (မရမှ Full Rewrite)
+        error_context = task.get('fix_hint') or state.get('error_logs')
+        if settings.CODER_PATCH_MODE and existing_code and error_context:
+            patched = await self._patch(task, existing_code, error_context)
+            if patched:
+                return {"code_content": patched}
+
         code = ""
         
-        # 🔥 FIX: No complicated HttpOptions. Just raw, simple Client.
-        # Retry ကို ကိုယ့်ဘာသာ Loop နဲ့ထိန်းမယ်။
+        # 🔥 FIX: Retry ကို ကိုယ့်ဘာသာ Loop နဲ့ထိန်းမယ်။
+        # Config to KILL AFC (Function Calling)
+        config = no_tools_config(
+            temperature=0.2,
+            system_instruction="You are a coding engine. Output only code."
+        )
         
         for attempt in range(settings.MAX_RETRIES):
             try:
-                # 1. Get Key
-                current_key = llm_engine.key_manager.get_next_key()
-                
-                # 2. Sync Client (Purer & More Stable on VPS)
-                client = genai.Client(api_key=current_key)
-
-                # 3. Config to KILL AFC (Function Calling)
-                # Dictionary style config is safer than importing types
-                config = GenerateContentConfig(
-                    temperature=0.2,
-                    tools=[], 
-                    tool_config={
-                        'function_calling_config': {
-                            'mode': 'NONE' # 🛑 This strictly disables AFC logs
-                        }
-                    },
-                    system_instruction="You are a coding engine. Output only code."
-                )
-
-                # 4. Run Sync Call in Thread (Non-blocking)
-                # Thread ထဲမှာ run တာမို့ Main Loop မရပ်ဘူး၊ Timeout ပြဿနာကင်းမယ်
-                response = await asyncio.to_thread(
-                    client.models.generate_content,
-                    model=settings.MODEL_CODER_NAME,
-                    contents=prompt,
-                    config=config
-                )
-                
-                # 5. Validate Response
-                if not response.text:
-                    if response.candidates and response.candidates[0].content.parts:
-                        code = response.candidates[0].content.parts[0].text
-                    else:
-                        raise Exception("Empty response (Possible Safety Filter)")
-                else:
-                    code = response.text
+                # Async Gateway: Pooled Client + Key Rotation (Event Loop မရပ်ဘူး)
+                code = await self._generate(prompt, settings.MODEL_CODER_NAME, config, task['file'], existing_code)
 
-                print(f"✅ Coder: Success with Key ...{current_key[-4:]}")
+                print(f"✅ Coder: Success on attempt {attempt+1}")
                 break 
 
             except Exception as e:
                 error_msg = str(e)
                 print(f"⚠️ Attempt {attempt+1} Failed: {error_msg}")
                 
-                # Backup Logic (Gemini 2.0 Flash)
-                if "503" in error_msg or "429" in error_msg or "deadline" in error_msg.lower():
+                # Backup Logic (Gemini 2.5 Flash)
+                capacity_error = "503" in error_msg or "429" in error_msg or "deadline" in error_msg.lower()
+                if capacity_error:
                     if attempt == settings.MAX_RETRIES - 1:
                         print("❌ Switching to Backup Model (Gemini 2.5 Flash)...")
                         try:
-                            # Backup call (also in thread)
-                            backup_resp = await asyncio.to_thread(
-                                client.models.generate_content,
-                                model="gemini-2.5-flash", 
-                                contents=prompt,
-                                config=config
-                            )
-                            code = backup_resp.text
+                            code = await self._generate(prompt, settings.MODEL_BACKUP, config, task['file'], existing_code)
                             break
                         except Exception as backup_err:
                             print(f"❌ Backup Failed: {backup_err}")
                 
-                # Smart Delay
-                await asyncio.sleep(2 ** attempt)
+                # Smart Delay: 429/503 ဆို Key Scheduler က အဲ့ Key ကို Cooldown ထည့်ပြီးသား၊
+                # နောက် Attempt မှာ Healthy Key အသစ်ရမှာမို့ မစောင့်တော့ဘူး (Key အားလုံးပိတ်နေမှ Scheduler ကစောင့်ပေးမယ်)
+                if not capacity_error:
+                    await asyncio.sleep(2 ** attempt)
+
+        return {"code_content": code}
+
+    async def _patch(self, task, existing_code: str, error_context: str) -> str:
+        """SEARCH/REPLACE Block တွေ တောင်းပြီး Local မှာ Fuzzy Apply မယ်။ မရရင် "" (Full Rewrite ဆက်လုပ်မယ်)"""
+        print(f"🩹 Coder: Patch mode for {task['file']}...")
+        prompt = f"""
+        You are a Senior Python Developer fixing a bug.
+        Task: {task['description']}
+        File: {task['file']}
+        Current Code:
+        ```
+        {existing_code}
+        ```
+        Errors: {error_context}
+
+        Requirement: Do NOT rewrite the whole file. Return ONLY the minimal edits as SEARCH/REPLACE blocks:
+        <<<<<<< SEARCH
+        (exact lines copied from the current code)
+        =======
+        (replacement lines)
+        >>>>>>> REPLACE
+        Use as many blocks as needed. Keep SEARCH sections short but unique.
+        """
+        try:
+            response_text = await llm_engine.generate(
+                prompt,
+                model=settings.MODEL_CODER_NAME,
+                config=no_tools_config(temperature=0.2),
+                agent="coder"
+            )
+            blocks = parse_search_replace(response_text)
+            patched = apply_search_replace(existing_code, blocks)
+        except PatchError as e:
+            print(f"⚠️ Patch did not apply ({e}). Falling back to full rewrite.")
+            return ""
+        except Exception as e:
+            print(f"⚠️ Patch request failed ({e}). Falling back to full rewrite.")
+            return ""
+
+        print(f"✅ Coder: Applied {len(blocks)} patch block(s) to {task['file']} "
+              f"({len(response_text)} chars instead of ~{len(existing_code)})")
+        file_tools.write_file(task['file'], patched)
+        return patched
+
+    async def _generate(self, prompt: str, model: str, config, filename: str, existing_code: str) -> str:
+        """Returns the extracted code (Streaming or One-shot)"""
+        if settings.CODER_STREAMING:
+            return await self._stream_to_file(prompt, model, config, filename, existing_code)
 
+        response_text = await llm_engine.generate(prompt, model=model, config=config, agent="coder")
         # Code Parsing Logic
-        if code and "```" in code:
-            parts = code.split("```")
-            if len(parts) > 1:
-                code = parts[1]
-                if code.startswith("python"): code = code[6:]
-                elif code.startswith("html"): code = code[4:]
-                elif code.startswith("css"): code = code[3:]
-                elif code.startswith("javascript"): code = code[10:]
-                elif code.startswith("js"): code = code[2:]
-                code = code.strip()
-            
-        return {"code_content": code}
\ No newline at end of file
+        return extract_code_block(response_text)
+
+    async def _stream_to_file(self, prompt: str, model: str, config, filename: str, existing_code: str) -> str:
+        """
+        🌊 Streaming Mode: Token တွေရောက်တာနဲ့ Code Fence ထဲကစာကို File ထဲ တန်းရေးမယ်။
+        Closing Fence တွေ့တာနဲ့ Generation ကို ရပ်ပြီး Debugger ဆီ ချက်ချင်းပို့မယ်။
+        """
+        fence = CodeFenceStream()
+        lines_written, next_report = 0, settings.CODER_STREAM_PROGRESS_LINES
+        out = file_tools.open_writer(filename)
+        try:
+            async with aclosing(llm_engine.generate_stream(prompt, model=model, config=config, agent="coder")) as stream:
+                async for chunk in stream:
+                    piece = fence.feed(chunk)
+                    if piece:
+                        out.write(piece)
+                        out.flush()
+                        lines_written += piece.count("\n")
+                        if lines_written >= next_report:
+                            next_report += settings.CODER_STREAM_PROGRESS_LINES
+                            await notifier.send_status(f"✍️ Coder: `{filename}` ... {lines_written} lines written")
+                    if fence.closed:
+                        print(f"✂️ Coder: Closing fence reached for {filename}. Stopping stream early.")
+                        break
+            out.write(fence.finish())
+        except BaseException:
+            # Stream ပြတ်သွားရင် File အဟောင်းကို ပြန်ထားမယ် (တစ်ဝက်တစ်ပျက် မကျန်အောင်)
+            out.close()
+            file_tools.write_file(filename, existing_code or "")
+            raise
+        finally:
+            out.close()
+
+        code = fence.result()
+        if not code:
+            file_tools.write_file(filename, existing_code or "")
+            raise Exception("Empty response (Possible Safety Filter)")
+        return code
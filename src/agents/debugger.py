@@ -2,6 +2,8 @@ from src.core.state import AgentState
 from src.core.llm import llm_engine
 from config.settings import settings
 from src.tools.files import file_tools
+from src.core.codeblock import extract_code_block
+from src.core.memo import node_memo
 from google.genai.types import GenerateContentConfig
 
 class DebuggerAgent:
@@ -30,7 +32,7 @@ class DebuggerAgent:
             }
 
         try:
-            compile(code, filename, 'exec')
+            self._compile(code, filename)
             # ✅ Success from Start (Gemini เขียนถูก)
             plan = state['plan']
             task['status'] = 'done'
@@ -52,8 +54,6 @@ class DebuggerAgent:
         # Budget Save ဖြစ်အောင် Google Gemini ကိုပဲ သုံးပါမယ်။
         
         try:
-            client = llm_engine.get_gemini_client()
-            
             prompt_fix = f"""
             You are a Senior Python Expert. Fix the following code.
             
@@ -69,25 +69,21 @@ class DebuggerAgent:
             - Do NOT explain. Just fix the syntax/logic error.
             """
             
-            # Gemini Call
-            response = client.models.generate_content(
+            # Gemini Call (Async Gateway)
+            # Cache မသုံးဘူး — Compile မစစ်ရသေးတဲ့ Fix ကို Cache ထဲထည့်မိရင် Fail တဲ့ Fix ကိုပဲ TTL တစ်လျှောက် ပြန်ရနေမယ်
+            fixed_code = await llm_engine.generate(
+                prompt_fix,
                 model=settings.MODEL_CODER, # Gemini 3 Flash
-                contents=prompt_fix,
-                config=GenerateContentConfig(temperature=0.2)
+                config=GenerateContentConfig(temperature=0.2),
+                agent="debugger",
+                cache=False
             )
             
-            fixed_code = response.text
-            
             # Cleaning Code
-            if "```" in fixed_code:
-                parts = fixed_code.split("```")
-                if len(parts) > 1:
-                    fixed_code = parts[1]
-                    if fixed_code.startswith("python"): fixed_code = fixed_code[6:]
-                    fixed_code = fixed_code.strip()
+            fixed_code = extract_code_block(fixed_code)
             
             # Syntax Check Again
-            compile(fixed_code, filename, 'exec')
+            self._compile(fixed_code, filename)
             
             # Save Fixed File
             file_tools.write_file(filename, fixed_code)
@@ -111,4 +107,13 @@ class DebuggerAgent:
             return {
                 "error_logs": f"Fix Failed: {str(gemini_err)}. \nOriginal: {initial_error}",
                 "logs": [f"❌ Debugger could not fix {filename}."] 
-            }
\ No newline at end of file
+            }
+
+    @staticmethod
+    def _compile(code: str, filename: str):
+        """Fix Loop ထဲမှာ မပြောင်းတဲ့ File တွေကို ပြန် compile မလုပ်ဘူး (Pass ခဲ့တာကိုပဲ မှတ်)"""
+        key = node_memo.key(filename, code)
+        if node_memo.get("compile", key):
+            return
+        compile(code, filename, 'exec')
+        node_memo.put("compile", key)
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import time
+import asyncio
 import requests
 import re
 from src.core.state import AgentState
@@ -7,11 +8,38 @@ from src.core.notifier import notifier
 from src.tools import git_tools, file_tools
 from src.runtime.docker_mgr import docker_mgr
 from src.core.llm import llm_engine 
+from src.core.tracing import tracer
 from config.settings import settings
 from google.genai.types import GenerateContentConfig
 
 class DeployerAgent:
     async def execute(self, state: AgentState):
+        launched = []   # ဒီ Run မှာ Start လုပ်ခဲ့တဲ့ Container (Mission Cancel ဆိုရင် တစ်ဝက်တစ်ပျက် မကျန်အောင် ရပ်မယ်)
+        starting = []   # Thread ထဲမှာ Run နေဆဲ start_container (Cancel ရင် ပြီးတဲ့အထိစောင့်ပြီးမှ Stop)
+        try:
+            return await self._deploy(state, launched, starting)
+        except asyncio.CancelledError:
+            await asyncio.gather(*starting, return_exceptions=True)
+            for name in launched:
+                result = await asyncio.to_thread(docker_mgr.stop_container, name)
+                print(f"🛑 Deployer: {result} (mission cancelled)")
+            raise
+
+    # --- Docker SDK Calls (Blocking) — asyncio.to_thread နဲ့ပဲ ခေါ်မယ် (Event Loop မပိတ်အောင်) ---
+    @staticmethod
+    def _remove_container(name: str):
+        try:
+            docker_mgr.client.containers.get(name).remove(force=True)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _read_logs(name: str):
+        """(container, logs) — Container မရှိရင် Docker Error တက်မယ်"""
+        container = docker_mgr.client.containers.get(name)
+        return container, container.logs().decode('utf-8')
+
+    async def _deploy(self, state: AgentState, launched: list, starting: list):
         logs = []
         final_url = "N/A"
         created_files = state.get('created_files', [])
@@ -22,7 +50,7 @@ class DeployerAgent:
         await notifier.send_status(f"🚀 Deployment Phase: Initializing...")
 
         # 1. Auto Git Push
-        git_res = git_tools.auto_push("Auto-update by Jarvis Agent")
+        git_res = await asyncio.to_thread(git_tools.auto_push, "Auto-update by Jarvis Agent")
         logs.append(f"Git: {git_res}")
         
         # 2. Identify Main File & Configuration
@@ -34,7 +62,7 @@ class DeployerAgent:
             best_match = None
             highest_score = 0
             
-            workspace_dir = "/app/workspace"
+            workspace_dir = settings.WORKSPACE_DIR
             
             # 🛑 IGNORE LIST: ဒီ Folder တွေထဲ လုံးဝဝင်မရှာဘူး
             ignore_dirs = [
@@ -111,7 +139,7 @@ class DeployerAgent:
                 command = f"uvicorn {app_module}:app --host 0.0.0.0 --port 8000"
 
             current_command = command
-            project_full_path = os.path.dirname(os.path.join("/app/workspace", main_file))
+            project_full_path = os.path.dirname(os.path.join(settings.WORKSPACE_DIR, main_file))
             deploy_res = "Init"
             
             # 3. Smart Deployment Loop
@@ -123,24 +151,30 @@ class DeployerAgent:
                     logs.append(f"🔄 Attempt {attempt+1}: {current_command}")
                     
                     # Kill Old
-                    try:
-                        old = docker_mgr.client.containers.get(subdomain)
-                        old.remove(force=True)
-                    except: pass
+                    await asyncio.to_thread(self._remove_container, subdomain)
 
-                    # Run
-                    deploy_res = docker_mgr.start_container(
+                    # Run (Cancel ဝင်လာရင် Thread ပြီးတဲ့အထိ execute() က စောင့်ပြီး Stop မယ်)
+                    if subdomain not in launched:
+                        launched.append(subdomain)
+                    start = asyncio.ensure_future(asyncio.to_thread(
+                        docker_mgr.start_container,
                         image=image,
                         name=subdomain,
                         port=port,
                         command=f"pip install -r requirements.txt && {current_command}",
                         env={"PORT": str(port)},
                         code_path=project_full_path
-                    )
+                    ))
+                    starting.append(start)
+                    deploy_res = await asyncio.shield(start)
+                    starting.remove(start)
 
-                    time.sleep(5) 
-                    container = docker_mgr.client.containers.get(subdomain)
-                    recent_logs = container.logs().decode('utf-8')
+                    # time.sleep မသုံးဘူး (Event Loop မပိတ်အောင် + Cancel ချက်ချင်းရောက်အောင်)
+                    with tracer.span("deploy.settle", "wait", seconds=5):
+                        await asyncio.sleep(5)
+                    with tracer.span("docker.logs", "docker", name=subdomain) as span:
+                        container, recent_logs = await asyncio.to_thread(self._read_logs, subdomain)
+                        span.set(log_chars=len(recent_logs))
                     
                     if "Error" in recent_logs or "Exception" in recent_logs or container.status != "running":
                         print(f"⚠️ Warning on Attempt {attempt+1}")
@@ -149,8 +183,6 @@ class DeployerAgent:
                         if attempt < 2: 
                             logs.append(f"⚠️ Error detected. Asking Gemini 2.5 Pro to fix command...")
                             
-                            client = llm_engine.get_gemini_client()
-                            
                             prompt = f"""
                             You are a DevOps Expert.
                             I tried to run a Python container but it failed.
@@ -167,13 +199,14 @@ class DeployerAgent:
                             """
                             
                             try:
-                                response = client.models.generate_content(
+                                response_text = await llm_engine.generate(
+                                    prompt,
                                     model=settings.MODEL_ARCHITECT, # 2.5 Pro
-                                    contents=prompt,
-                                    config=GenerateContentConfig(temperature=0.2)
+                                    config=GenerateContentConfig(temperature=0.2),
+                                    agent="deployer"
                                 )
                                 
-                                fixed_command = response.text.strip().replace("`", "")
+                                fixed_command = response_text.strip().replace("`", "")
                                 logs.append(f"💡 AI Fix: Switching to '{fixed_command}'")
                                 current_command = fixed_command 
                                 continue 
@@ -186,14 +219,13 @@ class DeployerAgent:
 
                 except Exception as e:
                     logs.append(f"❌ Exception: {e}")
-                    time.sleep(2)
+                    await asyncio.sleep(2)
 
             logs.append(str(deploy_res))
             
             # 📜 Container Log ယူပြီး Telegram ပို့မယ်
             try:
-                container = docker_mgr.client.containers.get(subdomain)
-                raw_logs = container.logs().decode('utf-8')
+                _, raw_logs = await asyncio.to_thread(self._read_logs, subdomain)
 
                 # Log ဖိုင်သိမ်း
                 log_file = f"workspace/{subdomain}_deploy.log"
@@ -202,7 +234,7 @@ class DeployerAgent:
                 
                 with open(log_file, "w") as f:
                     f.write(raw_logs)
-            except: 
+            except Exception:
                 pass
             
             # 🔥 Smart Health Check Logic
@@ -211,12 +243,12 @@ class DeployerAgent:
                 
                 # 🛑 Simple Script Bypass: Web Server မဟုတ်ရင် Health Check ကျော်မယ်
                 # Docker Log ထဲမှာ "Uvicorn running" (သို့) "Streamlit" မတွေ့ရင် Script (Bot) လို့ ယူဆမယ်
-                container = docker_mgr.client.containers.get(subdomain)
-                initial_logs = container.logs().decode('utf-8').lower()
+                container, initial_logs = await asyncio.to_thread(self._read_logs, subdomain)
+                initial_logs = initial_logs.lower()
                 
                 if not any(x in initial_logs for x in ["listening", "running on", "uvicorn", "streamlit", "http server"]):
                     # 🛑 Double Check: Web Server မဟုတ်ပေမယ့် Container က သေသွားပြီလား?
-                    container.reload()
+                    await asyncio.to_thread(container.reload)
                     if container.status != "running":
                         print(f"❌ {subdomain} crashed immediately.")
                         return {
@@ -247,45 +279,49 @@ class DeployerAgent:
 
                 container = None
                 try:
-                    container = docker_mgr.client.containers.get(subdomain)
-                except: pass
+                    container = await asyncio.to_thread(docker_mgr.client.containers.get, subdomain)
+                except Exception: pass
 
-                for i in range(max_retries):
-                    # 1. Check Crash
-                    if container:
-                        container.reload()
-                        if container.status != "running":
-                            logs.append("❌ Container died prematurely.")
-                            break
+                with tracer.span("deploy.health_check", "healthcheck", url=internal_url) as health:
+                    for i in range(max_retries):
+                        health.set(iterations=i + 1)
+                        # 1. Check Crash
+                        if container:
+                            await asyncio.to_thread(container.reload)
+                            if container.status != "running":
+                                logs.append("❌ Container died prematurely.")
+                                break
                     
-                    # 2. Check Logs (Install လုပ်နေတုန်းလား)
-                    try:
-                        current_logs = container.logs().decode('utf-8')[-500:].lower()
-                        if "installing" in current_logs or "downloading" in current_logs:
-                            print(f"⚙️ Installing dependencies... ({i}/{max_retries})")
-                            time.sleep(retry_interval)
-                            continue 
-                    except: pass
+                        # 2. Check Logs (Install လုပ်နေတုန်းလား)
+                        try:
+                            current_logs = (await asyncio.to_thread(container.logs)).decode('utf-8')[-500:].lower()
+                            if "installing" in current_logs or "downloading" in current_logs:
+                                print(f"⚙️ Installing dependencies... ({i}/{max_retries})")
+                                await asyncio.sleep(retry_interval)
+                                continue 
+                        except Exception: pass  # Bare except က CancelledError ကိုပါ မျိုသွားမယ်
+
+                        # 3. Active Ping
+                        try:
+                            print(f"⏳ Pinging App... ({i}/{max_retries})")
+                            response = await asyncio.to_thread(requests.get, internal_url, timeout=3)
+                            if response.status_code < 500:
+                                is_healthy = True
+                                logs.append(f"✅ App is responding! (Status: {response.status_code})")
+                                break
+                        except Exception:
+                            await asyncio.sleep(retry_interval)
+                    health.set(healthy=is_healthy)
+
 
-                    # 3. Active Ping
-                    try:
-                        print(f"⏳ Pinging App... ({i}/{max_retries})")
-                        response = requests.get(internal_url, timeout=3)
-                        if response.status_code < 500:
-                            is_healthy = True
-                            logs.append(f"✅ App is responding! (Status: {response.status_code})")
-                            break
-                    except Exception:
-                        time.sleep(retry_interval)
-                
                 if is_healthy:
                     final_url = f"https://{subdomain}.thukha.online"
                 else:
                     logs.append(f"❌ Smart Health Check Failed.")
                     try:
-                        crash_log = container.logs().decode('utf-8')[-2000:]
+                        crash_log = (await asyncio.to_thread(container.logs)).decode('utf-8')[-2000:]
                         return {"error_logs": crash_log, "logs": logs}
-                    except:
+                    except Exception:
                         return {"error_logs": "Unknown Error", "logs": logs}
             else:
                 final_url = "⚠️ Docker Start Failed"
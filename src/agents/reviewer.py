@@ -10,7 +10,7 @@ class ReviewerAgent:
         Code Quality & Security Check (Batch Mode)
         API Call သက်သာအောင် ဖိုင်အားလုံးပေါင်းပြီး တစ်ခါတည်းစစ်မယ်
         """
-        logs = state.get('logs', [])
+        logs = []   # ဒီ Node ရဲ့ Log အသစ်တွေပဲ ပြန်ပို့မယ် (Reducer က ပေါင်းပေးမယ်)
         # Architect/Coder ဖန်တီးခဲ့တဲ့ ဖိုင်စာရင်းကို ယူမယ်
         created_files = state.get('created_files', [])
         
@@ -58,15 +58,15 @@ class ReviewerAgent:
 
         try:
             # Reviewer အတွက် Claude (OpenRouter) ကိုသုံးမယ်
-            client = llm_engine.get_openrouter_client()
-            response = await client.chat.completions.create(
+            content = await llm_engine.generate(
+                [{"role": "user", "content": prompt}],
                 model=settings.MODEL_ARCHITECT, # Architect Model (Sonnet) is best for reviewing
-                messages=[{"role": "user", "content": prompt}],
+                provider="openrouter",
+                agent="reviewer",
                 response_format={"type": "json_object"}
             )
             
             # JSON result ကို ခွဲထုတ်မယ်
-            content = response.choices[0].message.content
             result = json.loads(content)
             
             status = result.get("status", "UNKNOWN")
@@ -1,8 +1,10 @@
 from src.core.state import AgentState
+from src.core.plan_graph import ready_tasks, dependents_of, files_mentioned
+from config.settings import settings
 
 class TechLeadAgent:
     async def execute(self, state: AgentState):
-        plan = state['plan']
+        plan = [dict(t) for t in state['plan']]
         error_logs = state.get('error_logs', "")
         retry_count = state.get('retry_count', 0)
 
@@ -10,48 +12,75 @@ class TechLeadAgent:
         if error_logs:
             if retry_count < 3:
                 print(f"🔄 Self-Healing Triggered! (Attempt {retry_count+1}/3)")
-                
-                # Error ကိုပြင်ဖို့ Task အသစ်လုပ်မယ် (ပိုတိကျတဲ့ Task ပေးမယ်)
-                fix_task = {
-                    "file": "error_fix_strategy.md", 
-                    "description": f"CRITICAL: The previous deployment failed. Analyze logs, adjust code/requirements, and RETRY. ERROR: {error_logs}",
-                    "status": "pending"
-                }
-                
-                plan.insert(0, fix_task)
-                
+
+                # 🎯 Error ထဲမှာ ပါတဲ့ ဖိုင် + အဲ့ဖိုင်ကို မှီခိုနေတဲ့ Dependent တွေကိုပဲ ပြန်ရေးမယ်
+                failing = files_mentioned(plan, error_logs)
+                if failing:
+                    affected = set(failing) | dependents_of(plan, failing)
+                    for task in plan:
+                        if task['file'] in affected:
+                            task['status'] = 'pending'
+                        if task['file'] in failing:
+                            task['fix_hint'] = error_logs[-3000:]
+                    log = f"⚠️ Error Detected in {', '.join(failing)}. Regenerating {len(affected)} file(s) (Attempt {retry_count+1})..."
+                else:
+                    # Error ကိုပြင်ဖို့ Task အသစ်လုပ်မယ် (ပိုတိကျတဲ့ Task ပေးမယ်)
+                    fix_task = {
+                        "file": "error_fix_strategy.md",
+                        "description": f"CRITICAL: The previous deployment failed. Analyze logs, adjust code/requirements, and RETRY. ERROR: {error_logs}",
+                        "status": "pending",
+                        "depends_on": []
+                    }
+
+                    plan = [t for t in plan if t['file'] != fix_task['file']]
+                    plan.insert(0, fix_task)
+                    log = f"⚠️ Error Detected. Adding fix task (Attempt {retry_count+1})..."
+                batch = self._next_batch(plan)
+
+                # retry_count ကို ဒီမှာ မ Reset ဘူး (Tester Pass မှသာ Reset - Infinite Loop မဖြစ်အောင်)
                 return {
-                    "current_task": None,
+                    "current_task": batch[0] if batch else None,
+                    "active_tasks": batch,
                     "plan": plan,
                     "retry_count": retry_count + 1,
                     "error_logs": "",
-                    "logs": [f"⚠️ Error Detected. Adding fix task (Attempt {retry_count+1})..."]
+                    "logs": [log]
                 }
-            
+
             else:
                 # 🛑 Circuit Breaker: ၃ ခါကြိုးစားလို့မရရင် "လက်မြှောက်" မယ့် Logic
                 print("🛑 Max Retries Reached. Stopping Loop.")
                 error_msg = f"💥 Critical Failure: Tried to fix 3 times but failed. STOPPING to prevent infinite loop.\nLast Error: {error_logs[:500]}..."
-                
+
                 return {
                     "current_task": None,
-                    "plan": [], 
+                    "active_tasks": [],
+                    "plan": [],
                     "final_report": error_msg, # 🔥 Signal ပေးလိုက်ပြီ
                     "logs": [error_msg]
                 }
-        # ပြီးပြီးသားမဟုတ်တဲ့ Task တစ်ခုကို ယူမယ်
-        next_task = next((t for t in plan if t['status'] == 'pending'), None)
-        
-        if next_task:
-            next_task['status'] = 'coding'
-            # Plan ထဲမှာ Status လိုက်ပြောင်းမယ်
-            updated_plan = [t if t['file'] != next_task['file'] else next_task for t in plan]
+
+        # ပြီးပြီးသားမဟုတ်တဲ့ Task တွေကို Batch လိုက်ယူမယ် (Parallel Fan-out)
+        batch = self._next_batch(plan)
+
+        if batch:
             return {
-                "current_task": next_task,
-                "plan": updated_plan,
+                "current_task": batch[0],
+                "active_tasks": batch,
+                "plan": plan,
                 "retry_count": 0,
                 "error_logs": "",
-                "logs": [f"👉 Assigning Task: {next_task['file']}"]
+                "logs": [f"👉 Assigning Tasks ({len(batch)} in parallel): {', '.join(t['file'] for t in batch)}"]
             }
         else:
-            return {"current_task": None}
\ No newline at end of file
+            return {"current_task": None, "active_tasks": []}
+
+    def _next_batch(self, plan: list) -> list:
+        """
+        Dependency ပြည့်ပြီးသား Ready Task တွေကို Critical Path ရှည်တာ ဦးစားပေးပြီး
+        MAX_PARALLEL_TASKS အထိ ယူမယ် (Topological Wave)။ 'coding' လို့ in-place မှတ်မယ်။
+        """
+        batch = ready_tasks(plan)[:settings.MAX_PARALLEL_TASKS]
+        for task in batch:
+            task['status'] = 'coding'
+        return batch
@@ -1,25 +1,25 @@
 import os
 import subprocess
-import time
 import asyncio
 import signal
-import psutil
 from src.core.state import AgentState
 from src.core.llm import llm_engine
 from src.core.notifier import notifier
 from config.settings import settings
 from src.tools.files import file_tools
+from src.core.tracing import tracer
+from src.core.memo import node_memo
 
 class TesterAgent:
     def __init__(self):
         # VPS RAM 2GB ဖြစ်တဲ့အတွက် Test Run တိုင်းမှာ Venv အသစ်မဆောက်ဘဲ
         # Project တစ်ခုလုံးအတွက် Shared Venv တစ်ခုကိုပဲ ပြန်သုံးပါမယ် (Speed + Storage Save)
-        self.venv_dir = "/app/workspace/test_env"
+        self.venv_dir = os.path.join(settings.WORKSPACE_DIR, "test_env")
         self.python_exec = os.path.join(self.venv_dir, "bin", "python")
         self.pip_exec = os.path.join(self.venv_dir, "bin", "pip")
 
     async def execute(self, state: AgentState):
-        logs = state.get('logs', [])
+        logs = []   # ဒီ Node ရဲ့ Log အသစ်တွေပဲ ပြန်ပို့မယ် (Reducer က ပေါင်းပေးမယ်)
         created_files = state.get('created_files', [])
         
         # Main File ရှာမယ်
@@ -35,42 +35,49 @@ class TesterAgent:
 
         # Environment ပြင်ဆင်ခြင်း
         if not os.path.exists(self.python_exec):
-            subprocess.run(["python", "-m", "venv", self.venv_dir], check=True)
+            with tracer.span("venv create", "subprocess"):
+                subprocess.run(["python", "-m", "venv", self.venv_dir], check=True)
 
-        # Requirements သွင်းခြင်း
-        project_dir = os.path.dirname(os.path.join("/app/workspace", main_file))
+        # Venv ပြန်ဆောက်ရင် (python ပြောင်းရင်) Memo အဟောင်းတွေ မကိုက်တော့အောင်
+        venv_stamp = os.path.getmtime(self.python_exec) if os.path.exists(self.python_exec) else 0
+        project_dir = os.path.dirname(os.path.join(settings.WORKSPACE_DIR, main_file))
         req_path = os.path.join(project_dir, "requirements.txt")
-        
-        if os.path.exists(req_path):
-            install_res = subprocess.run([self.pip_exec, "install", "-r", req_path], capture_output=True, text=True)
-            if install_res.returncode != 0:
+
+        # ♻️ Project File တွေ + requirements.txt + Command မပြောင်းရင် အရင် Pass ခဲ့တဲ့ ရလဒ်ကို ပြန်သုံးမယ်
+        command = [self.python_exec, os.path.join(settings.WORKSPACE_DIR, main_file)]
+        run_key = node_memo.key(main_file, venv_stamp, *command, node_memo.digest_tree(project_dir))
+        cached = node_memo.get("test_run", run_key)
+        if cached:
+            print(f"♻️ Tester: `{main_file}` inputs unchanged since last pass. Skipping run.")
+            await notifier.send_status(f"✅ Test Passed for `{main_file}` (unchanged, cached)")
+            return {"error_logs": "", "logs": logs + [cached]}
+
+        # Requirements သွင်းခြင်း (requirements.txt မပြောင်းရင် ပြန်မသွင်းဘူး)
+        req_key = node_memo.key(self.pip_exec, venv_stamp, node_memo.digest_file(req_path))
+        if os.path.exists(req_path) and node_memo.get("pip_install", req_key):
+            print(f"♻️ Tester: `{req_path}` unchanged. Skipping pip install.")
+        elif os.path.exists(req_path):
+            with tracer.span("pip install", "subprocess", requirements=req_path) as span:
+                returncode, _, install_err = await self._run([self.pip_exec, "install", "-r", req_path])
+                span.set(returncode=returncode, stderr_chars=len(install_err))
+            if returncode != 0:
                 # ❌ Fail ဖြစ်ရင် Log ပို့မယ်
                 await notifier.send_status(f"❌ Dependency Error in `{req_path}`")
-                return {"error_logs": install_res.stderr, "logs": logs}
+                return {"error_logs": install_err, "logs": logs}
+            node_memo.put("pip_install", req_key)
         
         # Test Run လုပ်ခြင်း
-        full_path = os.path.join("/app/workspace", main_file)
+        full_path = command[1]
         
         # Log စာသား စုစည်းမယ်
         log_content = f"--- TEST REPORT FOR {main_file} ---\n"
 
         try:
-            process = subprocess.Popen(
-                [self.python_exec, full_path],
-                cwd=os.path.dirname(full_path),
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                text=True, preexec_fn=os.setsid
-            )
-
-            stdout, stderr = "", ""
-            return_code = 0
-            
-            try:
-                stdout, stderr = process.communicate(timeout=10)
-                return_code = process.returncode
-            except subprocess.TimeoutExpired:
-                os.killpg(os.getpgid(process.pid), signal.SIGTERM)
-                stdout = "Service is running successfully (Timeout reached)."
+            with tracer.span("test run", "subprocess", file=main_file) as span:
+                return_code, stdout, stderr = await self._run(command, cwd=os.path.dirname(full_path), timeout=10)
+                if return_code is None:
+                    return_code, stdout, stderr = 0, "Service is running successfully (Timeout reached).", ""
+                span.set(returncode=return_code, stdout_chars=len(stdout or ""), stderr_chars=len(stderr or ""))
             
             # Logs တွေကို ပေါင်းမယ်
             log_content += f"\n[STDOUT]:\n{stdout}\n\n[STDERR]:\n{stderr}\n\n[EXIT CODE]: {return_code}\n"
@@ -93,18 +100,52 @@ class TesterAgent:
             else:
                 # ✅ Pass -> Telegram ပို့
                 await notifier.send_status(f"✅ Test Passed for `{main_file}`!")
+                node_memo.put("test_run", run_key, "✅ Tester Passed")
                 return {"error_logs": "", "logs": logs + ["✅ Tester Passed"]}
 
         except Exception as e:
             return {"error_logs": str(e), "logs": logs}
 
+    @staticmethod
+    async def _run(command: list, cwd: str = None, timeout: float = None):
+        """
+        Subprocess ကို Process Group သီးသန့်နဲ့ Async Run မယ် (Event Loop ကို မပိတ်ဘူး)
+        - Timeout ဆိုရင် Group တစ်ခုလုံးကို SIGTERM ပြီး returncode None
+        - Mission Cancel ဆိုရင် Group တစ်ခုလုံးကို SIGKILL ပြီး CancelledError ဆက်ပစ်မယ် (App Child Process တွေ မကျန်အောင်)
+        """
+        process = await asyncio.create_subprocess_exec(
+            *command, cwd=cwd,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+
+        def kill_group(sig):
+            try:
+                os.killpg(process.pid, sig)
+            except ProcessLookupError:
+                pass
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            kill_group(signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), 5)
+            except asyncio.TimeoutError:
+                kill_group(signal.SIGKILL)
+            return None, "", ""
+        except asyncio.CancelledError:
+            kill_group(signal.SIGKILL)
+            await process.wait()
+            print(f"🛑 Tester: killed process group {process.pid} ({os.path.basename(command[-1])})")
+            raise
+        return process.returncode, stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+
     async def _analyze_error(self, error_log: str, filename: str) -> str:
         """
         Gemini 3 Flash ကိုသုံးပြီး Error က Syntax ကြောင့်လား၊ Environment ကြောင့်လား ခွဲမယ်
         """
         try:
-            client = llm_engine.get_gemini_client() # Flash Model (Fast & Cheap)
-            
             prompt = f"""
             You are a QA Engineer. Analyze this Python error log from '{filename}'.
             
@@ -119,11 +160,12 @@ class TesterAgent:
             Output a 1-sentence actionable fix for the Developer.
             """
             
-            response = client.models.generate_content(
-                model=settings.MODEL_CODER, # Gemini 3 Flash
-                contents=prompt
+            response_text = await llm_engine.generate(
+                prompt,
+                model=settings.MODEL_CODER, # Gemini 3 Flash (Fast & Cheap)
+                agent="tester"
             )
-            return response.text.strip()
+            return response_text.strip()
             
         except Exception:
             return "Unknown error (AI Analysis Failed)"
\ No newline at end of file
@@ -1,63 +1,209 @@
+import asyncio
+import time
 import traceback
 import os
-import glob
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import END
 from src.core.workflow import workflow
 from src.core.state import AgentState
+from src.core.missions import Mission, MissionExecutor
+from src.core.events import mission_events
+from src.core.tracing import tracer
+from src.core.intent import intent_classifier
+from src.core.speculation import speculative_architect
+from src.core.llm import llm_engine
+from src.core.notifier import notifier
+from src.memory.checkpoint_retention import CheckpointRetention
+from src.memory.checkpointer import open_checkpointer, close_checkpointer
+from config.settings import settings
 
 class SeniorEngineerBrain:
     def __init__(self):
         print("🧠 Jarvis Hybrid Brain Initialized (Async Memory)")
         # 🔥 Agent စတာနဲ့ Memory Size ကို အရင်စစ်မယ်
+        self.retention = CheckpointRetention()
         self._manage_memory_health()
+        # 🏭 Mission Queue (Concurrent + Per-user Fairness + CHAT/DEPLOY Fast Lane)
+        fast_workers = settings.MISSION_FAST_WORKERS if settings.MISSION_FAST_LANE else 0
+        self.executor = MissionExecutor(self._run_mission, workers=settings.MISSION_WORKERS, fast_workers=fast_workers)
+        # 💾 Process တစ်ခုလုံး Checkpointer တစ်ခု + Compile ပြီးသား Graph တစ်ခု (start() မှာ ဖွင့်မယ်)
+        self.checkpointer = None
+        self.app = None
+        self._start_lock = asyncio.Lock()
+        self._background = set()
+
+    async def start(self):
+        """FastAPI Lifespan ကနေ တစ်ခါပဲ ခေါ်မယ် (Saver ဖွင့် + Graph Compile)"""
+        async with self._start_lock:
+            if self.app is not None:
+                return
+            self.checkpointer = await open_checkpointer(settings.CHECKPOINT_DB_PATH)
+            self.app = workflow.compile(checkpointer=self.checkpointer)
+            print("💾 Checkpointer opened (WAL, long-lived) & workflow compiled.")
+
+    async def close(self):
+        await self.executor.stop()
+        await close_checkpointer(self.checkpointer)
+        self.checkpointer = None
+        self.app = None
 
     def _manage_memory_health(self):
         """
-        🔥 AUTO-CLEANUP: Database ဖောင်းပွလာရင် အသစ်လဲမယ့် စနစ်
-        RAM 2GB VPS မှာ SQLite က 500MB ကျော်ရင် Query လေးပြီး Hang တတ်လို့
-        Warning ပေးမယ်၊ အရမ်းများမှ ဖျက်မယ်။
+        🔥 Checkpoint DB ကို Wipe မလုပ်တော့ဘဲ Retention Engine နဲ့ အမြဲ Size ထိန်းမယ်
+        (Thread တစ်ခုချင်း နောက်ဆုံး N ခု + ပြီးဆုံးသွားတဲ့ Mission တွေကို TTL နဲ့ + Incremental VACUUM)
+        Background Loop ကို main.py Lifespan က run_forever() နဲ့ စမယ်။
         """
         # Workspace Folder မရှိရင် အရင်ဆောက်မယ်
         os.makedirs("workspace", exist_ok=True)
-        
-        db_path = "workspace/checkpoints.sqlite"
-        
-        # Warning Limit (သတိပေးရုံ)
-        soft_limit_mb = 500
-        # Hard Limit (ဖျက်မယ့်အဆင့် - VPS မကွဲအောင်)
-        hard_limit_mb = 900 
-        
+
         try:
-            if os.path.exists(db_path):
-                size_mb = os.path.getsize(db_path) / (1024 * 1024)
-                
-                if size_mb > hard_limit_mb:
-                    print(f"🚨 CRITICAL MEMORY ({size_mb:.2f}MB). Wiping database to save VPS...")
-                    # Database Related File တွေကို (.wal, .shm အပါအဝင်) အကုန်ရှင်းမယ်
-                    for f in glob.glob("workspace/checkpoints.sqlite*"):
-                        try:
-                            os.remove(f)
-                            print(f"🗑️ Deleted old memory: {f}")
-                        except Exception as e:
-                            print(f"⚠️ Failed to delete {f}: {e}")
-                        
-                elif size_mb > soft_limit_mb:
-                    print(f"⚠️ Memory Warning: Database is huge ({size_mb:.2f}MB). Consider manual reset.")
-                else:
-                    print(f"✅ Memory Health Good: {size_mb:.2f}MB")
+            self.retention.prepare()
         except Exception as e:
             print(f"⚠️ Memory Check Error: {e}")
 
-    async def think_and_reply(self, user_input: str) -> str:
+    async def think_and_reply(self, user_input: str, user_id: str = "default") -> str:
+        """
+        Main Entry Point: Receives User Input -> Queues Mission -> Returns Report
+        Mission တိုင်း သီးသန့် Thread ID နဲ့ Run မယ် (Checkpoint မရောအောင်)
+        """
+        mission = await self.submit(user_input, user_id)
+        return await mission.future
+
+    async def submit(self, user_input: str, user_id: str = "default") -> Mission:
+        """Mission ကို Queue ထဲထည့်ပြီး ချက်ချင်းပြန်မယ် (Job API: POST /missions)"""
+        mission = await self.executor.submit(user_id, user_input, lane=intent_classifier.lane(user_input))
+        mission_events.open(mission.id)
+        if mission.status == "queued":
+            mission_events.publish(mission.id, "status", status="queued", lane=mission.lane,
+                                   position=self.executor.position(mission.id))
+        # Restart ဖြစ်သွားရင်တောင် Queue ထဲက Mission မပျောက်အောင် Registry မှာ မှတ်မယ်
+        await self.retention.record(mission.id, "queued", user_id=user_id, mission=user_input)
+        return mission
+
+    async def cancel(self, mission_id: str, reason: str = "cancelled by user") -> bool:
+        """🛑 Queue ထဲက Mission ကို ဖယ် / Run နေတဲ့ Mission ကို ဖြတ်မယ် (POST /missions/{id}/cancel, Telegram /cancel)"""
+        mission = self.executor.missions.get(mission_id)
+        was_queued = mission is not None and mission.status == "queued"
+        if not self.executor.cancel(mission_id, reason):
+            return False
+        if was_queued:
+            # Run နေတဲ့ Mission ဆိုရင် _run_mission ကိုယ်တိုင် မှတ်မယ်
+            await self.retention.record(mission_id, "cancelled")
+            mission_events.publish(mission_id, "end", status="cancelled", report=mission.result)
+        print(f"🛑 Cancel requested for {mission_id} ({reason})")
+        return True
+
+    async def cancel_user(self, user_id: str, reason: str = "cancelled by user") -> list:
+        """User တစ်ယောက်ရဲ့ မပြီးသေးတဲ့ Mission အားလုံး"""
+        cancelled = []
+        for mission in self.executor.active(user_id):
+            if await self.cancel(mission.id, reason):
+                cancelled.append(mission.id)
+        return cancelled
+
+    async def _checkpoint_cancelled(self, config: dict):
+        """
+        Pending Node တွေကို ရှင်းပြီး Graph ကို END ရောက်ပြီးသား Checkpoint အဖြစ် မှတ်မယ်
+        (Restart ပြီးရင် Resume က Cancel ထားတာကို ပြန်မ Run အောင်)
+        """
+        try:
+            snapshot = await self.app.aget_state(config)
+            if snapshot.values and snapshot.next:
+                await self.app.aupdate_state(config, None, as_node=END)
+        except Exception as e:
+            print(f"⚠️ Cancel Checkpoint Error: {e}")
+
+    async def resume_unfinished(self) -> list:
+        """
+        ♻️ Startup Pass: Container Restart ကြောင့် မပြီးလိုက်တဲ့ Mission တွေကို ပြန်စမယ်
+        - Checkpoint ရှိရင် နောက်ဆုံးပြီးခဲ့တဲ့ Node ကနေ ဆက်မယ် (ပြီးပြီးသား Node/Writes တွေကို ပြန်မ Run)
+        - Checkpoint မရှိသေးရင် (Queue ထဲမှာပဲ ရှိခဲ့ရင်) အစကနေ Run မယ်
+        """
+        if not settings.MISSION_RESUME:
+            return []
+        if self.app is None:
+            await self.start()
+
+        resumed = []
+        max_age = settings.MISSION_RESUME_MAX_AGE_HOURS * 3600
+        for record in await self.retention.unfinished():
+            mission_id = record["id"]
+            if time.time() - (record["updated_at"] or 0) > max_age:
+                print(f"⏭️ Skipping stale mission {mission_id} (unfinished for too long).")
+                await self.retention.record(mission_id, "failed")
+                continue
+
+            snapshot = await self.app.aget_state({"configurable": {"thread_id": mission_id}})
+            if snapshot.values and not snapshot.next:
+                # Graph ပြီးသွားပြီ၊ Status မှတ်ခွင့်မရလိုက်တာ
+                await self.retention.record(mission_id, "done")
+                continue
+
+            resume = bool(snapshot.values)
+            mission = await self.executor.submit(
+                record["user_id"] or "default", record["mission"] or "", mission_id=mission_id, resume=resume,
+                lane=intent_classifier.lane(record["mission"] or "")
+            )
+            mission_events.open(mission.id)
+            mission_events.publish(mission.id, "status", status="queued", resumed=resume)
+            resumed.append(mission.id)
+
+            where = f"from {', '.join(snapshot.next)}" if resume else "from the start"
+            print(f"♻️ Resuming mission {mission_id} {where}")
+            await notifier.send_status(f"♻️ Resuming after restart ({where}): {(record['mission'] or '')[:100]}")
+            # Restart မတိုင်ခင် စောင့်နေတဲ့ Chat မရှိတော့လို့ ရလဒ်ကို Notifier နဲ့ ပို့မယ်
+            task = asyncio.create_task(self._report_resumed(mission))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return resumed
+
+    async def _report_resumed(self, mission: Mission):
+        result = await mission.future
+        await notifier.send_status(f"♻️ Resumed mission finished:\n{result[:3500]}")
+
+    async def _stream_graph(self, mission: Mission, graph_input, config: dict) -> dict:
         """
-        Main Entry Point: Receives User Input -> Runs Graph -> Returns Report
+        Graph ကို astream(updates) နဲ့ Run ပြီး Node ပြီးတိုင်း Event Bus ကို ပို့မယ်
+        (Node Transition + အဲ့ Node က ထည့်လိုက်တဲ့ Log အသစ်တွေ)
         """
+        async for chunk in self.app.astream(graph_input, config=config, stream_mode="updates"):
+            for node, update in chunk.items():
+                update = update if isinstance(update, dict) else {}
+                new_logs = update.get("logs") or []
+                mission_events.publish(mission.id, "node", node=node, logs=new_logs)
+                if new_logs:
+                    # State ထဲမှာ နောက်ဆုံး N ခုပဲ ကျန်လို့ Log အပြည့်အစုံကို File ထဲ Append လုပ်မယ်
+                    await asyncio.to_thread(self._append_mission_log, mission.id, node, new_logs)
+        snapshot = await self.app.aget_state(config)
+        return snapshot.values
+
+    @staticmethod
+    def mission_log_path(mission_id: str) -> str:
+        return os.path.join(settings.MISSION_LOG_DIR, f"{mission_id}.log")
+
+    def _append_mission_log(self, mission_id: str, node: str, entries: list):
+        try:
+            os.makedirs(settings.MISSION_LOG_DIR, exist_ok=True)
+            with open(self.mission_log_path(mission_id), "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(f"[{node}] {entry}\n")
+        except Exception as e:
+            print(f"⚠️ Mission Log Error: {e}")
+
+    async def _run_mission(self, mission: Mission) -> str:
+        """Mission Executor Worker ကနေ ခေါ်မယ့် Graph Runner"""
+        user_input = mission.text
+        # Thread ID သတ်မှတ်မယ် (Mission တစ်ခု = Thread တစ်ခု)
+        config = {"configurable": {"thread_id": mission.id}}
+        tracer.start_mission(mission.id)
+        llm_engine.cassette.start(mission.id, user_input)
         try:
             # 1. State အသစ် စဆောက်မယ်
             initial_state: AgentState = {
                 "mission": user_input,
                 "plan": [],
                 "current_task": None,
+                "active_tasks": [],
+                "task_results": [],
                 "code_content": "",
                 "error_logs": "",
                 "retry_count": 0,
@@ -68,27 +214,61 @@ class SeniorEngineerBrain:
                 "logs": []
             }
 
-            print(f"🚀 Starting Mission: {user_input}")
+            print(f"{'♻️ Resuming' if mission.resume else '🚀 Starting'} Mission [{mission.id}]: {user_input}")
+            mission_events.open(mission.id)
+            mission_events.publish(mission.id, "status", status="running")
+            await self.retention.record(mission.id, "running", user_id=mission.user_id, mission=user_input)
+            
+            # 🔥 Lifespan မှာ ဖွင့်ထားပြီးသား Saver + Compiled Graph ကို ပြန်သုံးမယ်
+            if self.app is None:
+                await self.start()
+
+            
+            # Run မယ် (Async, Node ပြီးတိုင်း Progress Event ပို့မယ်)
+            # Resume ဆိုရင် Input None = နောက်ဆုံး Checkpoint ကနေ ဆက် Run
+            graph_input = None if mission.resume else initial_state
+            final_state = await self._stream_graph(mission, graph_input, config)
             
-            # 🔥 Async Database Connection
-            async with AsyncSqliteSaver.from_conn_string("workspace/checkpoints.sqlite") as checkpointer:
-                
-                # Workflow ကို Memory နဲ့ ပေါင်းပြီး App (Executable) ဖန်တီးမယ်
-                app = workflow.compile(checkpointer=checkpointer)
-                
-                # Thread ID သတ်မှတ်မယ် (Memory အတွက် မရှိမဖြစ်)
-                config = {"configurable": {"thread_id": "ironman-master-session"}}
-                
-                # Run မယ် (Async)
-                final_state = await app.ainvoke(initial_state, config=config)
-                
-                # Report ပြန်ထုတ်မယ်
-                report = final_state.get("final_report", "Mission Completed.")
-                logs = "\n".join(final_state.get("logs", [])[-10:]) # Last 10 logs
-                
-                return f"{report}\n\n📋 **Logs:**\n{logs}"
+            # Report ပြန်ထုတ်မယ်
+            report = final_state.get("final_report", "Mission Completed.")
+            logs = "\n".join(final_state.get("logs", [])[-10:]) # Last 10 logs
+            await self.retention.record(mission.id, "done")
+            mission_events.publish(mission.id, "end", status="done", report=report)
+            
+            return f"{report}\n\n📋 **Logs:**\n{logs}"
 
+        except asyncio.CancelledError:
+            # 🛑 LLM Request / Subprocess / Container တွေကို Agent တွေက ကိုယ်တိုင်ရှင်းပြီးပြီ၊ State ကိုပဲ မှတ်မယ်
+            if mission.cancel_reason is None:
+                raise       # Shutdown — Registry မှာ running အတိုင်းထားမှ Restart ပြီး Resume ဖြစ်မယ်
+            print(f"🛑 Mission [{mission.id}] cancelled: {mission.cancel_reason}")
+            if self.app is not None:
+                await self._checkpoint_cancelled(config)
+            await self.retention.record(mission.id, "cancelled")
+            mission_events.publish(mission.id, "end", status="cancelled", report=f"🛑 Mission Cancelled ({mission.cancel_reason})")
+            await notifier.send_status(f"🛑 Mission cancelled: {user_input[:100]}")
+            raise
         except Exception as e:
             error_msg = f"💥 Critical Brain Failure: {str(e)}\n{traceback.format_exc()}"
             print(error_msg)
-            return error_msg
\ No newline at end of file
+            mission.status = "failed"
+            await self.retention.record(mission.id, "failed")
+            mission_events.publish(mission.id, "end", status="failed", report=f"💥 Critical Brain Failure: {e}")
+            return error_msg
+        finally:
+            # Cancel / Fail ဖြစ်လို့ architect_node မရောက်လိုက်ရင် Speculative Architect (LLM Quota) ကို ရပ်မယ်
+            speculative_architect.discard(mission.id)
+            notifier.end_mission(mission.id)
+            await self._save_trace(mission.id)
+
+    async def _save_trace(self, mission_id: str):
+        """🔍 Mission ပြီးတာနဲ့ Trace File ထုတ်ပြီး Critical Path ကို Console မှာ တစ်ကြောင်းပြမယ်"""
+        if not tracer.enabled:
+            return
+        try:
+            path = await asyncio.to_thread(tracer.save, mission_id)
+            summary = tracer.summary(mission_id) or {}
+            path_text = " → ".join(f"{n['node']}({n['ms']:.0f}ms)" for n in summary.get("critical_path", []))
+            print(f"🔍 Trace [{mission_id}] wall={summary.get('wall_ms', 0):.0f}ms | {path_text} | {path}")
+        except Exception as e:
+            print(f"⚠️ Trace Save Error: {e}")
@@ -0,0 +1,215 @@
+"""
+LLM Cassettes (Record / Replay)
+Outbound LLM Traffic (Gemini generate / stream / embed, OpenRouter) တိုင်းကို Request + Response + Timing နဲ့ JSONL ထဲ မှတ်မယ်။
+Replay Mode မှာ Network မခေါ်ဘဲ မှတ်ထားတာကို ပြန်ပေးမယ် (Recorded Latency အတိုင်း / latency_scale နဲ့ ချုံ့ / 0)
+- Production Mission ကို Offline မှာ ပြန် Run ပြီး Orchestrator ကို Profile လုပ်ဖို့
+- နှေးခဲ့တဲ့ Mission ကို (429/503 Error တွေ၊ Stream Chunk Timing တွေပါ) တိတိကျကျ ပြန်ဖြစ်အောင်လုပ်ဖို့
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from src.core.llm_cache import LLMCache
+from src.core.missions import current_mission_id
+from config.settings import settings
+
+MODES = ("off", "record", "replay")
+
+
+class CassetteMiss(Exception):
+    """Replay Mode မှာ ကိုက်ညီတဲ့ Recording မရှိရင်"""
+
+
+class ReplayedError(Exception):
+    """Record တုန်းက တက်ခဲ့တဲ့ Error ကို Message အတိုင်း ပြန်ပစ်မယ် (Retry / Backup Logic တွေ အတူတူဖြစ်အောင်)"""
+
+
+class LLMCassette:
+    """
+    - record(): Mission တစ်ခု = Cassette File တစ်ခု (CASSETTE_DIR/<mission_id>.jsonl)
+    - replay(): Prompt Hash တူတာကို အရင်ရှာ၊ မတွေ့ရင် (Strict မဟုတ်ရင်) Agent တူတဲ့ နောက် Recording ကို အစဉ်လိုက်ပေးမယ်
+      (Workspace Structure / Temp Path ပြောင်းလို့ Prompt နည်းနည်းကွဲလည်း Replay ဆက်ရအောင်)
+    """
+
+    def __init__(self, mode: str = None, root: str = None, source: str = None,
+                 latency_scale: float = None, strict: bool = None):
+        self.mode = (mode or settings.LLM_CASSETTE_MODE).lower()
+        if self.mode not in MODES:
+            print(f"⚠️ Unknown LLM_CASSETTE_MODE '{self.mode}'. Cassettes disabled.")
+            self.mode = "off"
+        self.root = root or settings.LLM_CASSETTE_DIR
+        self.source = source or settings.LLM_CASSETTE_REPLAY_PATH or self.root
+        self.latency_scale = settings.LLM_CASSETTE_LATENCY_SCALE if latency_scale is None else latency_scale
+        self.strict = settings.LLM_CASSETTE_STRICT if strict is None else strict
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._seq = Counter()
+        self._by_key = defaultdict(deque)
+        self._by_agent = defaultdict(deque)
+        self._loaded = False
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def request_key(kind: str, provider: str, model: str, contents, config=None, extra: dict = None) -> str:
+        return LLMCache.make_key(f"{kind}:{provider}", model, contents, config, extra)
+
+    @staticmethod
+    def request_body(contents, config=None, extra: dict = None) -> dict:
+        if config is not None and hasattr(config, "model_dump"):
+            config = config.model_dump(mode="json", exclude_none=True)
+        return {"contents": contents, "config": config, "extra": extra or {}}
+
+    # --- Record ---
+    def _path(self, mission_id: str) -> str:
+        return os.path.join(self.root, f"{mission_id or 'no-mission'}.jsonl")
+
+    def _append(self, entry: dict):
+        mission_id = current_mission_id.get()
+        with self._lock:
+            entry["seq"] = self._seq[mission_id]
+            self._seq[mission_id] += 1
+            try:
+                os.makedirs(self.root, exist_ok=True)
+                with open(self._path(mission_id), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            except Exception as e:
+                print(f"⚠️ Cassette Write Error: {e}")
+
+    def start(self, mission_id: str, mission: str):
+        """Cassette ခေါင်း (Mission စာသား) — Replay Bench က ဒီစာသားနဲ့ Mission ကို ပြန် Submit မယ်"""
+        if self.recording:
+            token = current_mission_id.set(mission_id)
+            try:
+                self._append({"type": "mission", "mission_id": mission_id, "mission": mission, "ts": time.time()})
+            finally:
+                current_mission_id.reset(token)
+
+    def record(self, kind: str, agent: str, provider: str, model: str, key: str, started: float,
+               request: dict = None, response=None, error: BaseException = None, chunks: list = None,
+               cached: bool = False):
+        """started = time.perf_counter() (Request ပို့ခါနီး), request = request_body()"""
+        if not self.recording:
+            return
+        entry = {
+            "type": kind,
+            "agent": agent,
+            "provider": provider,
+            "model": model,
+            "key": key,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "ts": time.time(),
+            "request": request,
+        }
+        if cached:
+            entry["cached"] = True
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        if chunks is not None:
+            entry["chunks"] = chunks      # [[offset_ms, text], ...] (Error မတိုင်ခင် ရခဲ့တဲ့ Chunk တွေပါ)
+        elif error is None:
+            entry["response"] = response
+        self._append(entry)
+        self.counters["recorded"] += 1
+
+    # --- Replay ---
+    def _load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            paths = [self.source]
+            if os.path.isdir(self.source):
+                paths = sorted(os.path.join(self.source, name) for name in os.listdir(self.source) if name.endswith(".jsonl"))
+            for path in paths:
+                if not os.path.exists(path):
+                    print(f"⚠️ Cassette not found: {path}")
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        entry = json.loads(line)
+                        if entry.get("type") == "mission":
+                            continue
+                        entry["_used"] = False
+                        self._by_key[entry["key"]].append(entry)
+                        self._by_agent[(entry["type"], entry["agent"])].append(entry)
+                        self.counters["loaded"] += 1
+            self._loaded = True
+            print(f"📼 Cassette Replay: {self.counters['loaded']} interactions from {self.source}")
+
+    @staticmethod
+    def _take(queue: deque):
+        while queue:
+            entry = queue.popleft()
+            if not entry["_used"]:
+                entry["_used"] = True
+                return entry
+        return None
+
+    def _match(self, kind: str, agent: str, key: str) -> dict:
+        self._load()
+        with self._lock:
+            entry = self._take(self._by_key.get(key, deque()))
+            if entry is not None:
+                self.counters["exact"] += 1
+                return entry
+            if not self.strict:
+                entry = self._take(self._by_agent.get((kind, agent), deque()))
+                if entry is not None:
+                    self.counters["by_agent"] += 1
+                    return entry
+            self.counters["misses"] += 1
+        raise CassetteMiss(f"No recorded {kind} response for agent '{agent}' (key {key[:12]})")
+
+    @staticmethod
+    def _raise_recorded(entry: dict):
+        if entry.get("error"):
+            raise ReplayedError(entry["error"]["message"])
+
+    async def replay(self, kind: str, agent: str, key: str):
+        entry = self._match(kind, agent, key)
+        await asyncio.sleep(entry["latency_ms"] * self.latency_scale / 1000)
+        self._raise_recorded(entry)
+        return entry.get("response")
+
+    def replay_sync(self, kind: str, agent: str, key: str):
+        entry = self._match(kind, agent, key)
+        time.sleep(entry["latency_ms"] * self.latency_scale / 1000)
+        self._raise_recorded(entry)
+        return entry.get("response")
+
+    async def replay_stream(self, agent: str, key: str):
+        """Chunk တစ်ခုချင်းစီကို Record တုန်းက Offset အတိုင်း ပြန်ထုတ်မယ်"""
+        entry = self._match("stream", agent, key)
+        elapsed = 0.0
+        for offset_ms, text in entry.get("chunks") or []:
+            await asyncio.sleep(max(0.0, offset_ms - elapsed) * self.latency_scale / 1000)
+            elapsed = offset_ms
+            yield text
+        if entry.get("error"):
+            await asyncio.sleep(max(0.0, entry["latency_ms"] - elapsed) * self.latency_scale / 1000)
+            self._raise_recorded(entry)
+
+    def stats(self) -> dict:
+        remaining = sum(1 for q in self._by_key.values() for e in q if not e["_used"]) if self._loaded else None
+        return {
+            "mode": self.mode,
+            "dir": self.root,
+            "source": self.source if self.replaying else None,
+            "latency_scale": self.latency_scale,
+            "strict": self.strict,
+            "remaining": remaining,
+            **self.counters,
+        }
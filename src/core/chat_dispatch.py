@@ -0,0 +1,72 @@
+"""
+Chat Dispatcher (Telegram Concurrent Updates)
+Handler က Mission ပြီးတဲ့အထိ မစောင့်တော့ဘဲ Submit + Ack ပြီး ချက်ချင်းပြန်မယ်။
+- Chat တစ်ခုထဲမှာ Submit / Ack / Reply အစဉ်ကို ရောက်လာတဲ့အစဉ်အတိုင်း ထိန်းမယ် (Mission တွေကတော့ ပြိုင်တူ Run)
+- In-flight (Reply မပို့ရသေးတဲ့) Mission အရေအတွက်ကို ကန့်သတ်မယ်
+"""
+import asyncio
+from collections import defaultdict
+
+
+class ChatDispatcher:
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max(1, max_in_flight)
+        self.in_flight = 0
+        self._locks = defaultdict(asyncio.Lock)     # chat_id -> Submit + Ack Lock (FIFO)
+        self._tails = {}                            # chat_id -> နောက်ဆုံး Mission ရဲ့ Reply ပို့ပြီးကြောင်း Future
+        self._tasks = set()
+
+    async def dispatch(self, chat_id, submit, ack, reply) -> bool:
+        """
+        submit(): async -> Mission, ack(mission): async, reply(result): async
+        In-flight ပြည့်နေရင် False (Handler က Busy ပြန်ပြောမယ်)
+        """
+        if self.in_flight >= self.max_in_flight:
+            return False
+        self.in_flight += 1
+        try:
+            async with self._locks[chat_id]:
+                mission = await submit()
+                try:
+                    await ack(mission)
+                except Exception as e:
+                    print(f"⚠️ Ack Error ({chat_id}): {e}")
+                previous = self._tails.get(chat_id)
+                done = asyncio.get_running_loop().create_future()
+                self._tails[chat_id] = done
+        except BaseException:
+            self.in_flight -= 1
+            raise
+
+        task = asyncio.create_task(self._deliver(chat_id, mission, previous, done, reply))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _deliver(self, chat_id, mission, previous, done, reply):
+        try:
+            result = await mission.future
+            if previous is not None:
+                await previous      # ရှေ့က Mission ရဲ့ Reply ပို့ပြီးမှ (ကိုယ်က အရင်ပြီးရင်တောင်)
+            await reply(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Reply Error ({chat_id}, {mission.id}): {e}")
+        finally:
+            if not done.done():
+                done.set_result(None)
+            if self._tails.get(chat_id) is done:
+                del self._tails[chat_id]
+                lock = self._locks.get(chat_id)
+                if lock is not None and not lock.locked():
+                    del self._locks[chat_id]
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "max_in_flight": self.max_in_flight, "chats": len(self._tails)}
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
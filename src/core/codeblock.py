@@ -0,0 +1,85 @@
+FENCE = "```"
+
+# Code Block ရဲ့ ထိပ်မှာ ကပ်ပါလာတတ်တဲ့ Language Tags
+LANG_TAGS = ("python", "html", "css", "javascript", "js")
+
+
+def extract_code_block(text: str) -> str:
+    """Full Response ထဲက ပထမဆုံး ``` ... ``` Block ကို ထုတ်ယူမယ် (Fence မပါရင် ဒီတိုင်းပြန်ပေးမယ်)"""
+    if not text or FENCE not in text:
+        return text
+    parts = text.split(FENCE)
+    if len(parts) < 2:
+        return text
+    code = parts[1]
+    for tag in LANG_TAGS:
+        if code.startswith(tag):
+            code = code[len(tag):]
+            break
+    return code.strip()
+
+
+class CodeFenceStream:
+    """
+    Incremental ``` fence detector for streamed LLM output.
+    feed() returns only the text that is safely inside the code block, so it can be
+    written to disk as it arrives. `closed` flips once the closing fence is seen.
+    """
+
+    def __init__(self):
+        self.pending = ""       # မဆုံးဖြတ်ရသေးတဲ့ Text (Fence တစ်ဝက်ပိုင်း ဖြစ်နိုင်လို့)
+        self.raw = []           # Fence လုံးဝမတွေ့ရင် Fallback အတွက်
+        self.code = []
+        self.opened = False
+        self.closed = False
+        self.language = ""
+
+    def feed(self, chunk: str) -> str:
+        if self.closed or not chunk:
+            return ""
+        self.raw.append(chunk)
+        self.pending += chunk
+
+        if not self.opened:
+            start = self.pending.find(FENCE)
+            if start == -1:
+                return ""
+            # Language Tag ရှိတဲ့ Line ဆုံးတဲ့အထိ စောင့်မယ်
+            newline = self.pending.find("\n", start)
+            if newline == -1:
+                return ""
+            self.language = self.pending[start + len(FENCE):newline].strip()
+            self.pending = self.pending[newline + 1:]
+            self.opened = True
+
+        end = self.pending.find(FENCE)
+        if end != -1:
+            piece = self.pending[:end]
+            self.pending = ""
+            self.closed = True
+        else:
+            # အဆုံးမှာ "`" / "``" ကျန်နေရင် နောက် Chunk ထိ ထိန်းထားမယ်
+            hold = 0
+            for size in (2, 1):
+                if self.pending.endswith(FENCE[:size]):
+                    hold = size
+                    break
+            piece = self.pending[:len(self.pending) - hold]
+            self.pending = self.pending[len(self.pending) - hold:]
+        self.code.append(piece)
+        return piece
+
+    def finish(self) -> str:
+        """Stream ပြီးသွားရင် ကျန်တာ Flush (Fence မပါတဲ့ Response ဆို တစ်ခုလုံး)"""
+        if self.closed:
+            return ""
+        if self.opened:
+            piece, self.pending = self.pending, ""
+            self.code.append(piece)
+            return piece
+        text = extract_code_block("".join(self.raw))
+        self.code = [text]
+        return text
+
+    def result(self) -> str:
+        return "".join(self.code).strip()
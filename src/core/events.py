@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+
+class MissionChannel:
+    def __init__(self):
+        self.history = deque(maxlen=MissionEventBus.HISTORY_EVENTS)
+        self.subscribers = set()
+        self.closed = False
+
+
+class MissionEventBus:
+    """
+    Mission တစ်ခုချင်းစီရဲ့ Progress Event Bus (SSE Endpoint အတွက်)
+    - publish(): Graph Node Update / Log တွေကို Subscriber အားလုံးဆီ ပို့မယ်
+    - subscribe(): နောက်ကျမှ ချိတ်တဲ့ Client လည်း History ကနေ စပြီး ရမယ်
+    - "end" Event ပို့ပြီးရင် Channel ပိတ်မယ်
+    """
+
+    HISTORY_EVENTS = 500        # Mission တစ်ခုမှာ ပြန်ပြနိုင်မယ့် Event အရေအတွက်
+    CLOSED_LIMIT = 200          # ပြီးဆုံးပြီး Mission Channel ဘယ်နှခု ထားမလဲ
+    SUBSCRIBER_BUFFER = 1000    # နှေးတဲ့ Client အတွက် Buffer (ပြည့်ရင် အဟောင်းဆုံးကို လွှင့်)
+
+    def __init__(self):
+        self.channels = OrderedDict()   # mission_id -> MissionChannel
+
+    def open(self, mission_id: str):
+        if mission_id not in self.channels:
+            self.channels[mission_id] = MissionChannel()
+
+    def exists(self, mission_id: str) -> bool:
+        return mission_id in self.channels
+
+    def publish(self, mission_id: str, event_type: str, **data):
+        channel = self.channels.get(mission_id)
+        if channel is None or channel.closed:
+            return
+        event = {"type": event_type, "mission_id": mission_id, "ts": time.time(), **data}
+        channel.history.append(event)
+        for queue in channel.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+        if event_type == "end":
+            channel.closed = True
+            self._prune()
+
+    async def subscribe(self, mission_id: str, heartbeat: float = 15.0):
+        """History + Live Events (Idle ဖြစ်နေရင် heartbeat စက္ကန့်တိုင်း "ping" Event)"""
+        channel = self.channels.get(mission_id)
+        if channel is None:
+            return
+        queue = asyncio.Queue(maxsize=self.SUBSCRIBER_BUFFER)
+        history = list(channel.history)
+        if not channel.closed:
+            channel.subscribers.add(queue)
+        try:
+            for event in history:
+                yield event
+            while True:
+                # History ဖတ်နေတုန်း Mission ပြီးသွားရင် Queue ထဲရောက်နေပြီးသား Live Events + "end" ကို ဆက်ထုတ်မယ်
+                if channel.closed and queue.empty():
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield {"type": "ping", "mission_id": mission_id, "ts": time.time()}
+                    continue
+                yield event
+                if event["type"] == "end":
+                    return
+        finally:
+            channel.subscribers.discard(queue)
+
+    def _prune(self):
+        closed = [mid for mid, channel in self.channels.items() if channel.closed]
+        for mission_id in closed[:-self.CLOSED_LIMIT]:
+            del self.channels[mission_id]
+
+# Global Instance
+mission_events = MissionEventBus()
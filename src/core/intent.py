@@ -0,0 +1,114 @@
+import json
+import os
+import re
+import time
+from config.settings import settings
+
+
+class IntentClassifier:
+    """
+    Local Fast-path Router (LLM မခေါ်ခင် Microseconds အတွင်း ဆုံးဖြတ်မယ်)
+    Router Prompt ထဲက Keyword Rules တွေကိုပဲ Weighted Regex Scorer အဖြစ် ပြန်သုံးထားတယ်။
+    Confidence နည်းရင် (None) Gemini Router ဆီ ဆက်ပို့မယ်။
+    """
+
+    LABELS = ("DEPLOY", "CHAT", "ARCHITECT")
+
+    # (pattern, weight) - Router Prompt ထဲက Keywords + Code ရေးခိုင်းတဲ့ Hint တွေ
+    RULES = {
+        "DEPLOY": [
+            (r"\b(run|start|stop|kill|delete|remove|launch|restart|redeploy)\b", 1.0),
+            (r"\b(container|docker|logs?)\b", 0.5),
+        ],
+        "CHAT": [
+            (r"\b(hello|hi|hey|thanks|thank you|thx)\b", 1.0),
+            (r"\b(how are you|who are you|what can you do)\b", 1.5),
+            (r"\b(explain|help|what is|why)\b", 1.0),
+            (r"\?\s*$", 0.5),
+        ],
+        "ARCHITECT": [
+            (r"\b(create|build|write|make|implement|develop|generate|code|add|fix|refactor)\b", 1.0),
+            (r"\b(app|api|bot|script|website|server|game|dashboard|tool|scraper|cli|service|function|class)\b", 1.0),
+            (r"\b(fastapi|flask|django|streamlit|telegram|python|html|javascript|react)\b", 1.0),
+        ],
+    }
+
+    # ပထမဆုံး စကားလုံးက အဓိပ္ပါယ်ကို အများဆုံးဆုံးဖြတ်တယ် ("stop my-app", "hi jarvis")
+    LEADING = {
+        "DEPLOY": {"run", "start", "stop", "kill", "delete", "remove", "launch", "restart", "redeploy"},
+        "CHAT": {"hello", "hi", "hey", "thanks", "thank", "who", "what", "why", "how", "explain", "help"},
+        "ARCHITECT": {"create", "build", "write", "make", "implement", "develop", "generate", "add", "fix"},
+    }
+    LEADING_BONUS = 1.5
+    ARCHITECT_PRIOR = 0.5   # Router Prompt: "Default for everything else"
+    LONG_MISSION_TOKENS = 12
+
+    def __init__(self):
+        self.compiled = {
+            label: [(re.compile(p, re.IGNORECASE), w) for p, w in rules]
+            for label, rules in self.RULES.items()
+        }
+
+    def score(self, text: str) -> dict:
+        tokens = re.findall(r"[a-z0-9_\-']+", text.lower())
+        scores = {label: 0.0 for label in self.LABELS}
+        for label, rules in self.compiled.items():
+            for pattern, weight in rules:
+                if pattern.search(text):
+                    scores[label] += weight
+        if tokens:
+            for label, words in self.LEADING.items():
+                if tokens[0] in words:
+                    scores[label] += self.LEADING_BONUS
+            if len(tokens) > self.LONG_MISSION_TOKENS:
+                scores["ARCHITECT"] += 1.0
+        return scores
+
+    def classify(self, text: str):
+        """Returns (label, confidence). Confidence is 0 when no rule fired at all."""
+        scores = self.score(text)
+        evidence = sum(scores.values())
+        if evidence == 0:
+            return "ARCHITECT", 0.0
+        scores["ARCHITECT"] += self.ARCHITECT_PRIOR
+        label = max(self.LABELS, key=lambda l: scores[l])
+        return label, scores[label] / (evidence + self.ARCHITECT_PRIOR)
+
+    def is_confident(self, confidence: float) -> bool:
+        return settings.INTENT_FAST_PATH and confidence >= settings.INTENT_FAST_PATH_THRESHOLD
+
+    def lane(self, text: str) -> str:
+        """
+        Mission Executor Lane: Local Classifier က CHAT / DEPLOY လို့ သေချာရင် fast, ကျန်တာ heavy
+        (မသေချာရင် heavy — Code Generation ကို fast Slot ထဲ မှားမထည့်မိအောင်)
+        """
+        if not settings.MISSION_FAST_LANE:
+            return "heavy"
+        label, confidence = self.classify(text)
+        if label in ("CHAT", "DEPLOY") and confidence >= settings.MISSION_FAST_LANE_THRESHOLD:
+            return "fast"
+        return "heavy"
+
+    def log_decision(self, mission: str, llm_label: str, llm_ms: float, local_label: str, local_confidence: float,
+                     source: str = "router"):
+        """
+        LLM Router ရဲ့ ဆုံးဖြတ်ချက်တွေကို Benchmark / Tuning အတွက် မှတ်ထားမယ်
+        source: "router" (Local မသေချာလို့ LLM က ဆုံးဖြတ်) / "shadow" (Fast-path ဆုံးဖြတ်ပြီးသားကို LLM နဲ့ နောက်ကွယ်က စစ်)
+        """
+        try:
+            os.makedirs(os.path.dirname(settings.INTENT_LOG_PATH) or ".", exist_ok=True)
+            with open(settings.INTENT_LOG_PATH, "a") as f:
+                f.write(json.dumps({
+                    "ts": time.time(),
+                    "mission": mission,
+                    "llm_label": llm_label,
+                    "llm_ms": round(llm_ms, 1),
+                    "local_label": local_label,
+                    "local_confidence": round(local_confidence, 3),
+                    "source": source,
+                }, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"⚠️ Intent Log Error: {e}")
+
+# Global Instance
+intent_classifier = IntentClassifier()
@@ -1,31 +1,238 @@
-import itertools
+import asyncio
 import random
+import re
+import threading
+import time
 from google import genai
+from google.genai.types import HttpOptions, HttpRetryOptions
 from config.settings import settings
 
+
+class TokenBucket:
+    """Classic token bucket (capacity per minute, continuous refill)"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(per_minute, 1))
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        # TPM က Estimate နဲ့ Actual မတူနိုင်လို့ အနုတ်ထိ ဆင်းခွင့်ပေးထားတယ် (အကြွေးဆပ်သလို)
+        self.tokens -= amount
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available"""
+        missing = min(amount, self.capacity) - self.available(now)
+        return max(0.0, missing / self.rate)
+
+
+class KeyHealth:
+    """Per-key load & health state"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.rpm = TokenBucket(settings.KEY_RPM_LIMIT)
+        self.tpm = TokenBucket(settings.KEY_TPM_LIMIT)
+        self.error_rate = 0.0           # EWMA (0 = healthy, 1 = always failing)
+        self.consecutive_errors = 0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.tokens_used = 0
+        self.last_error = ""
+
+    def is_cooling(self, now: float) -> bool:
+        return now < self.cooldown_until
+
+    def load_score(self, now: float) -> float:
+        """Lower is better: in-flight calls + recent errors + how drained the RPM bucket is"""
+        rpm_drain = 1.0 - (self.rpm.available(now) / self.rpm.capacity)
+        tpm_drain = 1.0 - (max(self.tpm.available(now), 0.0) / self.tpm.capacity)
+        return self.in_flight + 2.0 * self.error_rate + rpm_drain + tpm_drain
+
+
 class KeyManager:
+    """
+    Health-aware Key Scheduler (Round Robin အစား)
+    - RPM / TPM token buckets per key
+    - 429 / 503 ခံရတဲ့ Key ကို Cooldown ထဲထည့်ပြီး ခဏနားမယ်
+    - အားအလပ်ဆုံး Healthy Key ကို ရွေးပေးမယ်
+    """
+
+    # Error Classification
+    RATE_LIMIT_MARKERS = ("429", "resource_exhausted", "quota", "rate limit")
+    OVERLOAD_MARKERS = ("503", "unavailable", "overloaded", "deadline", "timeout", "timed out")
+    EWMA_ALPHA = 0.3
+
     def __init__(self):
         self.keys = settings.GOOGLE_API_KEYS
-        
+
         if not self.keys:
             # Fallback for safety to prevent crash, though settings handles it
             print("⚠️ Warning: No Google API Keys found!")
             self.keys = ["dummy_key"]
 
-        print(f"🔑 KeyManager Loaded: {len(self.keys)} keys available for rotation.")
-        # Cycle iterator (Round Robin)
-        self.key_cycle = itertools.cycle(self.keys)
+        print(f"🔑 KeyManager Loaded: {len(self.keys)} keys available for scheduling.")
+        self.health = {key: KeyHealth(key) for key in self.keys}
+        self._lock = threading.Lock()
 
+        # 🔥 Long-lived Client Pool: Key တစ်ခုကို Client တစ်ခုပဲ ဆောက်ပြီး Connection ပြန်သုံးမယ်
+        # Retry ကို Agent ဘက်က ကိုယ်တိုင်ထိန်းလို့ SDK Auto Retry ပိတ်ထားမယ် (ONE SHOT ONLY)
+        self.clients = {
+            key: genai.Client(
+                api_key=key,
+                http_options=HttpOptions(retry_options=HttpRetryOptions(attempts=1))
+            )
+            for key in self.keys
+        }
+
+    # --- Scheduling ---
+    def _pick(self, estimated_tokens: int, now: float):
+        """Least-loaded healthy key with budget left, or None"""
+        candidates = [
+            h for h in self.health.values()
+            if not h.is_cooling(now)
+            and h.rpm.available(now) >= 1
+            and h.tpm.available(now) >= min(estimated_tokens, h.tpm.capacity)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda h: h.load_score(now))
+
+    def _claim(self, health: KeyHealth, estimated_tokens: int, now: float) -> str:
+        health.rpm.consume(1, now)
+        health.tpm.consume(estimated_tokens, now)
+        health.in_flight += 1
+        health.requests += 1
+        return health.key
+
+    def _next_ready_in(self, estimated_tokens: int, now: float) -> float:
+        """Seconds until at least one key can take a request"""
+        waits = []
+        for h in self.health.values():
+            wait = max(
+                h.cooldown_until - now,
+                h.rpm.wait_time(1, now),
+                h.tpm.wait_time(estimated_tokens, now),
+            )
+            waits.append(max(wait, 0.0))
+        return min(waits)
+
+    async def acquire(self, estimated_tokens: int = 0) -> str:
+        """
+        Healthy Key တစ်ခုကို ငှားမယ်။ Key အားလုံး Cooldown/Limit ပြည့်နေမှသာ စောင့်မယ်။
+        Caller must call `release()` afterwards.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                health = self._pick(estimated_tokens, now)
+                if health:
+                    return self._claim(health, estimated_tokens, now)
+                wait = self._next_ready_in(estimated_tokens, now)
+            print(f"⏳ KeyManager: All keys busy/cooling. Waiting {wait:.1f}s...")
+            await asyncio.sleep(min(max(wait, 0.05), settings.KEY_MAX_COOLDOWN_SECONDS))
+
+    def release(self, key: str, tokens_used: int = 0, estimated_tokens: int = 0, error: Exception = None):
+        """Report the outcome of a call made with `key`"""
+        with self._lock:
+            health = self.health.get(key)
+            if not health:
+                return
+            now = time.monotonic()
+            health.in_flight = max(0, health.in_flight - 1)
+
+            # TPM: Estimate နဲ့ Actual ကွာခြားချက်ကို ညှိမယ်
+            if tokens_used:
+                health.tpm.consume(tokens_used - estimated_tokens, now)
+                health.tokens_used += tokens_used
+
+            if error is None:
+                health.consecutive_errors = 0
+                health.error_rate *= (1 - self.EWMA_ALPHA)
+                return
+
+            message = str(error).lower()
+            health.errors += 1
+            health.last_error = str(error)[:200]
+            health.error_rate = health.error_rate * (1 - self.EWMA_ALPHA) + self.EWMA_ALPHA
+
+            if any(m in message for m in self.RATE_LIMIT_MARKERS):
+                health.consecutive_errors += 1
+                cooldown = self._retry_delay(message) or settings.KEY_COOLDOWN_SECONDS * (2 ** (health.consecutive_errors - 1))
+            elif any(m in message for m in self.OVERLOAD_MARKERS):
+                health.consecutive_errors += 1
+                cooldown = (settings.KEY_COOLDOWN_SECONDS / 3) * (2 ** (health.consecutive_errors - 1))
+            else:
+                # Prompt/Request Error (400 etc.) - Key ရဲ့အပြစ်မဟုတ်လို့ Cooldown မလုပ်ဘူး
+                return
+
+            cooldown = min(cooldown, settings.KEY_MAX_COOLDOWN_SECONDS)
+            health.cooldown_until = max(health.cooldown_until, now + cooldown)
+            print(f"🧊 Key ...{key[-4:]} cooling down for {cooldown:.0f}s ({health.last_error[:60]})")
+
+    @staticmethod
+    def _retry_delay(message: str) -> float:
+        """Gemini 429 ရဲ့ 'retryDelay': '27s' ကို ဖတ်မယ်"""
+        match = re.search(r"retrydelay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", message)
+        return float(match.group(1)) if match else 0.0
+
+    def snapshot(self) -> list:
+        """Pool state for inspection (keys are masked)"""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "key": f"...{h.key[-4:]}",
+                    "healthy": not h.is_cooling(now),
+                    "cooldown_remaining": round(max(0.0, h.cooldown_until - now), 1),
+                    "in_flight": h.in_flight,
+                    "rpm_available": round(h.rpm.available(now), 2),
+                    "tpm_available": int(h.tpm.available(now)),
+                    "error_rate": round(h.error_rate, 3),
+                    "requests": h.requests,
+                    "errors": h.errors,
+                    "tokens_used": h.tokens_used,
+                    "last_error": h.last_error,
+                }
+                for h in self.health.values()
+            ]
+
+    # --- Legacy / Sync API ---
     def get_client(self):
-        """Returns a genai.Client with the next key in rotation"""
-        next_key = next(self.key_cycle)
+        """Returns the pooled genai.Client for the best key right now"""
+        next_key = self.get_next_key()
         # Debug print (Optional)
         print(f"🔄 Using Key ending in: ...{next_key[-4:]}")
-        return genai.Client(api_key=next_key)
+        return self.clients[next_key]
+
+    def get_client_for(self, key: str):
+        """Returns the pooled genai.Client for a specific key"""
+        return self.clients[key]
 
     def get_next_key(self):
-        return next(self.key_cycle)    
-    
+        """Non-blocking pick: healthiest key, or the one whose cooldown ends first"""
+        with self._lock:
+            now = time.monotonic()
+            health = self._pick(0, now)
+            if health is None:
+                health = min(self.health.values(), key=lambda h: h.cooldown_until)
+            # Sync callers don't report back, so only the RPM budget is charged
+            health.rpm.consume(1, now)
+            health.requests += 1
+            return health.key
+
     def get_random_key(self):
         """Get a random key (Alternative strategy)"""
-        return random.choice(self.keys)
\ No newline at end of file
+        return random.choice(self.keys)
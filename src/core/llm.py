@@ -1,26 +1,313 @@
-import os
+import asyncio
+import time
+from contextlib import aclosing
 from openai import AsyncOpenAI
+from google.genai.types import GenerateContentConfig
 from src.core.key_manager import KeyManager
+from src.core.llm_cache import LLMCache
+from src.core.cassette import LLMCassette
+from src.core.tracing import tracer, payload_size
 from config.settings import settings
 
+
+def no_tools_config(**kwargs) -> GenerateContentConfig:
+    """GenerateContentConfig with AFC (Function Calling) fully disabled"""
+    return GenerateContentConfig(
+        tools=[],
+        tool_config={'function_calling_config': {'mode': 'NONE'}},
+        **kwargs
+    )
+
+
+def extract_text(response) -> str:
+    """Gemini Response ထဲက Text ကို ယူမယ် (Safety Filter ကြောင့် .text အလွတ်ဖြစ်တတ်လို့)"""
+    if response.text:
+        return response.text
+    if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+        text = response.candidates[0].content.parts[0].text
+        if text:
+            return text
+    raise Exception("Empty response (Possible Safety Filter)")
+
+
+def estimate_tokens(contents) -> int:
+    """Rough token estimate (~4 chars/token) for TPM budgeting before the call"""
+    return max(1, len(str(contents)) // 4)
+
+
+def usage_tokens(response) -> int:
+    """Actual total tokens reported by Gemini (0 if unavailable)"""
+    usage = getattr(response, "usage_metadata", None)
+    return (getattr(usage, "total_token_count", None) or 0) if usage else 0
+
+
 class LLMEngine:
+    """
+    Single async gateway for every LLM call.
+    - Gemini: long-lived pooled clients per key (KeyManager) via the native `client.aio` API
+    - OpenRouter: one shared AsyncOpenAI client
+    - Per-provider concurrency limits so a burst of agents can't starve the event loop
+    """
+
     def __init__(self):
-        # 1. Setup Google Key Rotation
+        # 1. Setup Google Key Rotation (Pooled Clients)
         self.key_manager = KeyManager()
-        
+
         # 2. Setup OpenRouter (Claude/DeepSeek etc.)
         self.openrouter_client = AsyncOpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=settings.OPENROUTER_API_KEY,
         )
-        
+
+        # 3. Per-provider concurrency limits
+        self.limits = {
+            "gemini": asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY_GEMINI),
+            "openrouter": asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY_OPENROUTER),
+        }
+
+        # 4. Persistent Response Cache (Per-agent opt-in)
+        self.cache = LLMCache()
+
+        # 5. Record / Replay Cassettes (LLM_CASSETTE_MODE=off|record|replay)
+        self.cassette = LLMCassette()
+
     def get_gemini_client(self):
-        """For Coder Agent (Uses Rotation)"""
+        """Pooled client for the next key in rotation (sync/legacy callers)"""
         return self.key_manager.get_client()
 
     def get_openrouter_client(self):
-        """For Architect & Debugger Agents"""
+        """Shared OpenRouter client"""
         return self.openrouter_client
 
+    def _cassette_call(self, kind: str, provider: str, model: str, contents, config=None, extra: dict = None):
+        """Cassette Key + Request Body (Cassette ပိတ်ထားရင် Hash မတွက်ဘူး)"""
+        if self.cassette.mode == "off":
+            return None, None
+        key = self.cassette.request_key(kind, provider, model, contents, config, extra)
+        body = self.cassette.request_body(contents, config, extra) if self.cassette.recording else None
+        return key, body
+
+    async def generate(self, contents, model: str = None, config: GenerateContentConfig = None,
+                       provider: str = "gemini", agent: str = "default", cache: bool = None, **kwargs) -> str:
+        """
+        Awaitable text generation. Returns the response text.
+        `agent` tags the caller (router, coder, debugger...) for per-agent policies.
+        `cache` overrides the per-agent cache opt-in (None = follow settings).
+        """
+        if provider == "gemini":
+            model = model or settings.MODEL_CODER
+        use_cache = self.cache.enabled_for(agent) if cache is None else cache
+        use_cache = use_cache and not self.cassette.replaying     # Replay မှာ Cassette ကပဲ Source of Truth
+
+        with tracer.span(f"llm:{agent}", "llm", provider=provider, model=model,
+                         prompt_chars=payload_size(contents)) as span:
+            cache_key = None
+            if use_cache:
+                cache_key = self.cache.make_key(provider, model, contents, config, kwargs)
+                started = time.perf_counter()
+                cached = await self.cache.get(cache_key, agent)
+                if cached is not None:
+                    print(f"💾 LLM Cache Hit ({agent})")
+                    span.set(cache="hit", response_chars=len(cached))
+                    if self.cassette.recording:
+                        # Replay မှာ Cache မသုံးလို့ Hit တွေကိုလည်း မှတ်ထားမယ် (Cached Flag နဲ့)
+                        key, body = self._cassette_call("generate", provider, model, contents, config, kwargs)
+                        self.cassette.record("generate", agent, provider, model, key, started,
+                                             request=body, response=cached, cached=True)
+                    return cached
+
+            if provider == "openrouter":
+                text = await self._generate_openrouter(contents, model, config, span=span, agent=agent, **kwargs)
+            else:
+                text = await self._generate_gemini(contents, model, config, span=span, agent=agent)
+
+            if cache_key:
+                await self.cache.put(cache_key, agent, text)
+            span.set(response_chars=len(text or ""), **({"cache": "miss"} if cache_key else {}))
+            return text
+
+    async def _generate_gemini(self, contents, model: str, config: GenerateContentConfig = None, span=None,
+                               agent: str = "default") -> str:
+        estimated = estimate_tokens(contents)
+        queued_at = time.perf_counter()
+        tape_key, tape_body = self._cassette_call("generate", "gemini", model, contents, config)
+        async with self.limits["gemini"]:
+            if self.cassette.replaying:
+                if span:
+                    span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1), replay=True)
+                return await self.cassette.replay("generate", agent, tape_key)
+
+            # Health-aware Scheduler: အားအလပ်ဆုံး Healthy Key ကို ငှားမယ်
+            key = await self.key_manager.acquire(estimated)
+            if span:
+                span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1), estimated_tokens=estimated)
+            started = time.perf_counter()
+            try:
+                response = await self.key_manager.get_client_for(key).aio.models.generate_content(
+                    model=model,
+                    contents=contents,
+                    config=config
+                )
+            except asyncio.CancelledError:
+                self.key_manager.release(key)
+                raise
+            except Exception as e:
+                self.key_manager.release(key, estimated_tokens=estimated, error=e)
+                self.cassette.record("generate", agent, "gemini", model, tape_key, started, request=tape_body, error=e)
+                raise
+            self.key_manager.release(key, tokens_used=usage_tokens(response), estimated_tokens=estimated)
+            if span:
+                span.set(tokens=usage_tokens(response))
+            try:
+                text = extract_text(response)
+            except Exception as e:
+                self.cassette.record("generate", agent, "gemini", model, tape_key, started, request=tape_body, error=e)
+                raise
+            self.cassette.record("generate", agent, "gemini", model, tape_key, started, request=tape_body, response=text)
+            return text
+
+    async def generate_stream(self, contents, model: str = None, config: GenerateContentConfig = None,
+                              agent: str = "default"):
+        """
+        Async generator of text chunks (Gemini streaming).
+        Consumers that stop early should wrap it in `contextlib.aclosing()` so the key is released.
+        """
+        model = model or settings.MODEL_CODER
+        estimated = estimate_tokens(contents)
+        queued_at = time.perf_counter()
+        tape_key, tape_body = self._cassette_call("stream", "gemini", model, contents, config)
+        with tracer.span(f"llm_stream:{agent}", "llm", provider="gemini", model=model,
+                         prompt_chars=payload_size(contents)) as span:
+            async with self.limits["gemini"]:
+                if self.cassette.replaying:
+                    span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1), replay=True)
+                    async with aclosing(self.cassette.replay_stream(agent, tape_key)) as replay:
+                        async for text in replay:
+                            yield text
+                    return
+
+                key = await self.key_manager.acquire(estimated)
+                span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1), estimated_tokens=estimated)
+                tokens, error, chars = 0, None, 0
+                first_chunk_at = None
+                stream = None
+                started = time.perf_counter()
+                chunks = []     # Cassette: [[offset_ms, text], ...]
+                try:
+                    stream = await self.key_manager.get_client_for(key).aio.models.generate_content_stream(
+                        model=model,
+                        contents=contents,
+                        config=config
+                    )
+                    async for chunk in stream:
+                        tokens = usage_tokens(chunk) or tokens
+                        if chunk.text:
+                            if first_chunk_at is None:
+                                first_chunk_at = time.perf_counter()
+                            chars += len(chunk.text)
+                            if self.cassette.recording:
+                                chunks.append([round((time.perf_counter() - started) * 1000, 1), chunk.text])
+                            yield chunk.text
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    if stream is not None and hasattr(stream, "aclose"):
+                        try:
+                            await stream.aclose()
+                        except Exception:
+                            pass
+                    self.key_manager.release(key, tokens_used=tokens, estimated_tokens=estimated, error=error)
+                    # Consumer က စောစော ရပ်သွားရင်လည်း (aclose) ရခဲ့သလောက် Chunk တွေ မှတ်မယ်
+                    self.cassette.record("stream", agent, "gemini", model, tape_key, started,
+                                         request=tape_body, chunks=chunks, error=error)
+                    span.set(tokens=tokens, response_chars=chars,
+                             **({"first_chunk_ms": round((first_chunk_at - queued_at) * 1000, 1)} if first_chunk_at else {}))
+
+    async def _generate_openrouter(self, contents, model: str, config: GenerateContentConfig = None, span=None,
+                                   agent: str = "default", **kwargs) -> str:
+        messages = contents if isinstance(contents, list) else [{"role": "user", "content": contents}]
+        params = dict(kwargs)
+        if config is not None:
+            if config.temperature is not None:
+                params.setdefault("temperature", config.temperature)
+            if config.response_mime_type == "application/json":
+                params.setdefault("response_format", {"type": "json_object"})
+
+        model = model or settings.MODEL_DEBUGGER
+        queued_at = time.perf_counter()
+        tape_key, tape_body = self._cassette_call("generate", "openrouter", model, messages, None, params)
+        async with self.limits["openrouter"]:
+            if span:
+                span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1))
+            if self.cassette.replaying:
+                return await self.cassette.replay("generate", agent, tape_key)
+            started = time.perf_counter()
+            try:
+                response = await self.openrouter_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    **params
+                )
+                text = response.choices[0].message.content
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.cassette.record("generate", agent, "openrouter", model, tape_key, started, request=tape_body, error=e)
+                raise
+            self.cassette.record("generate", agent, "openrouter", model, tape_key, started, request=tape_body, response=text)
+            return text
+
+    async def embed(self, contents, model: str = None) -> list:
+        """Awaitable embeddings (Gemini). Returns a list of vectors."""
+        model = model or settings.MODEL_EMBEDDING
+        estimated = estimate_tokens(contents)
+        queued_at = time.perf_counter()
+        tape_key, tape_body = self._cassette_call("embed", "gemini", model, contents)
+        with tracer.span("llm:embed", "llm", prompt_chars=payload_size(contents)) as span:
+            async with self.limits["gemini"]:
+                if self.cassette.replaying:
+                    span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1), replay=True)
+                    return await self.cassette.replay("embed", "embed", tape_key)
+                key = await self.key_manager.acquire(estimated)
+                span.set(queue_wait_ms=round((time.perf_counter() - queued_at) * 1000, 1))
+                started = time.perf_counter()
+                try:
+                    response = await self.key_manager.get_client_for(key).aio.models.embed_content(
+                        model=model,
+                        contents=contents
+                    )
+                except asyncio.CancelledError:
+                    self.key_manager.release(key)
+                    raise
+                except Exception as e:
+                    self.key_manager.release(key, estimated_tokens=estimated, error=e)
+                    self.cassette.record("embed", "embed", "gemini", model, tape_key, started, request=tape_body, error=e)
+                    raise
+                self.key_manager.release(key, tokens_used=estimated, estimated_tokens=estimated)
+                vectors = [e.values for e in response.embeddings]
+                self.cassette.record("embed", "embed", "gemini", model, tape_key, started, request=tape_body, response=vectors)
+                return vectors
+
+    def embed_sync(self, contents, model: str = None) -> list:
+        """Blocking embeddings for sync-only callers (ChromaDB EmbeddingFunction)"""
+        model = model or settings.MODEL_EMBEDDING
+        tape_key, tape_body = self._cassette_call("embed", "gemini", model, contents)
+        if self.cassette.replaying:
+            return self.cassette.replay_sync("embed", "embed", tape_key)
+        client = self.key_manager.get_client()
+        started = time.perf_counter()
+        try:
+            response = client.models.embed_content(
+                model=model,
+                contents=contents
+            )
+        except Exception as e:
+            self.cassette.record("embed", "embed", "gemini", model, tape_key, started, request=tape_body, error=e)
+            raise
+        vectors = [e.values for e in response.embeddings]
+        self.cassette.record("embed", "embed", "gemini", model, tape_key, started, request=tape_body, response=vectors)
+        return vectors
+
 # Singleton Instance (တစ်နေရာတည်းကနေ ခေါ်သုံးဖို့)
-llm_engine = LLMEngine()
\ No newline at end of file
+llm_engine = LLMEngine()
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from config.settings import settings
+
+
+class LLMCache:
+    """
+    Persistent content-addressed LLM response cache (SQLite)
+    - Key = sha256(provider + model + prompt + config)
+    - TTL expiry + LRU eviction (entry count & total bytes)
+    - Per-agent opt-in (settings.LLM_CACHE_AGENTS) + hit/miss counters
+    """
+
+    def __init__(self, path: str = None, ttl: float = None, max_entries: int = None, max_bytes: int = None):
+        self.path = path or settings.LLM_CACHE_PATH
+        self.ttl = ttl if ttl is not None else settings.LLM_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.LLM_CACHE_MAX_MB * 1024 * 1024
+        self.agents = set(settings.LLM_CACHE_AGENTS)
+        self.counters = defaultdict(lambda: {"hits": 0, "misses": 0, "stores": 0})
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def enabled_for(self, agent: str) -> bool:
+        return settings.LLM_CACHE_ENABLED and agent in self.agents
+
+    # --- Storage ---
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    agent TEXT,
+                    value TEXT,
+                    size INTEGER,
+                    created_at REAL,
+                    accessed_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(provider: str, model: str, contents, config=None, extra: dict = None) -> str:
+        """Content hash of everything that influences the response"""
+        if config is not None and hasattr(config, "model_dump"):
+            config = config.model_dump(mode="json", exclude_none=True)
+        payload = json.dumps(
+            {"provider": provider, "model": model, "contents": contents, "config": config, "extra": extra or {}},
+            sort_keys=True, default=str, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str):
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            now = time.time()
+            if self.ttl and now - created_at > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return value
+
+    def _put(self, key: str, agent: str, value: str):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, agent, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, agent, value, size, now, now)
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        """LRU: Entry အရေအတွက် (သို့) Size ကျော်ရင် အကြာဆုံးမသုံးတာကို ဖျက်မယ်"""
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        removed = 0
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            removed += 1
+        self.evictions += removed
+
+    # --- Async API ---
+    async def get(self, key: str, agent: str = "default"):
+        try:
+            value = await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            print(f"⚠️ LLM Cache Read Error: {e}")
+            value = None
+        self.counters[agent]["hits" if value is not None else "misses"] += 1
+        return value
+
+    async def put(self, key: str, agent: str, value: str):
+        if not value:
+            return
+        try:
+            await asyncio.to_thread(self._put, key, agent, value)
+            self.counters[agent]["stores"] += 1
+        except Exception as e:
+            print(f"⚠️ LLM Cache Write Error: {e}")
+
+    def stats(self) -> dict:
+        entries, total = 0, 0
+        try:
+            with self._lock:
+                entries, total = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+                ).fetchone()
+        except Exception as e:
+            print(f"⚠️ LLM Cache Stats Error: {e}")
+        return {
+            "enabled": settings.LLM_CACHE_ENABLED,
+            "agents": sorted(self.agents),
+            "entries": entries,
+            "size_mb": round(total / (1024 * 1024), 2),
+            "evictions": self.evictions,
+            "counters": dict(self.counters),
+        }
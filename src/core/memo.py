@@ -0,0 +1,94 @@
+"""
+Node Memoization (Fix Loop)
+Input တွေ (File Content / requirements.txt / Command) ရဲ့ Content Hash မပြောင်းရင်
+အရင် အောင်မြင်ခဲ့တဲ့ ရလဒ်ကို ပြန်သုံးပြီး compile / pip install / Test Run ကို ကျော်မယ်။
+Fail ဖြစ်ခဲ့တဲ့ Run တွေကို မမှတ်ဘူး (Retry ဆိုရင် အမြဲ ပြန် Run)
+"""
+import hashlib
+import os
+from collections import OrderedDict, defaultdict
+from config.settings import settings
+
+# Project Hash တွက်တဲ့အခါ ကျော်မယ့် Folder / File များ (Run တိုင်း ပြောင်းနေတာတွေ)
+SKIP_DIRS = {"__pycache__", ".git", "venv", "env", "test_env", "node_modules", ".pytest_cache"}
+SKIP_SUFFIXES = (".pyc", ".log")
+
+
+class NodeMemo:
+    """
+    Namespace (compile / pip_install / test_run) + Content Hash → အောင်မြင်ခဲ့တဲ့ ရလဒ်
+    Process တစ်ခုလုံးမှာ LRU (max_entries) နဲ့ ထိန်းမယ်
+    """
+
+    def __init__(self, enabled: bool = None, max_entries: int = None):
+        self.enabled = settings.NODE_MEMO_ENABLED if enabled is None else enabled
+        self.max_entries = max_entries or settings.NODE_MEMO_MAX_ENTRIES
+        self.entries = OrderedDict()
+        self.counters = defaultdict(lambda: {"hits": 0, "misses": 0, "stores": 0})
+
+    @staticmethod
+    def key(*parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+            digest.update(len(data).to_bytes(8, "little"))     # Part တွေ ပေါင်းပြီး Collision မဖြစ်အောင်
+            digest.update(data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def digest_file(path: str) -> str:
+        """File မရှိရင် "" (ဖျက်လိုက်တာလည်း Input ပြောင်းတာပဲ)"""
+        if not path or not os.path.exists(path):
+            return ""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(65536), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def digest_tree(cls, root: str) -> str:
+        """Project Folder ထဲက File အားလုံး (Relative Path + Content) ရဲ့ Hash"""
+        parts = []
+        for dirpath, dirs, files in os.walk(root):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+            for name in sorted(files):
+                if name.startswith(".") or name.endswith(SKIP_SUFFIXES):
+                    continue
+                path = os.path.join(dirpath, name)
+                parts.append(f"{os.path.relpath(path, root)}:{cls.digest_file(path)}")
+        return cls.key(*parts)
+
+    def get(self, namespace: str, key: str):
+        if not self.enabled:
+            return None
+        value = self.entries.get((namespace, key))
+        if value is None:
+            self.counters[namespace]["misses"] += 1
+            return None
+        self.entries.move_to_end((namespace, key))
+        self.counters[namespace]["hits"] += 1
+        return value
+
+    def put(self, namespace: str, key: str, value=True):
+        if not self.enabled:
+            return
+        self.entries[(namespace, key)] = value
+        self.entries.move_to_end((namespace, key))
+        self.counters[namespace]["stores"] += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "namespaces": {k: dict(v) for k, v in self.counters.items()},
+        }
+
+# Global Instance
+node_memo = NodeMemo()
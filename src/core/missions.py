@@ -0,0 +1,244 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+
+# လက်ရှိ Run နေတဲ့ Mission ID (Graph Node / Agent တွေထဲကနေ လှမ်းသိနိုင်အောင်)
+current_mission_id: ContextVar[str] = ContextVar("current_mission_id", default="")
+
+
+class Mission:
+    """Mission တစ်ခု = Checkpoint Thread တစ်ခု"""
+
+    def __init__(self, user_id: str, text: str, mission_id: str = None, resume: bool = False):
+        self.id = mission_id or f"mission-{uuid.uuid4().hex[:12]}"
+        self.user_id = user_id
+        self.text = text
+        self.resume = resume            # True = Checkpoint ကနေ ဆက် Run မယ် (Restart ပြီးနောက်)
+        self.lane = "heavy"             # fast (CHAT / DEPLOY) | heavy (ARCHITECT)
+        self.status = "queued"          # queued, running, done, failed, cancelled
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.task = None                # Run နေတဲ့ Runner Task (Cancel Scope)
+        self.cancel_reason = None
+        self.future = asyncio.get_running_loop().create_future()
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "mission": self.text,
+            "status": self.status,
+            "resumed": self.resume,
+            "lane": self.lane,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class FairQueue:
+    """User တစ်ယောက်က Mission အများကြီး ပို့ရင်တောင် တခြား User တွေ မစောင့်ရအောင် Round-robin (Per-user Fairness)"""
+
+    def __init__(self):
+        self.queues = {}                # user_id -> deque[Mission]
+        self.rotation = deque()         # Pending ရှိတဲ့ user_id တွေ (Round-robin အစဉ်)
+
+    def __bool__(self):
+        return bool(self.rotation)
+
+    def __len__(self):
+        return sum(len(q) for q in self.queues.values())
+
+    def push(self, mission: Mission):
+        user_id = mission.user_id
+        if user_id not in self.queues:
+            self.queues[user_id] = deque()
+        if not self.queues[user_id] and user_id not in self.rotation:
+            self.rotation.append(user_id)
+        self.queues[user_id].append(mission)
+
+    def remove(self, mission: Mission) -> bool:
+        """Queue ထဲက Mission ကို Cancel လုပ်ရင် ဖယ်မယ်"""
+        queue = self.queues.get(mission.user_id)
+        if not queue or mission not in queue:
+            return False
+        queue.remove(mission)
+        if not queue:
+            del self.queues[mission.user_id]
+            self.rotation.remove(mission.user_id)
+        return True
+
+    def pop(self) -> Mission:
+        user_id = self.rotation.popleft()
+        queue = self.queues[user_id]
+        mission = queue.popleft()
+        if queue:
+            self.rotation.append(user_id)   # နောက်ဆုံးကို ပြန်တန်းစီ (Fairness)
+        else:
+            del self.queues[user_id]
+        return mission
+
+    def order(self) -> list:
+        """Round-robin အစဉ်အတိုင်း Run မယ့် Mission ID များ"""
+        order, snapshot = [], {u: list(q) for u, q in self.queues.items()}
+        users = list(self.rotation)
+        while any(snapshot.get(u) for u in users):
+            for u in users:
+                if snapshot.get(u):
+                    order.append(snapshot[u].pop(0).id)
+        return order
+
+
+class MissionExecutor:
+    """
+    Bounded Concurrent Mission Queue (Priority Lane ၂ ခု)
+    - fast: CHAT / DEPLOY (Control) လို Message သေးတွေ — သီးသန့် Worker (settings.MISSION_FAST_WORKERS) ရှိလို့
+      Code Generation Mission ရှည်ကြီးတွေ နောက်မှာ တန်းမစီရတော့ဘူး (Head-of-line Blocking မဖြစ်)
+    - heavy: ARCHITECT Mission တွေ — Worker N ခု (settings.MISSION_WORKERS)၊ fast Queue မှာ စောင့်နေတာရှိရင် အရင်ယူမယ်
+    - Lane တစ်ခုချင်းစီထဲမှာ Per-user Round-robin
+    """
+
+    HISTORY_LIMIT = 200     # Memory ထဲမှာ မှတ်ထားမယ့် ပြီးဆုံးပြီး Mission အရေအတွက်
+    LANES = ("fast", "heavy")
+
+    def __init__(self, runner, workers: int, fast_workers: int = 0):
+        self.runner = runner            # async def runner(mission: Mission) -> str
+        self.workers = max(1, workers)
+        self.fast_workers = max(0, fast_workers)
+        self.lanes = {lane: FairQueue() for lane in self.LANES}
+        self.missions = {}              # mission_id -> Mission
+        self.running = {lane: 0 for lane in self.LANES}
+        self._wakeup = None
+        self._tasks = []
+
+    def _ensure_started(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Condition()
+        # Heavy Worker တွေက fast ကို ဦးစားပေးယူမယ်၊ Fast Worker တွေက fast ပဲယူမယ် (Heavy Mission က Slot ကို မပိတ်နိုင်အောင်)
+        self._tasks = [asyncio.create_task(self._worker(("fast", "heavy"))) for _ in range(self.workers)]
+        self._tasks += [asyncio.create_task(self._worker(("fast",))) for _ in range(self.fast_workers)]
+        print(f"🏭 Mission Executor started with {self.workers} workers + {self.fast_workers} fast-lane workers.")
+
+    async def submit(self, user_id: str, text: str, mission_id: str = None, resume: bool = False,
+                     lane: str = "heavy") -> Mission:
+        self._ensure_started()
+        mission = Mission(user_id, text, mission_id=mission_id, resume=resume)
+        mission.lane = lane if lane in self.lanes else "heavy"
+        self.missions[mission.id] = mission
+        async with self._wakeup:
+            self.lanes[mission.lane].push(mission)
+            self._wakeup.notify_all()
+        print(f"📥 Mission queued: {mission.id} (user {user_id}, {mission.lane} lane, position {self.position(mission.id)})")
+        return mission
+
+    def position(self, mission_id: str) -> int:
+        """ကိုယ့် Lane Queue ထဲမှာ ဘယ်နှစ်ခုမြောက်လဲ (Round-robin အစဉ်အတိုင်း, 1-based, Run နေရင် 0)"""
+        mission = self.missions.get(mission_id)
+        if not mission or mission.status != "queued":
+            return 0
+        order = self.lanes[mission.lane].order()
+        return order.index(mission_id) + 1 if mission_id in order else 0
+
+    def cancel(self, mission_id: str, reason: str = "cancelled by user") -> bool:
+        """
+        🛑 Cooperative Cancellation
+        - Queue ထဲမှာ ရှိသေးရင် ဖယ်ပြီး ချက်ချင်း cancelled
+        - Run နေရင် Runner Task ကို cancel() — နောက် await (LLM Request / Subprocess / Health Check Sleep) မှာ
+          CancelledError တက်ပြီး Agent တွေက ကိုယ့် Resource (Process Group / Container) ကို ရှင်းမယ်
+        """
+        mission = self.missions.get(mission_id)
+        if not mission or mission.finished_at:
+            return False
+        if mission.status == "queued":
+            if not self.lanes[mission.lane].remove(mission):
+                return False
+            mission.status = "cancelled"
+            mission.cancel_reason = reason
+            mission.result = f"🛑 Mission Cancelled ({reason})"
+            mission.finished_at = time.time()
+            if not mission.future.done():
+                mission.future.set_result(mission.result)
+            return True
+        if mission.cancel_reason is None and mission.task and not mission.task.done():
+            mission.cancel_reason = reason      # တစ်ကြိမ်ပဲ cancel() (Cleanup လုပ်နေတုန်း ထပ်မဖြတ်အောင်)
+            mission.task.cancel(reason)
+        return mission.cancel_reason is not None
+
+    def active(self, user_id: str = None) -> list:
+        """မပြီးသေးတဲ့ (queued / running) Mission များ"""
+        return [
+            m for m in self.missions.values()
+            if m.status in ("queued", "running") and (user_id is None or m.user_id == user_id)
+        ]
+
+    def _next_mission(self, lanes: tuple):
+        for lane in lanes:
+            if self.lanes[lane]:
+                return self.lanes[lane].pop()
+        return None
+
+    async def _worker(self, lanes: tuple):
+        while True:
+            async with self._wakeup:
+                await self._wakeup.wait_for(lambda: any(self.lanes[lane] for lane in lanes))
+                mission = self._next_mission(lanes)
+
+            mission.status = "running"
+            mission.started_at = time.time()
+            self.running[mission.lane] += 1
+            token = current_mission_id.set(mission.id)
+            try:
+                # Runner ကို သီးသန့် Task နဲ့ Run မယ် (cancel() က Worker ကို မထိဘဲ Mission ကိုပဲ ဖြတ်နိုင်အောင်)
+                mission.task = asyncio.create_task(self.runner(mission))
+                mission.result = await mission.task
+                if mission.status == "running":     # Runner က failed လို့ မှတ်ခဲ့ရင် မထိ
+                    mission.status = "done"
+                if not mission.future.done():
+                    mission.future.set_result(mission.result)
+            except asyncio.CancelledError:
+                if mission.cancel_reason is None:
+                    raise       # Executor stop() (Shutdown)
+                mission.status = "cancelled"
+                mission.result = f"🛑 Mission Cancelled ({mission.cancel_reason})"
+                if not mission.future.done():
+                    mission.future.set_result(mission.result)
+            except Exception as e:
+                mission.status = "failed"
+                mission.result = f"💥 Mission Failed: {e}"
+                if not mission.future.done():
+                    mission.future.set_result(mission.result)
+            finally:
+                current_mission_id.reset(token)
+                mission.finished_at = time.time()
+                self.running[mission.lane] -= 1
+                mission.task = None
+                self._prune()
+
+    def _prune(self):
+        finished = [m for m in self.missions.values() if m.finished_at]
+        for mission in sorted(finished, key=lambda m: m.finished_at)[:-self.HISTORY_LIMIT]:
+            del self.missions[mission.id]
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "fast_workers": self.fast_workers,
+            "running": sum(self.running.values()),
+            "queued": sum(len(q) for q in self.lanes.values()),
+            "users_waiting": sum(len(q.rotation) for q in self.lanes.values()),
+            "lanes": {
+                lane: {"running": self.running[lane], "queued": len(q), "users_waiting": len(q.rotation)}
+                for lane, q in self.lanes.items()
+            },
+        }
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
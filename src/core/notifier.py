@@ -1,39 +1,231 @@
 import os
+import asyncio
+import time
+from collections import deque
+from datetime import timedelta
 from telegram import Bot
+from telegram.error import BadRequest, RetryAfter
 from dotenv import load_dotenv
+from src.core.missions import current_mission_id
+from config.settings import settings
 
 load_dotenv()
 
+TEXT_LIMIT = 4000       # Telegram Message Limit (4096) ထက် နည်းနည်းလျှော့
+
+
+class _LiveMessage:
+    """Mission တစ်ခု = Telegram Progress Message တစ်ခု (Status အသစ်တိုင်း Edit)"""
+    __slots__ = ("mission_id", "lines", "message_id", "queued", "closed")
+
+    def __init__(self, mission_id: str):
+        self.mission_id = mission_id
+        self.lines = deque(maxlen=settings.NOTIFIER_LIVE_LINES)
+        self.message_id = None
+        self.queued = False         # Send Queue ထဲမှာ ရှိပြီးသားလား (ရှိရင် Line ပဲ ထပ်ထည့် = Coalesce)
+        self.closed = False
+
+    def render(self) -> str:
+        header = f"📡 {self.mission_id}"
+        text = "\n".join(self.lines)
+        while len(header) + len(text) + 1 > TEXT_LIMIT and "\n" in text:
+            text = text.split("\n", 1)[1]
+        return f"{header}\n{text[-(TEXT_LIMIT - len(header) - 1):]}"
+
+
 class Notifier:
+    """
+    Non-blocking Telegram Notifier
+    - send_status() / send_log_file() က Queue ထဲထည့်ပြီး ချက်ချင်းပြန်မယ် (Agent တွေ Telegram Round Trip မစောင့်ရ)
+    - Background Worker က Mission တစ်ခုချင်းစီရဲ့ Status တွေကို Live Message တစ်ခုထဲ Edit နဲ့ စုပြမယ်
+      (မပို့ရသေးခင် ထပ်ရောက်လာတဲ့ Status တွေက Edit တစ်ခါတည်းနဲ့ ပါသွားမယ်)
+    - Chat တစ်ခုချင်း Interval + Global Rate ကို ထိန်းမယ်၊ RetryAfter (Flood Limit) ဆိုရင် စောင့်ပြီး ပြန်ပို့မယ်
+    - ပို့မရတာတွေကို Log ပဲ ထုတ်မယ် (Mission ကို ဘယ်တော့မှ မပိတ်ဘူး)
+    """
+
     def __init__(self):
         self.chat_id = os.getenv("ALLOWED_USER_ID")
         self.token = os.getenv("TELEGRAM_TOKEN")
         self.bot = Bot(token=self.token) if self.token else None
+        self.live = {}                  # mission_id -> _LiveMessage
+        self.outbox = deque()           # ("live", mission_id) | ("text", text) | ("document", bytes, name, caption)
+        self.stats = {"queued": 0, "sent": 0, "edited": 0, "coalesced": 0, "dropped": 0, "retry_after": 0, "errors": 0}
+        self._next_chat_slot = 0.0
+        self._next_global_slot = 0.0
+        self._wakeup = None
+        self._worker = None
+        self._sending = False           # Worker က Job တစ်ခု ပို့နေတုန်းလား (close() မှာ စောင့်ဖို့)
 
-    async def send_status(self, message: str):
-        """Status အခြေအနေ ပို့မယ်"""
-        if not self.bot or not self.chat_id: return
-        try:
-            # Console မှာလည်းပြ၊ Telegram လည်းပို့
-            print(f"📡 Telegram: {message}") 
-            await self.bot.send_message(chat_id=self.chat_id, text=message)
-        except Exception as e:
-            print(f"⚠️ Notifier Error: {e}")
+    @property
+    def enabled(self) -> bool:
+        return bool(self.bot and self.chat_id)
+
+    # --- Public API (Agent တွေက ခေါ်မယ်၊ ဘယ်တော့မှ မစောင့်ဘူး) ---
+    async def send_status(self, message: str, live: bool = True):
+        """
+        Status အခြေအနေ ပို့မယ်
+        live=True: Mission ထဲကဆိုရင် အဲ့ Mission ရဲ့ Progress Message ကို Edit (Mission ပြင်ပဆိုရင် Message အသစ်)
+        live=False: Message အသစ်အဖြစ် သီးသန့်ပို့မယ် (Chat Reply လို User ဖတ်ရမယ့် စာ)
+        """
+        if not self.enabled: return
+        # Console မှာလည်းပြ၊ Telegram လည်းပို့
+        print(f"📡 Telegram: {message}")
+        mission_id = current_mission_id.get() if live else ""
+        if mission_id:
+            entry = self.live.get(mission_id)
+            if entry is None:
+                entry = self.live[mission_id] = _LiveMessage(mission_id)
+            entry.lines.append(message)
+            if entry.queued:
+                self.stats["coalesced"] += 1
+            else:
+                entry.queued = True
+                self._enqueue(("live", mission_id))
+        else:
+            self._enqueue(("text", message))
 
     async def send_log_file(self, file_path: str, caption: str = "📜 Execution Log"):
-        """Log ဖိုင် ပို့မယ်"""
-        if not self.bot or not self.chat_id: return
+        """Log ဖိုင် ပို့မယ် (ချက်ချင်းဖတ်ထားမယ် — နောက် Test Run က File ကို ပြန်ရေးသွားနိုင်လို့)"""
+        if not self.enabled: return
         if not os.path.exists(file_path): return
-
         try:
             with open(file_path, 'rb') as f:
-                await self.bot.send_document(
-                    chat_id=self.chat_id,
-                    document=f,
-                    caption=caption
-                )
+                data = f.read()
         except Exception as e:
             print(f"⚠️ Log Upload Error: {e}")
+            return
+        self._enqueue(("document", data, os.path.basename(file_path), caption))
+
+    def end_mission(self, mission_id: str):
+        """Mission ပြီးရင် နောက်ဆုံး Edit ပို့ပြီးမှ Live Message ကို မေ့လိုက်မယ်"""
+        entry = self.live.get(mission_id)
+        if entry is None:
+            return
+        entry.closed = True
+        if not entry.queued:
+            del self.live[mission_id]
+
+    # --- Queue ---
+    def _enqueue(self, job: tuple):
+        if len(self.outbox) >= settings.NOTIFIER_MAX_PENDING:
+            # Telegram ကျနေရင်တောင် Memory မတက်အောင် အဟောင်းဆုံး Text / Document ကို ဖယ်မယ် (Live Message တွေ မဖယ်)
+            for index, pending in enumerate(self.outbox):
+                if pending[0] != "live":
+                    del self.outbox[index]
+                    self.stats["dropped"] += 1
+                    break
+        self.outbox.append(job)
+        self.stats["queued"] += 1
+        self._ensure_worker()
+        self._wakeup.set()
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    def _next_job(self) -> tuple:
+        job = self.outbox.popleft()
+        if job[0] == "text":
+            # စောင့်နေတဲ့ Text တွေကို Message တစ်ခုတည်း ပေါင်းမယ်
+            text = job[1]
+            while self.outbox and self.outbox[0][0] == "text" and len(text) + len(self.outbox[0][1]) + 1 <= TEXT_LIMIT:
+                text += "\n" + self.outbox.popleft()[1]
+                self.stats["coalesced"] += 1
+            job = ("text", text)
+        return job
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self.outbox:
+                job = self._next_job()
+                self._sending = True
+                try:
+                    await self._deliver(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    print(f"⚠️ Notifier Error: {type(e).__name__}: {e}")
+                finally:
+                    self._sending = False
+
+    async def _throttle(self):
+        """Chat တစ်ခုမှာ NOTIFIER_CHAT_INTERVAL တစ်ခါ + Bot တစ်ခုလုံး NOTIFIER_GLOBAL_RATE/s"""
+        now = time.monotonic()
+        slot = max(now, self._next_chat_slot, self._next_global_slot)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        self._next_chat_slot = slot + settings.NOTIFIER_CHAT_INTERVAL
+        self._next_global_slot = slot + 1.0 / max(settings.NOTIFIER_GLOBAL_RATE, 0.1)
+
+    async def _call(self, method, **kwargs):
+        """RetryAfter (429) ဆိုရင် Telegram ပြောတဲ့အချိန် စောင့်ပြီး ပြန်ပို့မယ် (၃ ကြိမ်)"""
+        for attempt in range(3):
+            await self._throttle()
+            try:
+                return await method(**kwargs)
+            except RetryAfter as e:
+                delay = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else float(e.retry_after)
+                self.stats["retry_after"] += 1
+                print(f"⏳ Notifier: flood limit, retrying in {delay:.0f}s")
+                self._next_chat_slot = max(self._next_chat_slot, time.monotonic() + delay)
+        raise RuntimeError("Telegram flood limit: giving up after 3 attempts")
+
+    async def _deliver(self, job: tuple):
+        kind = job[0]
+        if kind == "text":
+            await self._call(self.bot.send_message, chat_id=self.chat_id, text=job[1])
+            self.stats["sent"] += 1
+        elif kind == "document":
+            _, data, name, caption = job
+            await self._call(self.bot.send_document, chat_id=self.chat_id, document=data, filename=name, caption=caption)
+            self.stats["sent"] += 1
+        else:
+            await self._deliver_live(job[1])
+
+    async def _deliver_live(self, mission_id: str):
+        entry = self.live.get(mission_id)
+        if entry is None:
+            return
+        # ပို့နေတုန်း ရောက်လာတဲ့ Status တွေအတွက် Queue ကို ပြန်ဖွင့်ထားမယ် (နောက် Edit တစ်ခုထဲ ပါမယ်)
+        entry.queued = False
+        text = entry.render()
+        try:
+            if entry.message_id is None:
+                message = await self._call(self.bot.send_message, chat_id=self.chat_id, text=text)
+                entry.message_id = message.message_id
+                self.stats["sent"] += 1
+            else:
+                try:
+                    await self._call(self.bot.edit_message_text, chat_id=self.chat_id, message_id=entry.message_id, text=text)
+                    self.stats["edited"] += 1
+                except BadRequest as e:
+                    if "not modified" in str(e).lower():
+                        return
+                    # Message ဖျက်ခံရ / Edit လို့မရတော့ရင် Message အသစ်နဲ့ ဆက်မယ်
+                    message = await self._call(self.bot.send_message, chat_id=self.chat_id, text=text)
+                    entry.message_id = message.message_id
+                    self.stats["sent"] += 1
+        finally:
+            if entry.closed and not entry.queued:
+                self.live.pop(mission_id, None)
+
+    async def close(self, timeout: float = 5.0):
+        """Shutdown: စောင့်နေတာတွေကို timeout အတွင်း ပို့ပြီး Worker ကို ရပ်မယ်"""
+        if self._worker is None:
+            return
+        deadline = time.monotonic() + timeout
+        while (self.outbox or self._sending) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+
+    def status(self) -> dict:
+        return {**self.stats, "pending": len(self.outbox), "live_messages": len(self.live)}
 
 # Global Instance
-notifier = Notifier()
\ No newline at end of file
+notifier = Notifier()
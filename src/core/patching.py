@@ -0,0 +1,130 @@
+"""
+Search/Replace Patch Engine (Fix Iteration အတွက်)
+Model က ဖိုင်တစ်ခုလုံး ပြန်မရေးဘဲ ပြင်ရမယ့်နေရာလေးတွေကိုပဲ SEARCH/REPLACE Block နဲ့ ပို့မယ်။
+Local မှာ Exact Line → Whitespace-insensitive → Fuzzy (difflib) အဆင့်ဆင့် Anchor ရှာပြီး Apply မယ်။
+"""
+import difflib
+import re
+
+BLOCK_PATTERN = re.compile(
+    r"<{5,9} SEARCH[^\n]*\n(.*?)\n?={5,9}[^\n]*\n(.*?)\n?>{5,9} REPLACE",
+    re.DOTALL
+)
+
+FUZZY_THRESHOLD = 0.9
+
+
+class PatchError(Exception):
+    """Patch Block ကို Code ထဲမှာ Anchor မရှာနိုင်ရင်"""
+
+
+def parse_search_replace(text: str) -> list:
+    """Response ထဲက (search, replace) Block တွေ"""
+    if not text:
+        return []
+    return [(m.group(1), m.group(2)) for m in BLOCK_PATTERN.finditer(text)]
+
+
+def _indent_of(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _reindent(lines: list, old_indent: str, new_indent: str) -> list:
+    """
+    Model ရဲ့ Indentation နဲ့ ဖိုင်ထဲက Indentation မတူရင် ညှိပေးမယ်
+    (Line တိုင်းကို တူညီတဲ့ Delta နဲ့ ရွှေ့မယ် — Nested Line တွေရဲ့ Relative Indent မပျက်အောင်)
+    """
+    if old_indent == new_indent:
+        return lines
+    if new_indent.startswith(old_indent):
+        extra = new_indent[len(old_indent):]
+        return [extra + line if line.strip() else line for line in lines]
+    if old_indent.startswith(new_indent):
+        cut = len(old_indent) - len(new_indent)
+        return [line[min(cut, len(_indent_of(line))):] for line in lines]
+    # Tab ↔ Space ရောနေရင် Column Width နဲ့ တွက်ပြီး ဖိုင်ရဲ့ Indent Character နဲ့ ပြန်ရေးမယ်
+    delta = len(new_indent.expandtabs(4)) - len(old_indent.expandtabs(4))
+    unit, size = ("\t", 4) if new_indent.startswith("\t") else (" ", 1)
+    fixed = []
+    for line in lines:
+        if not line.strip():
+            fixed.append(line)
+            continue
+        width = max(0, len(_indent_of(line).expandtabs(4)) + delta)
+        fixed.append(unit * (width // size) + " " * (width % size) + line.lstrip())
+    return fixed
+
+
+def _first_indent(lines: list) -> str:
+    return next((_indent_of(l) for l in lines if l.strip()), "")
+
+
+def _locate_lines(code_lines: list, search_lines: list, strip: bool = False):
+    """
+    Line Window Match (strip=True ဆို Whitespace-insensitive) → (start, end) or None
+    Line တစ်ကြောင်းလုံးချင်းပဲ တိုက်မယ် (Substring မဟုတ်)၊ နေရာတစ်ခုထက်ပိုတွေ့ရင် PatchError
+    """
+    clean = (lambda l: l.strip()) if strip else (lambda l: l)
+    target = [clean(l) for l in search_lines]
+    size = len(target)
+    matches = [
+        start for start in range(len(code_lines) - size + 1)
+        if [clean(l) for l in code_lines[start:start + size]] == target
+    ]
+    if len(matches) > 1:
+        raise PatchError(f"SEARCH block is ambiguous ({len(matches)} matches):\n{chr(10).join(search_lines)[:200]}")
+    return (matches[0], matches[0] + size) if matches else None
+
+
+def _locate_fuzzy(code_lines: list, search_lines: list):
+    """difflib ratio အမြင့်ဆုံး Window (FUZZY_THRESHOLD အထက်မှသာ)"""
+    size = len(search_lines)
+    target = "\n".join(l.strip() for l in search_lines)
+    best, best_ratio = None, FUZZY_THRESHOLD
+    for delta in (0, -1, 1):
+        window = size + delta
+        if window <= 0:
+            continue
+        for start in range(len(code_lines) - window + 1):
+            candidate = "\n".join(l.strip() for l in code_lines[start:start + window])
+            matcher = difflib.SequenceMatcher(None, candidate, target)
+            if matcher.real_quick_ratio() <= best_ratio or matcher.quick_ratio() <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best, best_ratio = (start, start + window), ratio
+    return best
+
+
+def apply_block(code: str, search: str, replace: str) -> str:
+    # Empty SEARCH = File အဆုံးမှာ ထပ်ထည့်
+    if not search.strip():
+        return code.rstrip("\n") + "\n" + replace + "\n"
+
+    code_lines = code.split("\n")
+    search_lines = search.split("\n")
+    replace_lines = replace.split("\n")
+
+    # 1. Exact Line Match (Indent ပါ တူမှ — Reindent မလို)
+    span = _locate_lines(code_lines, search_lines)
+    if span is not None:
+        start, end = span
+        return "\n".join(code_lines[:start] + replace_lines + code_lines[end:])
+
+    # 2. Whitespace-insensitive, 3. Fuzzy
+    span = _locate_lines(code_lines, search_lines, strip=True) or _locate_fuzzy(code_lines, search_lines)
+    if span is None:
+        raise PatchError(f"SEARCH block not found:\n{search[:200]}")
+
+    start, end = span
+    replace_lines = _reindent(replace_lines, _first_indent(search_lines), _first_indent(code_lines[start:end]))
+    return "\n".join(code_lines[:start] + replace_lines + code_lines[end:])
+
+
+def apply_search_replace(code: str, blocks: list) -> str:
+    """Block အားလုံး Apply ရမှ အောင်မြင်မယ် (တစ်ခုမှားရင် PatchError)"""
+    if not blocks:
+        raise PatchError("No SEARCH/REPLACE blocks in response")
+    for search, replace in blocks:
+        code = apply_block(code, search, replace)
+    return code
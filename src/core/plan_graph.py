@@ -0,0 +1,138 @@
+"""
+Plan DAG Helpers
+Architect ရဲ့ Plan ကို `depends_on` Edge တွေပါတဲ့ DAG အဖြစ် ကိုင်တွယ်မယ်။
+- Cycle စစ်ခြင်း / ဖြတ်ခြင်း
+- Dependency ပြည့်ပြီးသား (Ready) Task တွေကို Critical Path အရ ဦးစားပေးခြင်း
+- ပြောင်းသွားတဲ့ ဖိုင်ကို မှီခိုနေတဲ့ Dependent တွေ ရှာခြင်း
+"""
+import re
+
+# Error Text ထဲက Path လို Token တွေ (Quote / Space / ":" / "," တွေနဲ့ ခွဲ)
+PATH_TOKEN = re.compile(r"[\w./\\-]+")
+
+
+def normalize_plan(plan: list) -> list:
+    """depends_on ကို List ဖြစ်အောင်၊ Plan ထဲမရှိတဲ့/ကိုယ့်ကိုယ်ကို ညွှန်းတာတွေ ဖယ်မယ်"""
+    files = {t['file'] for t in plan}
+    for task in plan:
+        deps = task.get('depends_on') or []
+        if isinstance(deps, str):
+            deps = [deps]
+        seen = []
+        for dep in deps:
+            if dep in files and dep != task['file'] and dep not in seen:
+                seen.append(dep)
+        task['depends_on'] = seen
+    return plan
+
+
+def find_cycle(plan: list):
+    """Cycle ရှိရင် ဖိုင်စာရင်း (a -> b -> a) ပြန်ပေးမယ်၊ မရှိရင် None"""
+    deps = {t['file']: t.get('depends_on', []) for t in plan}
+    WHITE, GREY, BLACK = 0, 1, 2
+    color = {f: WHITE for f in deps}
+    stack = []
+
+    def visit(node):
+        color[node] = GREY
+        stack.append(node)
+        for dep in deps.get(node, []):
+            if color.get(dep) == GREY:
+                return stack[stack.index(dep):] + [dep]
+            if color.get(dep) == WHITE:
+                cycle = visit(dep)
+                if cycle:
+                    return cycle
+        stack.pop()
+        color[node] = BLACK
+        return None
+
+    for node in deps:
+        if color[node] == WHITE:
+            cycle = visit(node)
+            if cycle:
+                return cycle
+    return None
+
+
+def break_cycles(plan: list) -> list:
+    """Cycle ပိတ်နေတဲ့ Edge တွေကို ဖြတ်မယ်။ ဖြတ်လိုက်တဲ့ (task, dep) စာရင်း ပြန်ပေးမယ်"""
+    removed = []
+    by_file = {t['file']: t for t in plan}
+    cycle = find_cycle(plan)
+    while cycle:
+        # Cycle ရဲ့ နောက်ဆုံး Edge (back-edge) ကို ဖြတ်မယ်
+        task_file, dep = cycle[-2], cycle[-1]
+        by_file[task_file]['depends_on'].remove(dep)
+        removed.append((task_file, dep))
+        cycle = find_cycle(plan)
+    return removed
+
+
+def dependents_of(plan: list, files) -> set:
+    """`files` ကို (တိုက်ရိုက်/သွယ်ဝိုက်) မှီခိုနေတဲ့ ဖိုင်အားလုံး"""
+    reverse = {}
+    for task in plan:
+        for dep in task.get('depends_on', []):
+            reverse.setdefault(dep, set()).add(task['file'])
+    result, frontier = set(), list(files)
+    while frontier:
+        current = frontier.pop()
+        for child in reverse.get(current, ()):
+            if child not in result:
+                result.add(child)
+                frontier.append(child)
+    return result
+
+
+def critical_path_lengths(plan: list) -> dict:
+    """Task တစ်ခုကနေ Sink အထိ အရှည်ဆုံး Chain (Task အရေအတွက်) - ကြီးလေ ဦးစားပေးလေ"""
+    reverse = {t['file']: [] for t in plan}
+    for task in plan:
+        for dep in task.get('depends_on', []):
+            if dep in reverse:
+                reverse[dep].append(task['file'])
+    lengths = {}
+
+    def length(node, trail=()):
+        if node in lengths:
+            return lengths[node]
+        if node in trail:   # Safety: Cycle မဖြတ်ရသေးရင်
+            return 0
+        best = 1 + max((length(child, trail + (node,)) for child in reverse[node]), default=0)
+        lengths[node] = best
+        return best
+
+    for task in plan:
+        length(task['file'])
+    return lengths
+
+
+def ready_tasks(plan: list) -> list:
+    """Dependency အားလုံး 'done' ဖြစ်ပြီးသား Pending Task တွေ (Critical Path ရှည်တာ အရင်)"""
+    status = {t['file']: t['status'] for t in plan}
+    lengths = critical_path_lengths(plan)
+    order = {t['file']: i for i, t in enumerate(plan)}
+    ready = [
+        t for t in plan
+        if t['status'] == 'pending'
+        and all(status.get(dep) == 'done' for dep in t.get('depends_on', []))
+    ]
+    return sorted(ready, key=lambda t: (-lengths.get(t['file'], 1), order[t['file']]))
+
+
+def files_mentioned(plan: list, text: str) -> list:
+    """
+    Error Log / Traceback ထဲမှာ ဖော်ပြထားတဲ့ Plan ဖိုင်တွေ
+    Text ကို Path Token တွေ အရင်ခွဲပြီး Token အပြည့် (သို့) "/" နောက်က Suffix တူမှပဲ ယူမယ်
+    ("main.py" က "p/domain.py" ထဲမှာ မတွေ့ရ၊ "/app/workspace/p/main.py" ဆိုရင်တော့ "p/main.py" တွေ့ရမယ်)
+    """
+    if not text:
+        return []
+    paths = {token.replace("\\", "/").strip("./") for token in PATH_TOKEN.findall(text)}
+    mentioned = []
+    for t in plan:
+        name = t['file'].replace("\\", "/").strip("./")
+        if any(path == name or path.endswith("/" + name) for path in paths):
+            mentioned.append(t['file'])
+    return mentioned
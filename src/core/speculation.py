@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+
+class SpeculativeRunner:
+    """
+    Router ဆုံးဖြတ်နေတုန်း Architect Plan ကို ကြိုတွက်ထားမယ့် Speculative Executor
+    - start(): Background Task အဖြစ် စမယ်
+    - take(): Router က ARCHITECT လို့ဆိုရင် ရလဒ်ကို ယူသုံးမယ် (Hit)
+    - discard(): CHAT/DEPLOY ဆိုရင် Cancel လုပ်ပြီး လွှင့်ပစ်မယ် (Miss)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pending = {}
+        self.done_at = {}       # Task -> ပြီးသွားတဲ့အချိန် (ရလဒ် စောင့်နေခဲ့တဲ့ Idle Time ကို Saved ထဲ မထည့်ဖို့)
+        self.stats = {"started": 0, "hits": 0, "discarded": 0, "saved_s": 0.0, "wasted_s": 0.0}
+
+    def start(self, key: str, coro):
+        if key in self.pending:
+            self.discard(key)
+        task = asyncio.create_task(coro)
+        task.add_done_callback(self._mark_done)
+        self.pending[key] = (task, time.perf_counter())
+        self.stats["started"] += 1
+        print(f"🔮 Speculative {self.name} started ({key})")
+
+    def _mark_done(self, task: asyncio.Task):
+        if not task.cancelled():        # discard() လုပ်ပြီးသား Task တွေ မမှတ်တော့ဘူး
+            self.done_at[task] = time.perf_counter()
+
+    def _finished_at(self, task: asyncio.Task, fallback: float) -> float:
+        return min(self.done_at.pop(task, fallback), fallback)
+
+    async def take(self, key: str):
+        """Speculative ရလဒ်ကို ယူမယ်။ မရှိရင် (သို့) Fail ရင် None"""
+        entry = self.pending.pop(key, None)
+        if entry is None:
+            return None
+        task, started = entry
+        taken_at = time.perf_counter()
+        try:
+            result = await task
+        except Exception as e:
+            print(f"⚠️ Speculative {self.name} failed: {e}. Running normally.")
+            self.stats["wasted_s"] += self._finished_at(task, time.perf_counter()) - started
+            return None
+        # Router နဲ့ တပြိုင်နက် ပြေးခဲ့ရတဲ့ အချိန် = သက်သာသွားတဲ့ Latency (Take မတိုင်ခင် ပြီးသွားရင် ပြီးတဲ့အချိန်အထိပဲ)
+        saved = self._finished_at(task, taken_at) - started
+        self.stats["hits"] += 1
+        self.stats["saved_s"] += saved
+        print(f"🎯 Speculative {self.name} hit: saved {saved:.2f}s")
+        return result
+
+    def discard(self, key: str):
+        entry = self.pending.pop(key, None)
+        if entry is None:
+            return
+        task, started = entry
+        if not task.done():
+            task.cancel()
+        wasted = self._finished_at(task, time.perf_counter()) - started
+        self.stats["discarded"] += 1
+        self.stats["wasted_s"] += wasted
+        print(f"🗑️ Speculative {self.name} discarded after {wasted:.2f}s")
+
+    def report(self) -> dict:
+        started = self.stats["started"]
+        return {
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()},
+            "in_flight": len(self.pending),
+            "hit_rate": round(self.stats["hits"] / started, 3) if started else 0.0,
+            "avg_saved_s": round(self.stats["saved_s"] / self.stats["hits"], 3) if self.stats["hits"] else 0.0,
+        }
+
+# Global Instance
+speculative_architect = SpeculativeRunner("Architect")
@@ -1,17 +1,48 @@
-from typing import TypedDict, List, Annotated
-import operator
+from typing import TypedDict, List, Annotated, Optional, NotRequired
+from config.settings import settings
 
 # Task တစ်ခုရဲ့ ပုံစံ
 class Task(TypedDict):
     file: str
     description: str
-    status: str  # pending, coding, done
+    status: str  # pending, coding, done, failed
+    depends_on: List[str]           # ဒီဖိုင်မတိုင်ခင် ပြီးရမယ့် ဖိုင်များ (Plan DAG Edges)
+    fix_hint: NotRequired[str]      # Self-Healing: ဒီဖိုင်ကို ပြန်ရေးရတဲ့ Error အကြောင်းရင်း
+
+# Parallel Worker တစ်ခုချင်းစီက ပြန်ပို့မယ့် ရလဒ်
+class TaskResult(TypedDict):
+    file: str
+    status: str                     # done, failed
+    code_content: str
+    error_logs: str
+
+def collect_results(left: Optional[list], right: Optional[list]) -> list:
+    """Fan-out Reducer: Worker ရလဒ်တွေ ပေါင်းမယ်၊ None ပို့ရင် (Merge ပြီးသွားရင်) ရှင်းမယ်"""
+    if right is None:
+        return []
+    return (left or []) + right
+
+def bounded_logs(left: Optional[list], right: Optional[list]) -> list:
+    """
+    Ring-buffer Reducer: နောက်ဆုံး STATE_LOGS_LIMIT ခုပဲ State ထဲထားမယ်
+    (Log အပြည့်အစုံကို Brain က Mission Log File ထဲ Append လုပ်ထားတယ်)
+    Node က `state['logs'] + [...]` လို List တစ်ခုလုံး ပြန်ပို့ရင် ထပ်နေတဲ့ Prefix ကို ဖြုတ်မယ်
+    ⚠️ Pure ဖြစ်ရမယ်: LangGraph က Conditional Edge တွက်ဖို့ Copy ပေါ်မှာလည်း ခေါ်တယ်
+    """
+    left = left or []
+    right = right or []
+    if left and right[:len(left)] == left and (len(left) > 1 or len(right) > 1):
+        right = right[len(left):]
+    merged = left + right
+    return merged[-settings.STATE_LOGS_LIMIT:]
 
 # Agent တစ်ခုလုံးရဲ့ မှတ်ဉာဏ်ပုံစံ
 class AgentState(TypedDict):
     mission: str                    # User ခိုင်းလိုက်တဲ့ အလုပ်
     plan: List[Task]                # လုပ်ရမယ့် Task စာရင်း
     current_task: Task              # လက်ရှိလုပ်နေတဲ့ Task
+    active_tasks: List[Task]        # တပြိုင်နက် Run နေတဲ့ Task Batch (Fan-out)
+    task_results: Annotated[List[TaskResult], collect_results] # Worker ရလဒ်များ (Fan-in)
     code_content: str               # ရေးပြီးသား Code
     error_logs: str                 # Error တက်ခဲ့ရင် မှတ်ဖို့
     retry_count: int                # ဘယ်နှခါ ပြန်ကြိုးစားပြီးပြီလဲ
@@ -19,4 +50,4 @@ class AgentState(TypedDict):
     created_files: List[str]        # ဖန်တီးလိုက်တဲ့ ဖိုင်စာရင်း
     subdomain: str                  # Web App နာမည် (URL အတွက်)
     final_report: str               # နောက်ဆုံး User ကို ပြမယ့်စာ
-    logs: Annotated[List[str], operator.add] # Log တွေ ပေါင်းထည့်သွားမယ်
\ No newline at end of file
+    logs: Annotated[List[str], bounded_logs] # Log တွေ ပေါင်းထည့်သွားမယ် (နောက်ဆုံး N ခု)
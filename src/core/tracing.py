@@ -0,0 +1,250 @@
+"""
+Mission Tracing (Chrome Trace / Perfetto JSON)
+Graph Node / Agent / LLM Call / Docker / Subprocess တိုင်းကို Span အဖြစ်မှတ်မယ်။
+Span တစ်ခုမှာ Wall Time, Queue Wait, Payload Size တွေ ပါမယ်။
+Export လုပ်ထားတဲ့ JSON ကို chrome://tracing (သို့) ui.perfetto.dev မှာ ဖွင့်ကြည့်လို့ရတယ်။
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from src.core.missions import current_mission_id
+from config.settings import settings
+
+_current_span: ContextVar = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "cat", "start", "end", "lane", "parent", "args")
+
+    def __init__(self, name: str, cat: str, lane: str, parent, args: dict):
+        self.name = name
+        self.cat = cat
+        self.start = time.perf_counter()
+        self.end = None
+        self.lane = lane
+        self.parent = parent
+        self.args = args
+
+    def set(self, **args):
+        """Span ပြီးခါနီးမှ သိရတဲ့ Payload Size / Result တွေ ထပ်ထည့်မယ်"""
+        self.args.update(args)
+
+    @property
+    def duration(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start)
+
+
+class _NullSpan:
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+
+class MissionTrace:
+    def __init__(self, mission_id: str):
+        self.mission_id = mission_id
+        self.origin = time.perf_counter()
+        self.wall_origin = time.time()
+        self.spans = []
+        self.dropped = 0
+
+
+class Tracer:
+    """
+    Mission တစ်ခုချင်းစီရဲ့ Span တွေကို Memory ထဲမှာ စုမယ် (current_mission_id နဲ့ ခွဲမယ်)
+    - span(): Context Manager (Sync / Async Code နှစ်မျိုးလုံးမှာ သုံးလို့ရ)
+    - export(): Chrome Trace JSON
+    - summary(): Critical Path + Category အလိုက် အချိန်
+    """
+
+    MAX_SPANS = 20000       # Mission တစ်ခုမှာ မှတ်မယ့် Span အများဆုံး
+    MAX_MISSIONS = 50       # Memory ထဲမှာ ထားမယ့် Trace အရေအတွက်
+
+    def __init__(self):
+        self.enabled = settings.TRACING_ENABLED
+        self.traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _trace(self, mission_id: str, create: bool = True):
+        trace = self.traces.get(mission_id)
+        if trace is None and create:
+            trace = self.traces[mission_id] = MissionTrace(mission_id)
+            while len(self.traces) > self.MAX_MISSIONS:
+                self.traces.popitem(last=False)
+        return trace
+
+    @staticmethod
+    def _lane() -> str:
+        """Parallel Worker တစ်ခုချင်းစီကို Trace ထဲမှာ သီးသန့် Row (tid) ပြမယ်"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            return f"task-{id(task)}"
+        return f"thread-{threading.get_ident()}"
+
+    @contextmanager
+    def span(self, name: str, cat: str = "code", /, **args):
+        mission_id = current_mission_id.get()
+        if not self.enabled or not mission_id:
+            yield _NULL_SPAN
+            return
+        parent = _current_span.get()
+        span = Span(name, cat, self._lane(), parent, args)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.args["error"] = f"{type(e).__name__}: {str(e)[:200]}"
+            raise
+        finally:
+            span.end = time.perf_counter()
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                pass    # Async Generator ကို တခြား Context ကနေ ပိတ်လိုက်ရင်
+            with self._lock:
+                trace = self._trace(mission_id)
+                if len(trace.spans) < self.MAX_SPANS:
+                    trace.spans.append(span)
+                else:
+                    trace.dropped += 1
+
+    def start_mission(self, mission_id: str):
+        if self.enabled:
+            with self._lock:
+                self._trace(mission_id)
+
+    # --- Export ---
+    def export(self, mission_id: str) -> dict:
+        """Chrome Trace Event Format (Complete "X" Events, Microseconds)"""
+        trace = self.traces.get(mission_id)
+        if trace is None:
+            return None
+        events, lanes = [], {}
+        for span in sorted(trace.spans, key=lambda s: s.start):
+            tid = lanes.setdefault(span.lane, len(lanes) + 1)
+            events.append({
+                "name": span.name,
+                "cat": span.cat,
+                "ph": "X",
+                "ts": round((span.start - trace.origin) * 1e6),
+                "dur": round(span.duration * 1e6),
+                "pid": 1,
+                "tid": tid,
+                "args": {**span.args, **({"parent": span.parent.name} if span.parent else {})},
+            })
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": mission_id}})
+        for lane, tid in lanes.items():
+            label = "main" if tid == 1 else f"worker-{tid - 1}"
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": label}})
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"mission_id": mission_id, "started_at": trace.wall_origin, "dropped_spans": trace.dropped},
+        }
+
+    def summary(self, mission_id: str) -> dict:
+        """
+        Critical Path: Mission အဆုံးကနေ နောက်ပြန်လိုက်ပြီး အဲ့အချိန်မှာ နောက်ဆုံးပြီးတဲ့ Node ကို ရွေးမယ်
+        (Parallel Wave ထဲမှာ အနှေးဆုံး Worker ပဲ Critical Path ပေါ်ရောက်မယ်)
+        Node တစ်ခုချင်းစီရဲ့ အချိန်ကို llm / docker / subprocess / queue_wait လို့ ခွဲပြမယ်
+        """
+        trace = self.traces.get(mission_id)
+        if trace is None:
+            return None
+        spans = list(trace.spans)
+        nodes = sorted((s for s in spans if s.cat == "node"), key=lambda s: s.end)
+        if not nodes:
+            return {"mission_id": mission_id, "wall_ms": 0, "critical_path": []}
+
+        path, cursor = [], float("inf")
+        for span in reversed(nodes):
+            if span.end <= cursor + 1e-6:
+                path.append(span)
+                cursor = span.start
+        path.reverse()
+
+        def owner(span: Span):
+            """Span ကို ခေါ်ခဲ့တဲ့ Node (gather နဲ့ ခွဲထားတဲ့ Task တွေလည်း Parent Chain နဲ့ လိုက်မယ်)"""
+            while span is not None and span.cat != "node":
+                span = span.parent
+            return span
+
+        parts_by_node = defaultdict(lambda: defaultdict(float))
+        for s in spans:
+            node = owner(s.parent) if s.cat not in ("node", "agent") else None
+            if node is not None:
+                parts_by_node[id(node)][s.cat] += s.duration * 1000
+                parts_by_node[id(node)]["queue_wait"] += s.args.get("queue_wait_ms", 0)
+
+        def breakdown(node: Span) -> dict:
+            return {k: round(v, 1) for k, v in parts_by_node[id(node)].items() if v}
+
+        by_cat = defaultdict(float)
+        for s in spans:
+            if s.cat not in ("node", "agent"):
+                by_cat[s.cat] += s.duration * 1000
+        wall = max(s.end for s in spans) - min(s.start for s in spans)
+        return {
+            "mission_id": mission_id,
+            "wall_ms": round(wall * 1000, 1),
+            "critical_path_ms": round(sum(s.duration for s in path) * 1000, 1),
+            "critical_path": [
+                {"node": s.name, "ms": round(s.duration * 1000, 1), "breakdown": breakdown(s), **s.args}
+                for s in path
+            ],
+            "time_by_category_ms": {k: round(v, 1) for k, v in sorted(by_cat.items(), key=lambda kv: -kv[1])},
+            "spans": len(spans),
+        }
+
+    def save(self, mission_id: str):
+        """Mission ပြီးရင် Trace File ထုတ်မယ် (TRACE_DIR/<mission>.trace.json)"""
+        data = self.export(mission_id)
+        if data is None:
+            return None
+        data["otherData"]["summary"] = self.summary(mission_id)
+        try:
+            os.makedirs(settings.TRACE_DIR, exist_ok=True)
+            path = os.path.join(settings.TRACE_DIR, f"{mission_id}.trace.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+            return path
+        except Exception as e:
+            print(f"⚠️ Trace Export Error: {e}")
+            return None
+
+    def load(self, mission_id: str):
+        """Memory ထဲမှာ မရှိတော့ရင် File ကနေ ဖတ်မယ်"""
+        if mission_id in self.traces:
+            data = self.export(mission_id)
+            data["otherData"]["summary"] = self.summary(mission_id)
+            return data
+        path = os.path.join(settings.TRACE_DIR, f"{mission_id}.trace.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+# Global Instance
+tracer = Tracer()
+
+
+def payload_size(value) -> int:
+    """Span Args အတွက် အကြမ်းဖျဉ်း Payload Size (chars)"""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(payload_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(v) for v in value)
+    return len(str(value))
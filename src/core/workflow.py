@@ -1,8 +1,13 @@
+import time
+import random
+import asyncio
+import inspect
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+from langchain_core.runnables import RunnableConfig
 from src.core.state import AgentState
-from src.core.llm import llm_engine
+from src.core.llm import llm_engine, no_tools_config
 from config.settings import settings
-from google import genai
 
 # Agent တွေကို Import လုပ်မယ်
 from src.agents.architect import ArchitectAgent
@@ -11,9 +16,11 @@ from src.agents.coder import CoderAgent
 from src.agents.debugger import DebuggerAgent
 from src.agents.deployer import DeployerAgent
 from src.agents.tester import TesterAgent
-import asyncio
 from src.core.notifier import notifier
-from google.genai.types import GenerateContentConfig, HttpOptions, HttpRetryOptions
+from src.core.intent import intent_classifier
+from src.core.speculation import speculative_architect
+from src.memory.blob_store import blob_store
+from src.core.tracing import tracer, payload_size
 
 # Agent Instance တွေ ဆောက်မယ်
 architect = ArchitectAgent()
@@ -24,12 +31,86 @@ deployer = DeployerAgent()
 tester = TesterAgent()
 
 # --- Router Logic (New) ---
-def intent_analyzer(state: AgentState):
+def speculation_key(state: AgentState, config: RunnableConfig) -> str:
+    return (config or {}).get("configurable", {}).get("thread_id") or state['mission']
+
+async def intent_analyzer(state: AgentState, config: RunnableConfig):
     """Entry Node: User ရဲ့ ရည်ရွယ်ချက်ကို သုံးသပ်မည့် နေရာ"""
     print(f"🚦 Analyzing Intent: '{state['mission']}'")
-    return state
 
-def route_init(state: AgentState):
+    # 🔮 Speculative Mode: Local Classifier မသေချာမှ (LLM Router ခေါ်ရမှာမို့) Architect ကို ကြိုစမယ်
+    if settings.SPECULATIVE_ARCHITECT:
+        _, confidence = intent_classifier.classify(state['mission'])
+        if not intent_classifier.is_confident(confidence):
+            speculative_architect.start(speculation_key(state, config), architect.execute(dict(state)))
+    return {}
+
+async def architect_node(state: AgentState, config: RunnableConfig):
+    """Speculative Plan ရှိရင် ယူသုံးမယ်၊ မရှိရင် ပုံမှန် Architect"""
+    result = await speculative_architect.take(speculation_key(state, config))
+    if result is not None:
+        return result
+    return await architect.execute(state)
+
+async def llm_route(mission: str, local_label: str = "", confidence: float = 0.0, source: str = "router") -> str:
+    """Gemini Router (Local Classifier မသေချာတဲ့အခါမှ ခေါ်မယ်)"""
+    prompt = f"""
+    Analyze User Input and classify into ONE category:
+
+    1. [DEPLOY]
+       - Keywords: "run", "start", "stop", "kill", "delete", "remove", "launch"
+       - Intent: Execute, stop or manage containers. NO new code.
+
+    2. CHAT
+       - Keywords: "hello", "hi", "how are you", "thanks", "who are you", "explain", "help"
+       - Intent: General conversation, greeting, or non-coding questions.
+
+    3. ARCHITECT
+       - Default for everything else.
+
+    User Input: "{mission}"
+    Instruction: Output ONLY the category name (DEPLOY, CHAT, or ARCHITECT).
+    """
+    
+    # 🔥 Async Gateway (Pooled Client, ONE SHOT, NO TOOLS)
+    started = time.perf_counter()
+    response_text = await llm_engine.generate(
+        prompt,
+        model=settings.MODEL_CODER,
+        config=no_tools_config(temperature=0.1),
+        agent="router"
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    raw = response_text.strip().upper()
+    decision = next((label for label in ("DEPLOY", "CHAT") if label in raw), "ARCHITECT")
+    
+    intent_classifier.log_decision(mission, decision, elapsed_ms, local_label, confidence, source=source)
+    return decision
+
+_shadow_tasks = set()
+
+def shadow_route(mission: str, local_label: str, confidence: float):
+    """
+    Fast-path ဆုံးဖြတ်ချက်ကို INTENT_SHADOW_RATE အချိုးနဲ့ LLM Router ဆီ Background မှာ ထပ်မေးပြီး Log မယ်
+    (Mission က မစောင့်ဘူး၊ Cassette Record / Replay မှာ မလုပ်ဘူး — Tape မပြောင်းအောင်)
+    """
+    if settings.INTENT_SHADOW_RATE <= 0 or random.random() >= settings.INTENT_SHADOW_RATE:
+        return
+    if llm_engine.cassette.recording or llm_engine.cassette.replaying:
+        return
+
+    async def run():
+        try:
+            await llm_route(mission, local_label, confidence, source="shadow")
+        except Exception as e:
+            print(f"⚠️ Shadow Router Error: {e}")
+
+    task = asyncio.create_task(run())
+    _shadow_tasks.add(task)
+    task.add_done_callback(_shadow_tasks.discard)
+
+async def route_init(state: AgentState, config: RunnableConfig):
     """
     Jarvis Router: User ရည်ရွယ်ချက်ကို Gemini Flash သုံးပြီး ခွဲခြားမယ်။
     """
@@ -37,48 +118,19 @@ def route_init(state: AgentState):
     print(f"🚦 Jarvis Router: Analyzing '{mission}'...")
 
     try:
-        # 🔥 FIX 1: Get Key manually to pass into Client options
-        current_key = llm_engine.key_manager.get_next_key()
-        
-        # 🔥 FIX 2: Create Client with NO AUTO RETRY
-        client = genai.Client(
-            api_key=current_key,
-            http_options=HttpOptions(
-                retry_options=HttpRetryOptions(attempts=1) # 🛑 ONE SHOT ONLY
-            )
-        )
-        
-        prompt = f"""
-        Analyze User Input and classify into ONE category:
-
-        1. [DEPLOY]
-           - Keywords: "run", "start", "stop", "kill", "delete", "remove", "launch"
-           - Intent: Execute, stop or manage containers. NO new code.
-
-        2. CHAT
-           - Keywords: "hello", "hi", "how are you", "thanks", "who are you", "explain", "help"
-           - Intent: General conversation, greeting, or non-coding questions.
-
-        3. ARCHITECT
-           - Default for everything else.
-
-        User Input: "{mission}"
-        Instruction: Output ONLY the category name (DEPLOY, CHAT, or ARCHITECT).
-        """
-        
-        # 🔥 FIX 3: Disable AFC (Function Calling)
-        response = client.models.generate_content(
-            model=settings.MODEL_CODER, 
-            contents=prompt,
-            config=GenerateContentConfig(
-                temperature=0.1,
-                tools=[], 
-                tool_config={'function_calling_config': {'mode': 'NONE'}} # 🛑 NO TOOLS
-            )
-        )
+        # ⚡ Fast-path: Local Classifier က သေချာရင် Gemini Router ကို မခေါ်တော့ဘူး
+        local_label, confidence = intent_classifier.classify(mission)
+        if intent_classifier.is_confident(confidence):
+            decision = local_label
+            print(f"⚡ Fast-path Decision: {decision} (confidence {confidence:.2f})")
+            shadow_route(mission, local_label, confidence)
+        else:
+            decision = await llm_route(mission, local_label, confidence)
+            print(f"🤖 Jarvis Decision: {decision}")
         
-        decision = response.text.strip().upper()
-        print(f"🤖 Jarvis Decision: {decision}")
+        if decision != "ARCHITECT":
+            # 🗑️ Router က Code မရေးဘူးလို့ ဆုံးဖြတ်ရင် Speculative Plan ကို လွှင့်ပစ်မယ်
+            speculative_architect.discard(speculation_key(state, config))
         
         if "DEPLOY" in decision:
             return "deployer"
@@ -92,20 +144,14 @@ def route_init(state: AgentState):
             Reply nicely in Burmese (Myanmar).
             """
             
-            reply = client.models.generate_content(
-                model=settings.MODEL_CODER, 
-                contents=chat_prompt,
-                config=GenerateContentConfig(
-                    temperature=0.7,
-                    tools=[],
-                    tool_config={'function_calling_config': {'mode': 'NONE'}}
-                )
+            reply = await llm_engine.generate(
+                chat_prompt,
+                model=settings.MODEL_CODER,
+                config=no_tools_config(temperature=0.7),
+                agent="chat"
             )
             
-            try:
-                loop = asyncio.get_event_loop()
-                loop.create_task(notifier.send_status(f"💬 Jarvis: {reply.text}"))
-            except: pass
+            await notifier.send_status(f"💬 Jarvis: {reply}", live=False)
             
             return END 
             
@@ -117,6 +163,69 @@ def route_init(state: AgentState):
         # Error တက်ရင် Architect ဆီပဲ လွှတ်လိုက်မယ် (System မရပ်သွားအောင်)
         return "architect"
 
+# --- Parallel Task Workers (Fan-out / Fan-in) ---
+async def build_task(state: AgentState):
+    """
+    Fan-out Worker: Plan Task တစ်ခုအတွက် Coder → Debugger ကို သီးသန့် Run မယ်။
+    Worker တွေ တပြိုင်နက်ပြေးလို့ Shared State ကို မထိဘဲ `task_results` ထဲပဲ ရလဒ်ထည့်မယ်။
+    """
+    task = dict(state['current_task'])
+    local = {
+        **state,
+        "current_task": task,
+        "plan": [dict(t) for t in state.get('plan', [])],
+        "created_files": list(state.get('created_files', [])),
+    }
+
+    with tracer.span("coder", "agent", file=task['file']) as span:
+        local.update(await coder.execute(local))
+        span.set(code_chars=payload_size(local.get("code_content")))
+    with tracer.span("debugger", "agent", file=task['file']) as span:
+        result = await debugger.execute(local)
+        span.set(failed=bool(result.get("error_logs")))
+
+    error_logs = result.get("error_logs", "")
+    return {
+        "task_results": [{
+            "file": task['file'],
+            "status": "failed" if error_logs else "done",
+            "code_content": result.get("code_content", local.get("code_content", "")),
+            "error_logs": error_logs,
+        }],
+        "logs": result.get("logs", []),
+    }
+
+def merge_results(state: AgentState):
+    """
+    Fan-in Node: Worker ရလဒ်တွေကို plan / created_files ထဲ ပြန်ပေါင်းမယ်
+    (code_content ကို မထိဘူး — Parallel Task တွေထဲက နောက်ဆုံးရောက်တဲ့ ဖိုင်က ကျပန်းဖြစ်လို့၊ ဖိုင်အလိုက် Code က task_results / Disk မှာ)
+    """
+    results = state.get("task_results", [])
+    by_file = {r['file']: r for r in results}
+
+    plan = []
+    for t in state.get('plan', []):
+        if t['file'] in by_file:
+            t = {**t, "status": by_file[t['file']]['status']}
+            if t['status'] == 'done':
+                t.pop('fix_hint', None)
+        plan.append(t)
+    created_files = list(state.get('created_files', []))
+    for r in results:
+        if r['file'] not in created_files:
+            created_files.append(r['file'])
+
+    errors = [f"[{r['file']}]\n{r['error_logs']}" for r in results if r['error_logs']]
+    print(f"🧩 Merged {len(results)} task results ({len(errors)} failed).")
+
+    return {
+        "plan": plan,
+        "created_files": created_files,
+        "error_logs": "\n\n".join(errors),
+        "active_tasks": [],
+        "task_results": None,   # Reducer Reset
+    }
+
 # --- Flow Logic ---
 def route_tech_lead(state: AgentState):
     """Tech Lead က ဆုံးဖြတ်မယ်: Task ကျန်သေးလား? ပြီးပြီလား?"""
@@ -126,15 +235,25 @@ def route_tech_lead(state: AgentState):
     if "Critical Failure" in final_report:
         return END
 
-    if state.get("current_task"):
-        return "coder"
+    # ⚡ Batch ထဲက Task တစ်ခုစီကို Worker တစ်ခုစီဆီ တပြိုင်နက် ပို့မယ် (LangGraph Send)
+    active_tasks = state.get("active_tasks") or []
+    if active_tasks:
+        return [Send("build_task", {**state, "current_task": task}) for task in active_tasks]
     else:
         return "deployer"
 
+def route_merge(state: AgentState):
+    """Debugger မှာတင် Fail ဖြစ်ရင် Test မလုပ်တော့ဘဲ Tech Lead ဆီ တန်းပြန်မယ်"""
+    if state.get("error_logs"):
+        return "tech_lead"
+    return "tester"
+
 def route_tester(state: AgentState):
-    """Tester က Error တွေ့ရင် Tech Lead ဆီပြန်၊ မတွေ့ရင် Deployer ဆီဆက်သွား"""
+    """Tester က Error တွေ့ရင် Tech Lead ဆီပြန်၊ Task ကျန်သေးရင် Tech Lead ဆီပြန်၊ မဟုတ်ရင် Deployer ဆီဆက်သွား"""
     if state.get("error_logs"):
         return "tech_lead" # ❌ Fail -> Fix
+    elif any(t['status'] == 'pending' for t in state.get('plan', [])):
+        return "tech_lead" # ⏭️ Next Batch
     else:
         return "deployer"        
 
@@ -145,19 +264,52 @@ def route_deployment(state: AgentState):
     else:
         return END # ✅ Finish        
 
+# --- Blob Offloading ---
+def with_blobs(fn):
+    """
+    Node Wrapper: Checkpoint ထဲမှာ blob:// Reference ပဲ သိမ်းပြီး Agent တွေကို Content အပြည့်ပေးမယ်
+    - ဝင်ခါနီး: code_content / error_logs Reference တွေကို Resolve
+    - ထွက်ခါနီး: ကြီးတဲ့ Field တွေကို Blob Store ထဲ Offload
+    """
+    accepts_config = "config" in inspect.signature(fn).parameters
+
+    async def node(state: AgentState, config: RunnableConfig):
+        resolved = blob_store.resolve_state(state)
+        result = fn(resolved, config) if accepts_config else fn(resolved)
+        if inspect.isawaitable(result):
+            result = await result
+        return blob_store.offload_update(result)
+
+    node.__name__ = getattr(fn, "__name__", "node")
+    return node
+
+def traced(name: str, fn):
+    """Node Wrapper: Node တစ်ခုလုံးကို Span အဖြစ်မှတ်မယ် (Wall Time + State In/Out Size)"""
+    async def node(state: AgentState, config: RunnableConfig):
+        with tracer.span(name, "node", state_chars=payload_size(state)) as span:
+            task = state.get("current_task") if name == "build_task" else None
+            if task:
+                span.set(file=task.get("file"))
+            result = await fn(state, config)
+            span.set(update_chars=payload_size(result))
+            return result
+
+    node.__name__ = name
+    return node
+
 # --- Graph Construction ---
 workflow = StateGraph(AgentState)
 
 # Node တွေ ထည့်မယ်
-workflow.add_node("architect", architect.execute)
-workflow.add_node("tech_lead", tech_lead.execute)
-workflow.add_node("coder", coder.execute)
-workflow.add_node("debugger", debugger.execute)
-workflow.add_node("tester", tester.execute)
-workflow.add_node("deployer", deployer.execute)
+workflow.add_node("architect", traced("architect", with_blobs(architect_node)))
+workflow.add_node("tech_lead", traced("tech_lead", with_blobs(tech_lead.execute)))
+workflow.add_node("build_task", traced("build_task", with_blobs(build_task)))      # Coder → Debugger (Parallel Worker)
+workflow.add_node("merge_results", traced("merge_results", with_blobs(merge_results)))
+workflow.add_node("tester", traced("tester", with_blobs(tester.execute)))
+workflow.add_node("deployer", traced("deployer", with_blobs(deployer.execute)))
 
 # လမ်းကြောင်းတွေ ဆက်မယ် (Edges)
-workflow.add_node("intent_analyzer", intent_analyzer)
+workflow.add_node("intent_analyzer", traced("intent_analyzer", intent_analyzer))
 
 # 🔥 FIX: ဝင်ဝင်ချင်း Architect ဆီမသွားဘဲ Router ဆီ အရင်သွားမယ်
 workflow.set_entry_point("intent_analyzer")
@@ -165,7 +317,7 @@ workflow.set_entry_point("intent_analyzer")
 # Router ကနေ လမ်းခွဲမယ် (Conditional Edges)
 workflow.add_conditional_edges(
     "intent_analyzer",
-    route_init,
+    traced("router", route_init),
     {
         "architect": "architect", # Code ရေးစရာရှိရင် ဒီလမ်း
         "deployer": "deployer",    # Run ရုံဆိုရင် Express လမ်း
@@ -175,23 +327,30 @@ workflow.add_conditional_edges(
 
 workflow.add_edge("architect", "tech_lead")
 
-# ✅ ဒီလိုလေး ပြောင်းလိုက်ပါ
+# ✅ Tech Lead -> Send Fan-out (Worker များ) / Deployer / END
 workflow.add_conditional_edges(
     "tech_lead",
-    route_tech_lead
-    # Dictionary မထည့်တော့ဘူး (Auto detect လုပ်ခိုင်းမယ်)
+    route_tech_lead,
+    ["build_task", "deployer", END]
 )
 
-# Coder -> Debugger (ရေးပြီးရင် အမှားစစ်)
-workflow.add_edge("coder", "debugger")
+# Workers -> Fan-in (Worker အားလုံးပြီးမှ တစ်ခါပဲ Run မယ်)
+workflow.add_edge("build_task", "merge_results")
 
-workflow.add_edge("debugger", "tester")
+workflow.add_conditional_edges(
+    "merge_results",
+    route_merge,
+    {
+        "tech_lead": "tech_lead", # Syntax Fix မရရင် ပြန်ပြင်
+        "tester": "tester"
+    }
+)
 
 workflow.add_conditional_edges(
     "tester",
     route_tester,
     {
-        "tech_lead": "tech_lead", # Error ရှိရင် ပြန်ပြင်
+        "tech_lead": "tech_lead", # Error ရှိရင် ပြန်ပြင် / နောက် Batch
         "deployer": "deployer"   
     }
 )
@@ -1,14 +1,20 @@
 import os
+import json
+import hmac
+import secrets
 import asyncio
 import logging
 import uvicorn
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 # Import Brain & Telegram Bot
 from src.brain import SeniorEngineerBrain
-from telegram.ext import ApplicationBuilder, MessageHandler, filters
+from src.core.chat_dispatch import ChatDispatcher
+from src.core.notifier import notifier
+from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters
 from telegram import Update
 
 load_dotenv()
@@ -21,6 +27,19 @@ logger = logging.getLogger(__name__)
 # --- Configuration ---
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 ALLOWED_USER_ID = int(os.getenv("ALLOWED_USER_ID", 0))
+# polling (Default) | webhook (Update တွေကို ဒီ FastAPI Server ပေါ်က Route ကနေ လက်ခံမယ်၊ Polling Loop မလို)
+TELEGRAM_MODE = os.getenv("TELEGRAM_MODE", "polling").lower()
+# Public Base URL (ဥပမာ https://jarvis.thukha.online) — ပေးထားရင် Startup မှာ setWebhook လုပ်မယ်၊ မပေးရင် Register မလုပ်ဘူး (Local Harness)
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "")
+TELEGRAM_WEBHOOK_PATH = "/telegram/webhook"
+# X-Telegram-Bot-Api-Secret-Token Header နဲ့ စစ်မယ် (မပေးရင် Startup တိုင်း Random တစ်ခု ထုတ်ပြီး setWebhook မှာ ပို့မယ်)
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+# Webhook နဲ့ရောက်လာတဲ့ Raw Update တွေကို JSONL မှတ်မယ် (Harness နဲ့ ပြန် Post ဖို့)
+TELEGRAM_UPDATE_LOG = os.getenv("TELEGRAM_UPDATE_LOG", "")
+# Update တွေကို ပြိုင်တူ ဘယ်နှခု Process မလဲ (/cancel လို Command တွေ Mission နောက်မှာ မစောင့်ရအောင်)
+TELEGRAM_CONCURRENT_UPDATES = int(os.getenv("TELEGRAM_CONCURRENT_UPDATES", 32))
+# Reply မပို့ရသေးတဲ့ Mission အများဆုံး (ကျော်ရင် Busy ပြန်ပြောမယ်)
+TELEGRAM_MAX_IN_FLIGHT = int(os.getenv("TELEGRAM_MAX_IN_FLIGHT", 8))
 API_PORT = int(os.getenv("PORT", 8000))
 
 # --- Global State (Initially None) ---
@@ -29,9 +48,15 @@ app_state = {
     "brain": None, 
     "telegram_app": None
 }
+# Chat တစ်ခုချင်းစီမှာ အစဉ်ထိန်း + In-flight Limit
+chat_dispatcher = ChatDispatcher(TELEGRAM_MAX_IN_FLIGHT)
 
 # --- Telegram Logic ---
 async def telegram_handler(update: Update, context):
+    """
+    Mission ကို Queue ထဲထည့်ပြီး "⏳ Queued (#N)" ချက်ချင်းပြန်မယ်၊ Report ကို နောက်မှ Reply ပို့မယ်
+    (Handler က Mission ကို မစောင့်တော့လို့ Update တစ်ခုက နောက် Update တွေကို မပိတ်တော့ဘူး)
+    """
     if update.effective_user.id != ALLOWED_USER_ID:
         return
     
@@ -41,30 +66,81 @@ async def telegram_handler(update: Update, context):
         await update.message.reply_text("⚠️ Brain is initializing... Please wait.")
         return
 
-    await context.bot.send_chat_action(chat_id=update.effective_chat.id, action='typing')
-    
     # Global state ထဲက brain ကိုလှမ်းခေါ်မယ်
-    response = await app_state["brain"].think_and_reply(user_text)
-    
-    if len(response) > 4000:
+    brain = app_state["brain"]
+    message = update.message
+
+    async def submit():
+        return await brain.submit(user_text, user_id=str(update.effective_user.id))
+
+    async def ack(mission):
+        position = brain.executor.position(mission.id)
+        status = f"⏳ Queued (#{position})" if position else "🚀 Started"
+        await message.reply_text(f"{status} — {mission.id}")
+
+    async def reply(response: str):
+        # Mission တွေ ပြိုင်တူ Run လို့ ဘယ် Message ရဲ့ Reply လဲ သိသာအောင် Quote လုပ်မယ်
         for x in range(0, len(response), 4000):
-            await update.message.reply_text(response[x:x+4000])
+            await message.reply_text(response[x:x+4000], do_quote=True)
+
+    if not await chat_dispatcher.dispatch(update.effective_chat.id, submit, ack, reply):
+        await message.reply_text(
+            f"🚦 Busy: {chat_dispatcher.in_flight} missions in flight. Try again shortly or /cancel."
+        )
+
+async def telegram_cancel_handler(update: Update, context):
+    """/cancel = ကိုယ့် Mission အားလုံး, /cancel <mission_id> = တစ်ခုတည်း"""
+    if update.effective_user.id != ALLOWED_USER_ID:
+        return
+    brain = app_state["brain"]
+    if not brain:
+        await update.message.reply_text("⚠️ Brain is initializing... Please wait.")
+        return
+
+    if context.args:
+        cancelled = [m for m in context.args if await brain.cancel(m, reason="cancelled via Telegram")]
+    else:
+        cancelled = await brain.cancel_user(str(update.effective_user.id), reason="cancelled via Telegram")
+    if cancelled:
+        await update.message.reply_text("🛑 Cancelling:\n" + "\n".join(cancelled))
     else:
-        await update.message.reply_text(response)
+        await update.message.reply_text("ℹ️ No running or queued missions to cancel.")
+
+def build_telegram_app(token: str, webhook: bool = False, base_url: str = None):
+    """Handler + Concurrency Config (Load Test ကလည်း ဒါကိုပဲ သုံးမယ်)"""
+    builder = ApplicationBuilder().token(token).concurrent_updates(TELEGRAM_CONCURRENT_UPDATES)
+    if webhook:
+        builder = builder.updater(None)     # Webhook Mode မှာ Updater (getUpdates Loop) မလို
+    if base_url:
+        builder = builder.base_url(base_url)
+    application = builder.build()
+    application.add_handler(CommandHandler("cancel", telegram_cancel_handler))
+    application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), telegram_handler))
+    return application
 
 async def start_telegram():
     if not TELEGRAM_TOKEN:
         logger.warning("⚠️ No TELEGRAM_TOKEN found.")
         return
 
-    application = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
-    application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), telegram_handler))
+    webhook = TELEGRAM_MODE == "webhook"
+    application = build_telegram_app(TELEGRAM_TOKEN, webhook=webhook)
     
-    app_state["telegram_app"] = application
-    logger.info("🚀 Telegram Bot Started (Polling)...")
     await application.initialize()
     await application.start()
-    await application.updater.start_polling()
+    # Start ပြီးမှ Route ကို ဖွင့်မယ် (အဲ့မတိုင်ခင် 503 ပြန်ရင် Telegram က ပြန်ပို့မယ်)
+    app_state["telegram_app"] = application
+    if not webhook:
+        logger.info("🚀 Telegram Bot Started (Polling)...")
+        await application.updater.start_polling()
+        return
+
+    if TELEGRAM_WEBHOOK_URL:
+        url = TELEGRAM_WEBHOOK_URL.rstrip("/") + TELEGRAM_WEBHOOK_PATH
+        await application.bot.set_webhook(url=url, secret_token=TELEGRAM_WEBHOOK_SECRET, allowed_updates=Update.ALL_TYPES)
+        logger.info(f"🚀 Telegram Bot Started (Webhook: {url})")
+    else:
+        logger.info(f"🚀 Telegram Bot Started (Webhook route {TELEGRAM_WEBHOOK_PATH}, not registered with Telegram)")
 
 # --- FastAPI Lifecycle (The Magic Fix) ---
 @asynccontextmanager
@@ -72,6 +148,11 @@ async def lifespan(app: FastAPI):
     # 🔥 Server Run မှ Brain ကို တစ်ခါတည်းပဲ ဆောက်မယ်
     logger.info("🧠 Initializing Single Instance of Jarvis Brain...")
     app_state["brain"] = SeniorEngineerBrain()
+    await app_state["brain"].start()
+    # ♻️ Restart မတိုင်ခင် မပြီးလိုက်တဲ့ Mission တွေကို Checkpoint ကနေ ဆက်မယ်
+    await app_state["brain"].resume_unfinished()
+    # 🧹 Checkpoint DB Retention + Incremental VACUUM (Background)
+    retention_task = asyncio.create_task(app_state["brain"].retention.run_forever())
     
     # Telegram Start
     asyncio.create_task(start_telegram())
@@ -79,8 +160,13 @@ async def lifespan(app: FastAPI):
     yield
     
     # Cleanup
+    retention_task.cancel()
+    await chat_dispatcher.close()
+    await app_state["brain"].close()
+    await notifier.close()
     if app_state["telegram_app"]:
-        await app_state["telegram_app"].updater.stop()
+        if app_state["telegram_app"].updater:
+            await app_state["telegram_app"].updater.stop()
         await app_state["telegram_app"].stop()
         await app_state["telegram_app"].shutdown()
 
@@ -92,6 +178,181 @@ def health_check():
     ram_usage = "Normal" if app_state["brain"] else "Initializing"
     return {"status": "online", "brain_status": ram_usage}
 
+@app.post(TELEGRAM_WEBHOOK_PATH)
+async def telegram_webhook(request: Request):
+    """
+    📨 Telegram Webhook: Secret Header စစ်ပြီး Update ကို PTB update_queue ထဲ ထည့်ပြီး ချက်ချင်း 200 ပြန်မယ်
+    (Handler တွေက Mission Queue ဆီ ဆက်ပို့မယ် — Mission ပြီးတာကို HTTP Request က မစောင့်ဘူး)
+    """
+    if TELEGRAM_MODE != "webhook":
+        return JSONResponse({"error": "Webhook mode disabled"}, status_code=404)
+    token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+    if not hmac.compare_digest(token.encode(), TELEGRAM_WEBHOOK_SECRET.encode()):
+        return JSONResponse({"error": "Invalid secret token"}, status_code=403)
+    application = app_state["telegram_app"]
+    if not application or not application.running:
+        return JSONResponse({"error": "Bot not ready"}, status_code=503)
+
+    try:
+        data = await request.json()
+        update = Update.de_json(data, application.bot)
+    except Exception as e:
+        return JSONResponse({"error": f"Invalid update: {e}"}, status_code=400)
+    if TELEGRAM_UPDATE_LOG:
+        await asyncio.to_thread(_record_update, data)
+    await application.update_queue.put(update)
+    return {"ok": True}
+
+def _record_update(data: dict):
+    try:
+        os.makedirs(os.path.dirname(TELEGRAM_UPDATE_LOG) or ".", exist_ok=True)
+        with open(TELEGRAM_UPDATE_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False) + "\n")
+    except Exception as e:
+        logger.warning(f"⚠️ Update Log Error: {e}")
+
+@app.get("/missions/queue")
+def mission_queue_status():
+    """Mission Executor ရဲ့ Worker / Queue အခြေအနေ"""
+    if not app_state["brain"]:
+        return {"error": "Brain not ready"}
+    return {**app_state["brain"].executor.stats(), "telegram": chat_dispatcher.stats(), "notifier": notifier.status()}
+
+@app.post("/missions")
+async def create_mission(request: Request):
+    """Mission ကို Queue ထဲထည့်ပြီး Job ID ကို ချက်ချင်းပြန်မယ် (Request ကို Mission ပြီးတဲ့ထိ မကိုင်ထားတော့)"""
+    data = await request.json()
+    task = data.get("task")
+    if not task:
+        return JSONResponse({"error": "No task"}, status_code=400)
+    if not app_state["brain"]:
+        return JSONResponse({"error": "Brain not ready"}, status_code=503)
+
+    mission = await app_state["brain"].submit(task, user_id=data.get("user_id", "api"))
+    logger.info(f"📥 API Mission: {mission.id} ({task})")
+    return JSONResponse({
+        "id": mission.id,
+        "status": mission.status,
+        "lane": mission.lane,
+        "position": app_state["brain"].executor.position(mission.id),
+        "status_url": f"/missions/{mission.id}",
+        "events_url": f"/missions/{mission.id}/events",
+    }, status_code=202)
+
+@app.get("/missions/{mission_id}")
+async def mission_status(mission_id: str):
+    """Mission Job ရဲ့ Status (ပြီးသွားရင် Report ပါမယ်)"""
+    if not app_state["brain"]:
+        return JSONResponse({"error": "Brain not ready"}, status_code=503)
+    brain = app_state["brain"]
+    mission = brain.executor.missions.get(mission_id)
+    if mission:
+        return {**mission.summary(), "position": brain.executor.position(mission_id), "result": mission.result}
+    record = await brain.retention.lookup(mission_id)
+    if record:
+        return record
+    return JSONResponse({"error": "Mission not found"}, status_code=404)
+
+@app.post("/missions/{mission_id}/cancel")
+async def cancel_mission(mission_id: str):
+    """🛑 Queue ထဲက / Run နေတဲ့ Mission ကို ရပ်မယ် (LLM Request, Test Process, Container ပါ ရှင်းမယ်)"""
+    if not app_state["brain"]:
+        return JSONResponse({"error": "Brain not ready"}, status_code=503)
+    brain = app_state["brain"]
+    mission = brain.executor.missions.get(mission_id)
+    if not mission:
+        return JSONResponse({"error": "Mission not found"}, status_code=404)
+    if not await brain.cancel(mission_id, reason="cancelled via API"):
+        return JSONResponse({"error": f"Mission already {mission.status}", "status": mission.status}, status_code=409)
+    return JSONResponse({"id": mission_id, "status": mission.status, "cancel_requested": True}, status_code=202)
+
+@app.get("/missions/{mission_id}/logs")
+def mission_logs(mission_id: str, limit: int = 200):
+    """Mission ရဲ့ Log အပြည့်အစုံ (State ထဲမှာ နောက်ဆုံး N ခုပဲ ကျန်လို့ File ကနေ ဖတ်မယ်)"""
+    if not app_state["brain"]:
+        return JSONResponse({"error": "Brain not ready"}, status_code=503)
+    path = app_state["brain"].mission_log_path(mission_id)
+    if not os.path.exists(path):
+        return JSONResponse({"error": "No logs for mission"}, status_code=404)
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    return {"id": mission_id, "total": len(lines), "logs": lines[-limit:]}
+
+@app.get("/missions/{mission_id}/events")
+async def mission_events_stream(mission_id: str):
+    """Server-Sent Events: Node Transition + Log တွေကို Graph က ထုတ်သလို Live Stream လုပ်မယ်"""
+    from src.core.events import mission_events
+    if not mission_events.exists(mission_id):
+        return JSONResponse({"error": "Mission not found"}, status_code=404)
+
+    async def event_source():
+        async for event in mission_events.subscribe(mission_id):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/missions/{mission_id}/trace")
+def mission_trace(mission_id: str):
+    """Chrome Trace JSON (chrome://tracing / ui.perfetto.dev မှာ Load လုပ်ပါ)"""
+    from src.core.tracing import tracer
+    data = tracer.load(mission_id)
+    if data is None:
+        return JSONResponse({"error": "No trace for mission"}, status_code=404)
+    return JSONResponse(data, headers={"Content-Disposition": f'inline; filename="{mission_id}.trace.json"'})
+
+@app.get("/missions/{mission_id}/trace/summary")
+def mission_trace_summary(mission_id: str):
+    """Critical Path + Node တစ်ခုချင်းစီရဲ့ LLM / Docker / Subprocess / Queue Wait အချိန်"""
+    from src.core.tracing import tracer
+    summary = tracer.summary(mission_id)
+    if summary is None:
+        data = tracer.load(mission_id)
+        summary = data["otherData"].get("summary") if data else None
+    if summary is None:
+        return JSONResponse({"error": "No trace for mission"}, status_code=404)
+    return summary
+
+@app.get("/keys")
+def key_pool_status():
+    """Google API Key Pool ရဲ့ Health/Load အခြေအနေ (Keys are masked)"""
+    from src.core.llm import llm_engine
+    return {"keys": llm_engine.key_manager.snapshot()}
+
+@app.get("/cache")
+def llm_cache_status():
+    """LLM Response Cache ရဲ့ Size / Hit-Miss Counters"""
+    from src.core.llm import llm_engine
+    return llm_engine.cache.stats()
+
+@app.get("/memo")
+def node_memo_status():
+    """Fix Loop Memo (compile / pip install / Test Run) Hit-Miss Counters"""
+    from src.core.memo import node_memo
+    return node_memo.stats()
+
+@app.get("/cassette")
+def llm_cassette_status():
+    """LLM Record / Replay Cassette Mode + Recorded / Replayed Counters"""
+    from src.core.llm import llm_engine
+    return llm_engine.cassette.stats()
+
+@app.get("/checkpoints")
+def checkpoint_status():
+    """Checkpoint DB Size / Retention Pass ရလဒ် (Reclaimed Bytes)"""
+    if not app_state["brain"]:
+        return {"error": "Brain not ready"}
+    return app_state["brain"].retention.stats()
+
+@app.get("/speculation")
+def speculation_status():
+    """Speculative Architect ရဲ့ Hit Rate / Saved vs Wasted Latency"""
+    from src.core.speculation import speculative_architect
+    return speculative_architect.report()
+
 @app.post("/execute")
 async def execute_task(request: Request):
     data = await request.json()
@@ -102,7 +363,7 @@ async def execute_task(request: Request):
         return {"error": "Brain not ready"}
 
     logger.info(f"📥 API Task: {task}")
-    report = await app_state["brain"].think_and_reply(task)
+    report = await app_state["brain"].think_and_reply(task, user_id=data.get("user_id", "api"))
     return {"status": "success", "report": report}
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import time
+import zlib
+from collections import OrderedDict
+from config.settings import settings
+
+BLOB_PREFIX = "blob://sha256:"
+READ_CACHE_SIZE = 64        # Decompress ပြီးသား Blob (Instance တစ်ခုချင်းစီ LRU)
+
+# State ထဲမှာ Reference အဖြစ်ပဲ သိမ်းမယ့် (အရွယ်အစားကြီးနိုင်တဲ့) Field များ
+BLOB_FIELDS = ("code_content", "error_logs")
+
+
+class BlobMissingError(LookupError):
+    """Blob ပျောက်နေ (GC ဖျက်ပြီး) ပြီး Workspace ထဲက ဖိုင်ကနေလည်း ပြန်ဖြည့်လို့မရရင်"""
+
+
+class BlobStore:
+    """
+    Content-addressed Blob Store (Disk)
+    - ကြီးတဲ့ String တွေကို sha256 နဲ့ တစ်ခါပဲ သိမ်းမယ် (zlib Compressed, Dedup)
+    - AgentState/Checkpoint ထဲမှာ "blob://sha256:<hex>" Reference ပဲ ကျန်မယ်
+    - Node ထဲ မဝင်ခင် resolve(), Node ကထွက်လာရင် offload()
+    """
+
+    def __init__(self, root: str = None, threshold: int = None):
+        self.root = root or settings.BLOB_DIR
+        self.threshold = threshold if threshold is not None else settings.BLOB_THRESHOLD_BYTES
+        self.stats_counters = {"puts": 0, "dedup_hits": 0, "reads": 0, "missing": 0, "fallbacks": 0,
+                               "gc_deleted": 0, "gc_bytes": 0}
+        self._cache = OrderedDict()     # digest -> text
+
+    @staticmethod
+    def is_ref(value) -> bool:
+        return isinstance(value, str) and value.startswith(BLOB_PREFIX)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            os.utime(path)      # GC Age ကို Refresh (နောက်ဆုံးသုံးချိန်)
+            self.stats_counters["dedup_hits"] += 1
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(tmp, path)   # Atomic (Parallel Worker တွေ တပြိုင်နက် ရေးလည်း မပျက်)
+            self.stats_counters["puts"] += 1
+        return BLOB_PREFIX + digest
+
+    def _read(self, digest: str) -> str:
+        text = self._cache.get(digest)
+        if text is not None:
+            self._cache.move_to_end(digest)
+            return text
+        with open(self._path(digest), "rb") as f:
+            text = zlib.decompress(f.read()).decode("utf-8")
+        self._cache[digest] = text
+        while len(self._cache) > READ_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return text
+
+    def get(self, ref: str):
+        """Blob Content (မရှိတော့ရင် None — "" နဲ့ မရောအောင်)"""
+        self.stats_counters["reads"] += 1
+        try:
+            return self._read(ref[len(BLOB_PREFIX):])
+        except FileNotFoundError:
+            self.stats_counters["missing"] += 1
+            print(f"⚠️ Blob missing (garbage collected?): {ref}")
+            return None
+
+    def offload(self, value):
+        """threshold ထက်ကြီးတဲ့ String ကို Reference နဲ့ အစားထိုးမယ်"""
+        if isinstance(value, str) and not self.is_ref(value) and len(value) > self.threshold:
+            return self.put(value)
+        return value
+
+    def resolve(self, value, field: str = None, file: str = None):
+        """
+        Reference → Content
+        Blob ပျောက်နေရင် code_content ကို Workspace ထဲက file ကနေ ပြန်ဖတ်မယ် (Agent တွေ ဖိုင်အလွတ် မရေးမိအောင်)
+        error_logs လို ပြန်ထုတ်လို့ရတဲ့ Field တွေကတော့ ""
+        """
+        if not self.is_ref(value):
+            return value
+        text = self.get(value)
+        if text is not None:
+            return text
+        if field != "code_content":
+            return ""
+        path = os.path.join(settings.WORKSPACE_DIR, file) if file else None
+        if path and os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            self.stats_counters["fallbacks"] += 1
+            print(f"♻️ Blob missing, using workspace copy of {file}")
+            return text
+        raise BlobMissingError(f"{value} is missing and no workspace file to fall back to ({file or 'unknown file'})")
+
+    # --- AgentState Helpers ---
+    def offload_update(self, update):
+        """Node Return (State Update) ထဲက BLOB_FIELDS + task_results တွေကို Reference ပြောင်းမယ်"""
+        if not isinstance(update, dict):
+            return update
+        update = dict(update)
+        for field in BLOB_FIELDS:
+            if field in update:
+                update[field] = self.offload(update[field])
+        if update.get("task_results"):
+            update["task_results"] = [
+                {**r, **{f: self.offload(r[f]) for f in BLOB_FIELDS if f in r}} for r in update["task_results"]
+            ]
+        return update
+
+    def resolve_state(self, state: dict) -> dict:
+        """Node ထဲ မဝင်ခင် Reference တွေကို Content ပြန်ဖြည့်မယ် (Agent Code တွေ မပြောင်းရအောင်)"""
+        state = dict(state)
+        current_file = (state.get("current_task") or {}).get("file")
+        for field in BLOB_FIELDS:
+            if field in state:
+                state[field] = self.resolve(state[field], field, current_file)
+        if state.get("task_results"):
+            state["task_results"] = [
+                {**r, **{f: self.resolve(r[f], f, r.get("file")) for f in BLOB_FIELDS if f in r}}
+                for r in state["task_results"]
+            ]
+        return state
+
+    # --- Garbage Collection ---
+    def gc(self, max_age: float) -> dict:
+        """
+        max_age စက္ကန့်အတွင်း မသုံးတော့တဲ့ Blob တွေကို ဖျက်မယ်
+        (Checkpoint Thread TTL + Resume Age ထက်ကြာရင် ဘယ် Thread ကမှ မညွှန်းတော့ဘူး)
+        """
+        if not os.path.isdir(self.root):
+            return {"deleted": 0, "bytes": 0}
+        cutoff = time.time() - max_age
+        deleted, freed = 0, 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_mtime < cutoff:
+                        os.remove(path)
+                        deleted += 1
+                        freed += stat.st_size
+                except FileNotFoundError:
+                    continue
+        if deleted:
+            self._cache.clear()
+        self.stats_counters["gc_deleted"] += deleted
+        self.stats_counters["gc_bytes"] += freed
+        return {"deleted": deleted, "bytes": freed}
+
+    def stats(self) -> dict:
+        count, total = 0, 0
+        if os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    count += 1
+                    total += os.path.getsize(os.path.join(dirpath, name))
+        return {"root": self.root, "blobs": count, "size_mb": round(total / (1024 * 1024), 2), **self.stats_counters}
+
+# Global Instance
+blob_store = BlobStore()
@@ -0,0 +1,320 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from src.memory.blob_store import blob_store
+from config.settings import settings
+
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+
+
+def prune_files(directory: str, suffix: str, max_age: float, keep: int) -> dict:
+    """
+    Mission တိုင်း ထုတ်တဲ့ File တွေ (Mission Log / Trace) ကို Age + Count နဲ့ ထိန်းမယ်
+    - suffix နဲ့ ဆုံးတဲ့ File တွေပဲ ထိမယ် (Directory ကို တခြား File တွေနဲ့ မျှသုံးထားရင်တောင် မပျက်အောင်)
+    - max_age စက္ကန့်ထက် ဟောင်းတာ ဖျက်
+    - ကျန်တာ keep ခုထက်များရင် အဟောင်းဆုံး (mtime) က စဖျက် (Run နေတဲ့ Mission ရဲ့ File က အသစ်ဆုံးမို့ မထိ)
+    """
+    if not os.path.isdir(directory):
+        return {"deleted": 0, "bytes": 0}
+    files = []
+    for name in os.listdir(directory):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if os.path.isfile(path):
+            files.append((stat.st_mtime, stat.st_size, path))
+    files.sort(reverse=True)
+    cutoff = time.time() - max_age
+    deleted, freed = 0, 0
+    for index, (mtime, size, path) in enumerate(files):
+        if mtime >= cutoff and index < keep:
+            continue
+        try:
+            os.remove(path)
+            deleted += 1
+            freed += size
+        except FileNotFoundError:
+            continue
+    return {"deleted": deleted, "bytes": freed}
+
+
+class CheckpointRetention:
+    """
+    LangGraph Checkpoint DB ကို တစ်ခါတည်း ဖျက်ပစ်မယ့်အစား အမြဲ Size ထိန်းထားမယ့် Retention Engine
+    - Thread တိုင်းမှာ နောက်ဆုံး Checkpoint N ခုပဲ ထားမယ် (Resume လုပ်လို့ရနေဆဲ)
+    - ပြီးဆုံးသွားတဲ့ Mission Thread တွေကို TTL ကျော်မှ ဖျက်မယ် (missions Registry Table နဲ့ ခွဲခြားမယ်)
+    - Server Run နေတုန်း Background မှာ Incremental VACUUM လုပ်ပြီး Disk ပြန်ပေးမယ်
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or settings.CHECKPOINT_DB_PATH
+        self.keep_last = max(1, settings.CHECKPOINT_KEEP_LAST)
+        self.ttl = settings.CHECKPOINT_THREAD_TTL_HOURS * 3600
+        self.max_bytes = settings.CHECKPOINT_MAX_MB * 1024 * 1024
+        self.last_report = {}
+        self.totals = {"runs": 0, "checkpoints": 0, "writes": 0, "threads": 0, "reclaimed_bytes": 0}
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _file_bytes(self) -> int:
+        return sum(os.path.getsize(self.path + suffix) for suffix in ("", "-wal")
+                   if os.path.exists(self.path + suffix))
+
+    # --- Startup ---
+    def prepare(self):
+        """
+        Startup မှာ တစ်ခါ Run မယ် (Checkpointer မဖွင့်ခင်)
+        - Mission Registry Table ဆောက်မယ်
+        - auto_vacuum=INCREMENTAL မဟုတ်သေးရင် တစ်ခါတည်း Full VACUUM နဲ့ ပြောင်းမယ်
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS missions (
+                        thread_id TEXT PRIMARY KEY,
+                        user_id TEXT,
+                        mission TEXT,
+                        status TEXT,
+                        created_at REAL,
+                        updated_at REAL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_missions_status ON missions(status, updated_at)")
+
+                # 2 = INCREMENTAL (Page Map မရှိရင် incremental_vacuum က ဘာမှမလုပ်လို့ တစ်ခါ Rebuild ရမယ်)
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    before = self._file_bytes()
+                    print(f"🧹 Enabling incremental auto-vacuum on {self.path} ({before / (1024 * 1024):.2f}MB, one-time VACUUM)...")
+                    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                    conn.execute("VACUUM")
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    print(f"✅ Auto-vacuum enabled. Reclaimed {(before - self._file_bytes()) / (1024 * 1024):.2f}MB")
+            finally:
+                conn.close()
+        print(f"✅ Checkpoint DB: {self._file_bytes() / (1024 * 1024):.2f}MB "
+              f"(keep last {self.keep_last}/thread, TTL {settings.CHECKPOINT_THREAD_TTL_HOURS:g}h)")
+
+    # --- Mission Registry ---
+    def _record(self, thread_id: str, status: str, user_id: str = None, mission: str = None):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO missions (thread_id, user_id, mission, status, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(thread_id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at
+                    """,
+                    (thread_id, user_id, mission, status, now, now)
+                )
+            finally:
+                conn.close()
+
+    async def record(self, thread_id: str, status: str, user_id: str = None, mission: str = None):
+        """Mission Thread ရဲ့ Status (queued, running, done, failed) ကို မှတ်မယ် (TTL Pruning + Resume အတွက်)"""
+        try:
+            await asyncio.to_thread(self._record, thread_id, status, user_id, mission)
+        except Exception as e:
+            print(f"⚠️ Mission Registry Error: {e}")
+
+    def _lookup(self, thread_id: str):
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT thread_id, user_id, mission, status, created_at, updated_at FROM missions WHERE thread_id = ?",
+                    (thread_id,)
+                ).fetchone()
+            finally:
+                conn.close()
+        if row is None:
+            return None
+        return dict(zip(("id", "user_id", "mission", "status", "created_at", "updated_at"), row))
+
+    async def lookup(self, thread_id: str):
+        """Memory ထဲက History မှာ မရှိတော့တဲ့ Mission ကို Registry ကနေ ရှာမယ်"""
+        try:
+            return await asyncio.to_thread(self._lookup, thread_id)
+        except Exception as e:
+            print(f"⚠️ Mission Registry Error: {e}")
+            return None
+
+    def _unfinished(self) -> list:
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT thread_id, user_id, mission, status, created_at, updated_at FROM missions "
+                    "WHERE status IN ('queued', 'running') ORDER BY created_at ASC"
+                ).fetchall()
+            finally:
+                conn.close()
+        return [dict(zip(("id", "user_id", "mission", "status", "created_at", "updated_at"), row)) for row in rows]
+
+    async def unfinished(self) -> list:
+        """Process Restart ဖြစ်သွားလို့ မပြီးလိုက်တဲ့ Mission တွေ (Crash-safe Resume အတွက်)"""
+        try:
+            return await asyncio.to_thread(self._unfinished)
+        except Exception as e:
+            print(f"⚠️ Mission Registry Error: {e}")
+            return []
+
+    # --- Retention ---
+    def _has_checkpoint_tables(self, conn) -> bool:
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return {"checkpoints", "writes"} <= names
+
+    def _prune_threads(self, conn, cutoff: float) -> tuple:
+        """cutoff မတိုင်ခင် ပြီးဆုံးသွားတဲ့ Mission Thread တွေကို Checkpoint + Writes + Registry အကုန်ဖျက်မယ်"""
+        placeholders = ",".join("?" * len(FINISHED_STATUSES))
+        threads = [r[0] for r in conn.execute(
+            f"SELECT thread_id FROM missions WHERE status IN ({placeholders}) AND updated_at < ?",
+            (*FINISHED_STATUSES, cutoff)
+        )]
+        checkpoints = writes = 0
+        for thread_id in threads:
+            conn.execute("BEGIN IMMEDIATE")
+            checkpoints += conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,)).rowcount
+            writes += conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,)).rowcount
+            conn.execute("DELETE FROM missions WHERE thread_id = ?", (thread_id,))
+            conn.execute("COMMIT")
+        return len(threads), checkpoints, writes
+
+    def _prune_history(self, conn) -> tuple:
+        """Thread/Namespace တိုင်းမှာ နောက်ဆုံး keep_last ခုပဲ ထားမယ် (checkpoint_id က Time-ordered UUID)"""
+        conn.execute("BEGIN IMMEDIATE")
+        checkpoints = conn.execute(
+            """
+            DELETE FROM checkpoints WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (
+                        PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                    ) AS rn FROM checkpoints
+                ) WHERE rn > ?
+            )
+            """,
+            (self.keep_last,)
+        ).rowcount
+        # Checkpoint မရှိတော့တဲ့ Pending Writes တွေ
+        writes = conn.execute(
+            """
+            DELETE FROM writes WHERE NOT EXISTS (
+                SELECT 1 FROM checkpoints c
+                WHERE c.thread_id = writes.thread_id
+                  AND c.checkpoint_ns = writes.checkpoint_ns
+                  AND c.checkpoint_id = writes.checkpoint_id
+            )
+            """
+        ).rowcount
+        conn.execute("COMMIT")
+        return checkpoints, writes
+
+    def _vacuum(self, conn) -> int:
+        """Free Page တွေကို File ကနေ ဖြတ်ပြီး WAL ကို Truncate လုပ်မယ်"""
+        # execute() က Page တစ်ခုစီ Step လုပ်လို့ executescript နဲ့ အဆုံးထိ Run ရမယ်
+        conn.executescript(f"PRAGMA incremental_vacuum({settings.CHECKPOINT_VACUUM_PAGES});")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    def run_once(self) -> dict:
+        """Retention Pass တစ်ခါ (Blocking - Thread ထဲကနေ ခေါ်ပါ)"""
+        if not os.path.exists(self.path):
+            return {}
+        started = time.perf_counter()
+        size_before = self._file_bytes()
+        report = {"threads": 0, "checkpoints": 0, "writes": 0}
+        with self._lock:
+            conn = self._connect()
+            try:
+                if self._has_checkpoint_tables(conn):
+                    threads, checkpoints, writes = self._prune_threads(conn, time.time() - self.ttl)
+                    history = self._prune_history(conn)
+                    report["threads"] += threads
+                    report["checkpoints"] += checkpoints + history[0]
+                    report["writes"] += writes + history[1]
+                    free_pages = self._vacuum(conn)
+
+                    # Budget ကျော်နေသေးရင် TTL မစောင့်ဘဲ ပြီးပြီးသား Thread အကုန်ရှင်းမယ်
+                    if self._file_bytes() > self.max_bytes:
+                        threads, checkpoints, writes = self._prune_threads(conn, time.time())
+                        report["threads"] += threads
+                        report["checkpoints"] += checkpoints
+                        report["writes"] += writes
+                        free_pages = self._vacuum(conn)
+                    report["free_pages"] = free_pages
+            finally:
+                conn.close()
+
+        # Checkpoint Thread တွေ ဖျက်ပြီးနောက် ဘယ်သူမှ မညွှန်းတော့တဲ့ Blob တွေ (TTL + Resume Window ထက် ဟောင်းရင်)
+        blobs = blob_store.gc(self.ttl + settings.MISSION_RESUME_MAX_AGE_HOURS * 3600)
+        report["blobs_deleted"] = blobs["deleted"]
+        report["blob_reclaimed_bytes"] = blobs["bytes"]
+
+        # Mission တိုင်း ထုတ်တဲ့ Mission Log File တွေ
+        mission_logs = prune_files(settings.MISSION_LOG_DIR, ".log", settings.MISSION_LOG_MAX_AGE_HOURS * 3600,
+                                   settings.MISSION_LOG_KEEP)
+        report["mission_logs_deleted"] = mission_logs["deleted"]
+        report["mission_log_reclaimed_bytes"] = mission_logs["bytes"]
+        if mission_logs["deleted"]:
+            print(f"🧹 Mission Logs: deleted {mission_logs['deleted']} files ({mission_logs['bytes'] / 1024:.0f}KB)")
+
+        # Mission တိုင်း ထုတ်တဲ့ Trace JSON (Tracing က Default ဖွင့်ထားလို့)
+        traces = prune_files(settings.TRACE_DIR, ".trace.json", settings.TRACE_MAX_AGE_HOURS * 3600, settings.TRACE_KEEP)
+        report["traces_deleted"] = traces["deleted"]
+        report["trace_reclaimed_bytes"] = traces["bytes"]
+        if traces["deleted"]:
+            print(f"🧹 Traces: deleted {traces['deleted']} files ({traces['bytes'] / 1024:.0f}KB)")
+
+        size_after = self._file_bytes()
+        report.update({
+            "size_before_mb": round(size_before / (1024 * 1024), 2),
+            "size_after_mb": round(size_after / (1024 * 1024), 2),
+            "reclaimed_bytes": max(0, size_before - size_after),
+            "duration_s": round(time.perf_counter() - started, 3),
+            "at": time.time(),
+        })
+        self.last_report = report
+        self.totals["runs"] += 1
+        for key in ("threads", "checkpoints", "writes", "reclaimed_bytes"):
+            self.totals[key] += report[key]
+        if report["reclaimed_bytes"] or report["checkpoints"]:
+            print(f"🧹 Checkpoint Retention: pruned {report['checkpoints']} checkpoints / {report['threads']} threads, "
+                  f"reclaimed {report['reclaimed_bytes'] / (1024 * 1024):.2f}MB ({report['size_after_mb']}MB now)")
+        if size_after > self.max_bytes:
+            print(f"⚠️ Checkpoint DB still over budget ({report['size_after_mb']}MB): unfinished missions are kept.")
+        return report
+
+    async def run_forever(self, interval: float = None):
+        """Lifespan Background Task: interval စက္ကန့်တိုင်း Retention Pass ပြေးမယ်"""
+        interval = interval or settings.CHECKPOINT_COMPACT_INTERVAL
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                print(f"⚠️ Checkpoint Retention Error: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "size_mb": round(self._file_bytes() / (1024 * 1024), 2) if os.path.exists(self.path) else 0,
+            "budget_mb": settings.CHECKPOINT_MAX_MB,
+            "keep_last": self.keep_last,
+            "ttl_hours": settings.CHECKPOINT_THREAD_TTL_HOURS,
+            "last_run": self.last_report,
+            "blobs": blob_store.stats(),
+            "totals": self.totals,
+        }
@@ -0,0 +1,64 @@
+import zlib
+import aiosqlite
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from config.settings import settings
+
+
+class CompressedSerializer(JsonPlusSerializer):
+    """
+    Checkpoint / Pending Write တွေကို zlib နဲ့ ချုံ့မယ့် Serializer
+    Type Column မှာ "+zlib" Suffix ထည့်ထားလို့ အရင်က မချုံ့ခဲ့တဲ့ Checkpoint တွေလည်း ဖတ်လို့ရနေဆဲ
+    """
+
+    SUFFIX = "+zlib"
+
+    def __init__(self, min_bytes: int = None, level: int = 6):
+        super().__init__()
+        self.min_bytes = min_bytes if min_bytes is not None else settings.CHECKPOINT_COMPRESS_MIN_BYTES
+        self.level = level
+
+    def dumps_typed(self, obj):
+        type_, data = super().dumps_typed(obj)
+        if len(data) < self.min_bytes:
+            return type_, data
+        return type_ + self.SUFFIX, zlib.compress(data, self.level)
+
+    def loads_typed(self, data):
+        type_, payload = data
+        if type_.endswith(self.SUFFIX):
+            return super().loads_typed((type_[:-len(self.SUFFIX)], zlib.decompress(payload)))
+        return super().loads_typed(data)
+
+
+def checkpoint_pragmas() -> list:
+    """
+    Process တစ်ခုလုံး သုံးမယ့် Connection အတွက် Tuned Pragmas
+    - WAL + synchronous=NORMAL: Commit တိုင်း fsync မလုပ်ဘဲ Crash-safe ဖြစ်နေဆဲ
+    - cache_size / mmap: Page Cache ကို Connection ထဲမှာ Warm ထားမယ် (Mission တိုင်း ပြန်မဖတ်ရ)
+    """
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA cache_size=-{settings.CHECKPOINT_CACHE_MB * 1024}",   # KiB (အနုတ်)
+        f"PRAGMA mmap_size={settings.CHECKPOINT_MMAP_MB * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=10000",
+    ]
+
+
+async def open_checkpointer(path: str = None, serde=None) -> AsyncSqliteSaver:
+    """Long-lived AsyncSqliteSaver ဖွင့်မယ် (close_checkpointer နဲ့ ပြန်ပိတ်ပါ)"""
+    conn = await aiosqlite.connect(path or settings.CHECKPOINT_DB_PATH)
+    for pragma in checkpoint_pragmas():
+        await conn.execute(pragma)
+    if serde is None and settings.CHECKPOINT_COMPRESS:
+        serde = CompressedSerializer()
+    saver = AsyncSqliteSaver(conn, serde=serde)
+    await saver.setup()
+    return saver
+
+
+async def close_checkpointer(saver: AsyncSqliteSaver):
+    if saver is not None:
+        await saver.conn.close()
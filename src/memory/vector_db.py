@@ -1,25 +1,15 @@
 import chromadb
 import uuid
 import os
-from google import genai
 from chromadb import Documents, EmbeddingFunction, Embeddings
-from src.core.key_manager import KeyManager
-from config.settings import settings
+from src.core.llm import llm_engine
 
 # 🔥 Custom Embedding Function using Gemini API (No PyTorch/Local RAM usage)
 class GeminiEmbeddingFunction(EmbeddingFunction):
-    def __init__(self):
-        self.key_manager = KeyManager()
-
     def __call__(self, input: Documents) -> Embeddings:
-        # Key Rotation သုံးပြီး Embedding ယူမယ်
-        client = self.key_manager.get_client()
-        response = client.models.embed_content(
-            model="text-embedding-004", # Lightweight & Fast
-            contents=input
-        )
-        # Gemini Return format ကို Chroma နဲ့ ကိုက်အောင် ညှိမယ်
-        return [e.values for e in response.embeddings]
+        # Shared LLM Gateway ရဲ့ Pooled Client + Key Rotation သုံးပြီး Embedding ယူမယ်
+        # (Chroma က Sync Interface ပဲ ခေါ်လို့ embed_sync ကိုသုံးတယ်)
+        return llm_engine.embed_sync(input)
 
 class VectorDB:
     def __init__(self, path="workspace/chroma_db"):
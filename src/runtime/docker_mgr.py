@@ -5,6 +5,7 @@ import os
 import tarfile
 import io
 from config.settings import settings
+from src.core.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +47,12 @@ class DockerManager:
         return stream
 
     def start_container(self, image: str, name: str, port: int, command: str = None, env: dict = None, code_path: str = None):
+        with tracer.span("docker.start_container", "docker", name=name, image=image) as span:
+            result = self._start_container(image, name, port, command, env, code_path)
+            span.set(result=result.split("\n")[0])
+            return result
+
+    def _start_container(self, image: str, name: str, port: int, command: str = None, env: dict = None, code_path: str = None):
         if not self.client: return "❌ Docker Client Missing"
 
         try:
@@ -1,9 +1,10 @@
 import os
 import glob
+from config.settings import settings
 
 class FileTools:
-    def __init__(self, work_dir="/app/workspace"):
-        self.work_dir = work_dir
+    def __init__(self, work_dir=None):
+        self.work_dir = work_dir or settings.WORKSPACE_DIR
         os.makedirs(self.work_dir, exist_ok=True)
 
     def write_file(self, filename: str, content: str) -> str:
@@ -20,6 +21,12 @@ class FileTools:
         except Exception as e:
             return f"❌ Write Error: {str(e)}"
 
+    def open_writer(self, filename: str):
+        """Streaming Write အတွက် File Handle ဖွင့်ပေးမယ် (Caller က ပိတ်ရမယ်)"""
+        filepath = os.path.join(self.work_dir, filename)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        return open(filepath, 'w')
+
     def read_file(self, filename: str) -> str:
         try:
             filepath = os.path.join(self.work_dir, filename)
@@ -2,6 +2,7 @@ import subprocess
 import os
 from datetime import datetime
 from dotenv import load_dotenv
+from src.core.tracing import tracer
 
 load_dotenv()
 
@@ -22,14 +23,16 @@ class GitTools:
                 # Password prompt မတက်အောင် terminal ကိုပြောမယ်
                 env["GIT_TERMINAL_PROMPT"] = "0"
 
-            result = subprocess.run(
-                command,
-                cwd=self.work_dir,
-                capture_output=True,
-                text=True,
-                env=env,
-                check=False
-            )
+            with tracer.span(f"git {command[1] if len(command) > 1 else ''}", "subprocess") as span:
+                result = subprocess.run(
+                    command,
+                    cwd=self.work_dir,
+                    capture_output=True,
+                    text=True,
+                    env=env,
+                    check=False
+                )
+                span.set(returncode=result.returncode, stderr_chars=len(result.stderr or ""))
             if result.returncode == 0:
                 return result.stdout.strip()
             else:
@@ -1,9 +1,11 @@
 import subprocess
 import os
+from src.core.tracing import tracer
+from config.settings import settings
 
 class SystemTools:
-    def __init__(self, work_dir="/app/workspace"):
-        self.work_dir = work_dir
+    def __init__(self, work_dir=None):
+        self.work_dir = work_dir or settings.WORKSPACE_DIR
         # Workspace folder မရှိရင် အလိုအလျောက်ဆောက်မယ်
         os.makedirs(self.work_dir, exist_ok=True)
 
@@ -20,14 +22,16 @@ class SystemTools:
                 return "❌ Command blocked for security reasons."
 
             # Command ကို Run မယ် (Timeout 60 စက္ကန့်)
-            result = subprocess.run(
-                command, 
-                shell=True, 
-                capture_output=True, 
-                text=True, 
-                timeout=60,
-                cwd=self.work_dir
-            )
+            with tracer.span("shell", "subprocess", command=command[:200]) as span:
+                result = subprocess.run(
+                    command, 
+                    shell=True, 
+                    capture_output=True, 
+                    text=True, 
+                    timeout=60,
+                    cwd=self.work_dir
+                )
+                span.set(returncode=result.returncode, stdout_chars=len(result.stdout or ""))
             
             # Result ပြန်ပို့မယ်
             if result.returncode == 0: